@@ -7,7 +7,8 @@ This module defines the abstract interface for FINS protocol connections.
 import struct
 import time
 from abc import ABCMeta, abstractmethod
-from typing import List, Union, Any
+from functools import lru_cache
+from typing import List, Optional, Union, Any
 
 
 from OMRON_FINS_PROTOCOL.Fins_domain.frames import FinsCommandFrame
@@ -15,6 +16,35 @@ from OMRON_FINS_PROTOCOL.Fins_domain.frames import FinsCommandFrame
 
 __version__ = "0.1.0"
 
+# Default ICF (command, response required), RSV and GCT of fins_command_frame
+DEFAULT_ICF, DEFAULT_RSV, DEFAULT_GCT = b'\x80', b'\x00', b'\x02'
+
+# Why a received datagram was not accepted as a response, keys of FinsConnection.discarded
+DISCARD_REASONS = (
+    'short',          # shorter than header, command code and end code
+    'not_response',   # ICF response bit not set
+    'unknown_sid',    # no command waiting for this SID (late or duplicate answer)
+    'wrong_source',   # not sent by the addressed node, or not addressed to us
+    'wrong_command',  # command code differs from the command with this SID
+    'stale',          # left over from an earlier command, drained before sending
+)
+
+
+@lru_cache(maxsize=256)
+def frame_struct(command_code_size: int, text_size: int) -> struct.Struct:
+    """
+    Compiled layout of a command frame: header up to SA2 (9 bytes), SID,
+    command code and text.
+    
+    Args:
+        command_code_size: Length of the command code argument
+        text_size: Length of the text argument
+        
+    Returns:
+        struct.Struct packing (header, sid, command_code, text)
+    """
+    return struct.Struct(f'9sB{command_code_size}s{text_size}s')
+
 # (metaclass=ABCMeta)
 class FinsConnection(metaclass=ABCMeta):
     """
@@ -69,6 +99,74 @@ class FinsConnection(metaclass=ABCMeta):
         self.srce_net_add = src_network
         self.srce_node_add = src_node
         self.srce_unit_add = src_unit
+        
+        # Last service ID handed out by _next_service_id
+        self._service_id = 0
+        # Datagrams dropped by response validation, per reason in DISCARD_REASONS
+        self.discarded = dict.fromkeys(DISCARD_REASONS, 0)
+        self.build_frame_template()
+    
+    def build_frame_template(self) -> None:
+        """
+        Precompute the header bytes shared by every command frame.
+        
+        Addressing does not change per command, so the ICF, RSV, GCT and
+        the six address bytes are encoded once here. Call again whenever
+        the addresses change (e.g. after the FINS/TCP node handshake).
+        """
+        self._frame_header = (DEFAULT_ICF + DEFAULT_RSV + DEFAULT_GCT +
+                              bytes([self.dest_net_add, self.dest_node_add, self.dest_unit_add,
+                                     self.srce_net_add, self.srce_node_add, self.srce_unit_add]))
+    
+    def _next_service_id(self, in_use=()) -> int:
+        """
+        Allocate the next service ID (SID) for an outstanding command.
+        
+        SIDs cycle through 1-255; 0 is left for the classic one-at-a-time
+        callers that pass their own service_id.
+        
+        Args:
+            in_use: SIDs of commands still waiting for a response, skipped
+            
+        Returns:
+            Service ID as int
+        """
+        if len(in_use) >= 255:
+            raise ValueError("All 255 service IDs are in use")
+        self._service_id = self._service_id % 255 + 1
+        while self._service_id in in_use:
+            self._service_id = self._service_id % 255 + 1
+        return self._service_id
+    
+    def _response_mismatch(self, response_data: bytes, command_frame: bytes) -> Optional[str]:
+        """
+        Check that a response answers a command.
+        
+        Compares the header fields FinsHeader.from_bytes would parse,
+        directly on the raw frames (ICF RSV GCT DNA DA1 DA2 SNA SA1 SA2 SID):
+        the ICF response bit, the response source against the command
+        destination and vice versa, and the command code. Address bytes that
+        are 0 in the command (local network, own node) are not compared.
+        The SID is matched by the caller.
+        
+        Args:
+            response_data: Received frame
+            command_frame: Command frame sent with the same SID
+            
+        Returns:
+            None if the response is valid, otherwise a key of DISCARD_REASONS
+        """
+        if len(response_data) < 14:
+            return 'short'
+        if not response_data[0] & 0x40:
+            return 'not_response'
+        for response_index, command_index in ((6, 3), (7, 4), (8, 5), (3, 6), (4, 7), (5, 8)):
+            expected = command_frame[command_index]
+            if expected and response_data[response_index] != expected:
+                return 'wrong_source'
+        if response_data[10] != command_frame[10] or response_data[11] != command_frame[11]:
+            return 'wrong_command'
+        return None
     
     @abstractmethod
     def execute_fins_command_frame(self, fins_command_frame: bytes) -> bytes:
@@ -87,10 +185,13 @@ class FinsConnection(metaclass=ABCMeta):
         pass
     
     def fins_command_frame(self, command_code: bytes, text: bytes = b'', 
-                      service_id: bytes = b'\x00', icf: bytes = b'\x80', 
-                      gct: bytes = b'\x02', rsv: bytes = b'\x00') -> bytes:
+                      service_id: bytes = b'\x00', icf: bytes = DEFAULT_ICF, 
+                      gct: bytes = DEFAULT_GCT, rsv: bytes = DEFAULT_RSV) -> bytes:
         """
-        Build a complete FINS command frame using the FinsCommandFrame class.
+        Build a complete FINS command frame.
+        
+        Frames with the default ICF, RSV and GCT are encoded from the
+        precomputed header template; other values go through FinsCommandFrame.
         
         Args:
             command_code: FINS command code
@@ -103,6 +204,10 @@ class FinsConnection(metaclass=ABCMeta):
         Returns:
             Complete command frame as bytes
         """
+        if icf == DEFAULT_ICF and gct == DEFAULT_GCT and rsv == DEFAULT_RSV:
+            return frame_struct(len(command_code), len(text)).pack(
+                self._frame_header, service_id[0], command_code, text)
+        
         frame = FinsCommandFrame()
         
         # Set header fields
@@ -125,5 +230,52 @@ class FinsConnection(metaclass=ABCMeta):
         
         return frame.bytes()
     
+    def encode_command_frame_into(self, buffer: bytearray, command_code: bytes, text: bytes = b'',
+                                  service_id: int = 0, offset: int = 0) -> int:
+        """
+        Encode a command frame into a caller-owned buffer with struct.pack_into.
+        
+        Nothing is allocated, so a poll loop can keep reusing one buffer
+        for its frames.
+        
+        Args:
+            buffer: Writable buffer, large enough for the frame
+            command_code: FINS command code (may already include the parameters)
+            text: Command data payload
+            service_id: Service ID as int
+            offset: Position in buffer where the frame starts
+            
+        Returns:
+            Number of bytes written
+        """
+        layout = frame_struct(len(command_code), len(text))
+        layout.pack_into(buffer, offset, self._frame_header, service_id, command_code, text)
+        return layout.size
+    
+    def fins_command_frames(self, command_code: bytes, texts: List[bytes], service_id: int = 0) -> List[bytes]:
+        """
+        Encode many frames of the same command in one go.
+        
+        Used for whole poll plans, e.g. the MEMORY_AREA_READ frames of every
+        block of a read plan. Texts of equal length share one compiled layout.
+        
+        Args:
+            command_code: FINS command code shared by all frames
+            texts: Command parameters of each frame
+            service_id: Service ID written into every frame
+            
+        Returns:
+            Complete command frames, one per text
+        """
+        header = self._frame_header
+        size = len(command_code)
+        frames = []
+        layout = None
+        for text in texts:
+            if layout is None or layout.size != 10 + size + len(text):
+                layout = frame_struct(size, len(text))
+            frames.append(layout.pack(header, service_id, command_code, text))
+        return frames
+    
 # if __name__ == "__main__":
 #     finscheck = FinsConnection("192.168.137.2")
\ No newline at end of file
@@ -150,8 +150,11 @@ class FinsResponseFrame:
         """
         Parse response frame from received bytes.
         
+        A memoryview may be passed to parse without copying; the fields are
+        then views into the same buffer.
+        
         Args:
-            data: Raw bytes containing response frame data
+            data: Raw bytes (or memoryview) containing response frame data
         """
         if len(data) < 14:
             raise ValueError("Response frame data must be at least 14 bytes")
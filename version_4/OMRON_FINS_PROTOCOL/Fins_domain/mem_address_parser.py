@@ -7,10 +7,89 @@ try:
     from OMRON_FINS_PROTOCOL.Fins_domain.memory_areas import FinsPLCMemoryAreas
 except ImportError:
     from memory_areas import FinsPLCMemoryAreas
+from functools import lru_cache
 # from memory_areas import FinsPLCMemoryAreas
 __version__ = "0.1.0"
 
 
+class FinsAddress:
+    """
+    Immutable, precompiled PLC address.
+    
+    Holds everything a command needs so the poll loop never parses address
+    strings: the memory area code, word and bit, and the prebuilt 4-byte
+    FINS address field (area code, word high, word low, bit). Get instances
+    from compile_address(), which caches them.
+    """
+    
+    __slots__ = ('address', 'address_type', 'memory_area', 'memory_type_code',
+                 'word_address', 'bit_number', 'address_field')
+    
+    def __init__(self, address: str, address_type: str, memory_area: str,
+                 memory_type_code: int, word_address: int, bit_number):
+        """
+        Initialize the address.
+        
+        Args:
+            address: Address string as given (e.g. 'D100', '2.01')
+            address_type: 'word' or 'bit'
+            memory_area: Human-readable memory area name
+            memory_type_code: FINS memory area code
+            word_address: Word address (including the counter offset)
+            bit_number: Bit number for bit addresses, None for words
+        """
+        set_field = object.__setattr__
+        set_field(self, 'address', address)
+        set_field(self, 'address_type', address_type)
+        set_field(self, 'memory_area', memory_area)
+        set_field(self, 'memory_type_code', memory_type_code)
+        set_field(self, 'word_address', word_address)
+        set_field(self, 'bit_number', bit_number)
+        set_field(self, 'address_field', bytes([memory_type_code]) + word_address.to_bytes(2, 'big') +
+                  bytes([bit_number or 0]))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("FinsAddress is immutable")
+    
+    def __delattr__(self, name):
+        raise AttributeError("FinsAddress is immutable")
+    
+    @property
+    def is_bit(self) -> bool:
+        return self.address_type == 'bit'
+    
+    @property
+    def offset_bytes(self) -> list:
+        """Word address as [high, low] like FinsAddressParser.parse returns it."""
+        return list(self.word_address.to_bytes(2, 'big'))
+    
+    def offset(self, words: int) -> "FinsAddress":
+        """
+        Address of the same area moved by a number of words.
+        
+        Args:
+            words: Number of words to add
+            
+        Returns:
+            New FinsAddress (the address string is kept)
+        """
+        if words == 0:
+            return self
+        return FinsAddress(self.address, self.address_type, self.memory_area,
+                           self.memory_type_code, self.word_address + words, self.bit_number)
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, FinsAddress):
+            return NotImplemented
+        return self.address_field == other.address_field
+    
+    def __hash__(self) -> int:
+        return hash(self.address_field)
+    
+    def __repr__(self) -> str:
+        return f"FinsAddress({self.address!r}, area=0x{self.memory_type_code:02X}, word={self.word_address}, bit={self.bit_number})"
+
+
 class FinsAddressParser:
     """
     Parser for PLC addresses in string format (e.g., 'D1000', 'W100', 'H200').
@@ -46,6 +125,19 @@ class FinsAddressParser:
         else:
             return self._parse_as_word_address(address, offset)
     
+    def compile(self, address: str, offset: int = 0) -> FinsAddress:
+        """
+        Compile an address string into a cached FinsAddress, see compile_address.
+        
+        Args:
+            address: Address string (e.g. 'D100', 'W3.01', '2.01')
+            offset: Additional offset to add to the word address
+            
+        Returns:
+            FinsAddress
+        """
+        return compile_address(address, offset)
+    
     def _parse_as_bit_address(self, address: str, offset: int = 0) -> dict:
         """
         Parse as bit address (e.g., 'A100.01').
@@ -308,6 +400,28 @@ class FinsAddressParser:
 
    
 
+_compile_parser = FinsAddressParser()
+
+
+@lru_cache(maxsize=4096)
+def compile_address(address: str, offset: int = 0) -> FinsAddress:
+    """
+    Parse an address string once and return an immutable FinsAddress.
+    
+    Results are kept in an LRU cache, so compiling the same tag every poll
+    cycle costs a dictionary lookup.
+    
+    Args:
+        address: Address string (e.g. 'D100', 'W3.01', 'C0001', '2.01')
+        offset: Additional offset to add to the word address
+        
+    Returns:
+        FinsAddress
+    """
+    info = _compile_parser.parse(address, offset)
+    return FinsAddress(address, info['address_type'], info['memory_area'],
+                       info['memory_type_code'], info['word_address'], info['bit_number'])
+
 
 # Example usage and testing
 if __name__ == "__main__":
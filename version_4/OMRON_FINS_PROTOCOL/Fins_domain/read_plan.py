@@ -0,0 +1,298 @@
+"""
+FINS Read Plan
+==============
+This module compiles a tag list into a reusable plan of contiguous
+MEMORY_AREA_READ blocks plus the offsets needed to decode every tag.
+"""
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from OMRON_FINS_PROTOCOL.Fins_domain.mem_address_parser import compile_address
+from OMRON_FINS_PROTOCOL.Fins_domain.memory_areas import FinsPLCMemoryAreas
+from OMRON_FINS_PROTOCOL.components import DATA_TYPE_MAPPING
+from OMRON_FINS_PROTOCOL.exception import FinsDataError
+
+__version__ = "0.1.0"
+
+# Words (or bits for bit areas) per MEMORY_AREA_READ command, as in FinsUdpConnection.read
+MAX_BLOCK_ITEMS = 990
+
+
+def _bit_to_word_area_codes() -> Dict[int, int]:
+    """
+    Word area code of every bit area that has one (CIO_BIT -> CIO_WORD, ...).
+
+    Flag areas (timer/counter flags, task flags, ...) have no word view
+    and are not in the map.
+    """
+    memory_areas = FinsPLCMemoryAreas()
+    codes = {}
+    for name in dir(memory_areas):
+        if name.endswith('_BIT') and hasattr(memory_areas, name[:-4] + '_WORD'):
+            codes[getattr(memory_areas, name)[0]] = getattr(memory_areas, name[:-4] + '_WORD')[0]
+    return codes
+
+
+# Bit area code -> word area code, used to read bit tags through their parent word
+BIT_TO_WORD_AREA = _bit_to_word_area_codes()
+
+
+class FinsReadBlock:
+    """
+    One contiguous MEMORY_AREA_READ range.
+
+    For word areas start and count are in words. For bit areas they are in
+    bits (start = word * 16 + bit) and the PLC returns one byte per bit.
+    """
+
+    def __init__(self, memory_type_code: int, start: int, count: int, is_bit: bool):
+        self.memory_type_code = memory_type_code
+        self.start = start
+        self.count = count
+        self.is_bit = is_bit
+
+    @property
+    def end(self) -> int:
+        return self.start + self.count
+
+    def command_text(self) -> bytes:
+        """
+        Build the MEMORY_AREA_READ parameters (area code, address, bit, count).
+
+        Returns:
+            6 bytes of command text
+        """
+        if self.is_bit:
+            word, bit = divmod(self.start, 16)
+        else:
+            word, bit = self.start, 0
+        return (bytes([self.memory_type_code]) + word.to_bytes(2, 'big') +
+                bytes([bit]) + self.count.to_bytes(2, 'big'))
+
+    def __repr__(self) -> str:
+        unit = 'bits' if self.is_bit else 'words'
+        return f"FinsReadBlock(0x{self.memory_type_code:02X}, start={self.start}, {self.count} {unit})"
+
+
+class FinsPlannedTag:
+    """
+    Where one tag lives inside the blocks of a read plan.
+
+    Attributes:
+        address: PLC address as given (e.g. 'D100', '2.01')
+        data_type: Normalized data type name
+        block_index: Index of the block holding the tag
+        offset: Offset in the block, in the block's units (words or bits)
+        count: Number of units the tag occupies
+        mapping: The original tag entry (e.g. an address_mappings dict)
+        bit: Bit number inside the word at offset for a bit tag read
+            through its parent word, None otherwise
+    """
+
+    def __init__(self, address: str, data_type: str, block_index: int, offset: int,
+                 count: int, mapping: Union[dict, str], bit: Optional[int] = None):
+        self.address = address
+        self.data_type = data_type
+        self.block_index = block_index
+        self.offset = offset
+        self.count = count
+        self.mapping = mapping
+        self.bit = bit
+
+    def __repr__(self) -> str:
+        bit = '' if self.bit is None else f", bit={self.bit}"
+        return (f"FinsPlannedTag({self.address!r}, {self.data_type}, block={self.block_index}, "
+                f"offset={self.offset}{bit})")
+
+
+class FinsReadPlan:
+    """
+    Compiled read plan: the blocks to read and how to decode every tag from them.
+
+    A plan does not depend on a connection, so it is compiled once at
+    startup and executed every poll cycle with FinsUdpConnection.read_plan.
+    """
+
+    def __init__(self, blocks: List[FinsReadBlock], tags: List[FinsPlannedTag]):
+        self.blocks = blocks
+        self.tags = tags
+        self._command_texts: Optional[List[bytes]] = None
+        self._bit_tags = self._group_bit_tags(tags)
+
+    @staticmethod
+    def _group_bit_tags(tags: List[FinsPlannedTag]) -> Dict[int, tuple]:
+        """
+        Group the bit tags read through their parent words by block.
+
+        Args:
+            tags: Planned tags
+
+        Returns:
+            Block index -> (positions in tags, word offsets, bit numbers)
+        """
+        harvested: Dict[int, List[tuple]] = {}
+        for position, tag in enumerate(tags):
+            if tag.bit is not None:
+                harvested.setdefault(tag.block_index, []).append((position, tag.offset, tag.bit))
+        groups = {}
+        for block_index, entries in harvested.items():
+            positions, offsets, bits = zip(*entries)
+            groups[block_index] = (positions, np.array(offsets, dtype=np.intp), np.array(bits, dtype=np.intp))
+        return groups
+
+    def command_texts(self) -> List[bytes]:
+        """
+        MEMORY_AREA_READ parameters of every block, built once per plan.
+
+        Returns:
+            Command text per block, in block order
+        """
+        if self._command_texts is None:
+            self._command_texts = [block.command_text() for block in self.blocks]
+        return self._command_texts
+
+    def decode(self, block_data: List[Optional[bytes]], indices: Optional[List[int]] = None) -> List[Optional[list]]:
+        """
+        Decode the tags from the response text of the blocks.
+
+        Args:
+            block_data: Response text per block, None for a failed block
+            indices: Plan tag indices to decode, e.g. the changed tags of a
+                FinsChangeDetector; default every tag
+
+        Returns:
+            Converted values per tag, in plan tag order (or indices order);
+            None where the block failed
+        """
+        if indices is None:
+            tags, bit_tags = self.tags, self._bit_tags
+        else:
+            tags = [self.tags[index] for index in indices]
+            bit_tags = self._group_bit_tags(tags)
+        values = []
+        for tag in tags:
+            data = block_data[tag.block_index]
+            if data is None or tag.bit is not None:
+                values.append(None)
+            elif self.blocks[tag.block_index].is_bit:
+                values.append(DATA_TYPE_MAPPING[tag.data_type][1](b'\x00' + data[tag.offset:tag.offset + 1]))
+            else:
+                values.append(DATA_TYPE_MAPPING[tag.data_type][1](
+                    data[tag.offset * 2:(tag.offset + tag.count) * 2]))
+
+        for block_index, (positions, offsets, bits) in bit_tags.items():
+            data = block_data[block_index]
+            if data is None:
+                continue
+            # Expand all 16 bits of every word at once: row = word, column = bit number
+            word_bytes = np.frombuffer(data, dtype=np.uint8, count=self.blocks[block_index].count * 2)
+            word_bits = np.unpackbits(word_bytes.reshape(-1, 2)[:, ::-1], axis=1, bitorder='little')
+            for position, value in zip(positions, word_bits[offsets, bits].tolist()):
+                values[position] = [value]
+        return values
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+    def __repr__(self) -> str:
+        return f"FinsReadPlan({len(self.tags)} tags in {len(self.blocks)} blocks)"
+
+
+class FinsReadPlanner:
+    """
+    Compile tag lists into FinsReadPlan objects.
+
+    Tags are grouped by memory area code and addresses no more than
+    max_gap units apart are merged into one block, so D100..D180 becomes a
+    single read instead of one read per tag. Blocks never exceed
+    max_block_items.
+
+    Bit tags (e.g. '2.01', 'W10.03') are read through their parent words,
+    so all flags packed into a few words cost one word block instead of a
+    bit read each; a word read returns 16 bits in 2 bytes where a bit read
+    returns one byte per bit. Flag areas without a word view (timer and
+    counter flags, task flags, ...) are still read as bits.
+    """
+
+    def __init__(self, max_gap: int = 16, max_block_items: int = MAX_BLOCK_ITEMS,
+                 harvest_bits: bool = True):
+        """
+        Initialize the planner.
+
+        Args:
+            max_gap: Largest number of unused words (bits for bit areas)
+                between two tags that still get merged into one block
+            max_block_items: Largest block size in words (bits for bit areas)
+            harvest_bits: Read bit tags through their parent words
+        """
+        if max_gap < 0:
+            raise FinsDataError(f"max_gap must not be negative, got {max_gap}")
+        if not (1 <= max_block_items <= MAX_BLOCK_ITEMS):
+            raise FinsDataError(f"max_block_items must be between 1-{MAX_BLOCK_ITEMS}, got {max_block_items}")
+        self.max_gap = max_gap
+        self.max_block_items = max_block_items
+        self.harvest_bits = harvest_bits
+
+    def compile(self, tags: List[Union[dict, str]]) -> FinsReadPlan:
+        """
+        Compile a tag list into a read plan.
+
+        Args:
+            tags: Addresses, or dicts with 'plc_reg_add' and optional
+                'data_type' keys like the address_mappings of periodic_sync.
+                The 'bool' data type is read as INT16; a bit tag decodes to
+                [0] or [1] whatever its data type.
+
+        Returns:
+            FinsReadPlan with tags in the given order
+        """
+        # memory area code -> list of (start, count, tag index)
+        areas: Dict[int, List[tuple]] = {}
+        # tag index -> bit number of the bit tags read through their parent word
+        harvested: Dict[int, int] = {}
+        entries = []
+        for index, tag in enumerate(tags):
+            if isinstance(tag, str):
+                address, data_type = tag, 'INT16'
+            else:
+                address, data_type = tag['plc_reg_add'], tag.get('data_type', 'INT16')
+            data_type = (data_type or 'INT16').upper()
+            if data_type == 'BOOL':
+                data_type = 'INT16'
+            if data_type not in DATA_TYPE_MAPPING:
+                raise FinsDataError(
+                        f"Invalid data type: '{data_type}'. Allowed types are: {', '.join(DATA_TYPE_MAPPING.keys())}",
+                        error_code="INVALID_TYPE"
+                        )
+
+            compiled = compile_address(address)
+            memory_type_code, is_bit = compiled.memory_type_code, compiled.is_bit
+            if is_bit and self.harvest_bits and memory_type_code in BIT_TO_WORD_AREA:
+                memory_type_code, is_bit = BIT_TO_WORD_AREA[memory_type_code], False
+                start, count = compiled.word_address, 1
+                harvested[index] = compiled.bit_number
+            elif is_bit:
+                start, count = compiled.word_address * 16 + compiled.bit_number, 1
+            else:
+                start, count = compiled.word_address, DATA_TYPE_MAPPING[data_type][0]
+            areas.setdefault(memory_type_code, []).append((start, count, index))
+            entries.append((address, data_type, is_bit, tag))
+
+        blocks: List[FinsReadBlock] = []
+        planned: List[Optional[FinsPlannedTag]] = [None] * len(entries)
+        for memory_type_code in sorted(areas):
+            is_bit = entries[areas[memory_type_code][0][2]][2]
+            block = None
+            for start, count, index in sorted(areas[memory_type_code]):
+                if (block is None or start > block.end + self.max_gap or
+                        max(block.end, start + count) - block.start > self.max_block_items):
+                    block = FinsReadBlock(memory_type_code, start, count, is_bit)
+                    blocks.append(block)
+                else:
+                    block.count = max(block.end, start + count) - block.start
+                address, data_type, _, tag = entries[index]
+                planned[index] = FinsPlannedTag(address, data_type, len(blocks) - 1,
+                                                start - block.start, count, tag, harvested.get(index))
+
+        return FinsReadPlan(blocks, planned)
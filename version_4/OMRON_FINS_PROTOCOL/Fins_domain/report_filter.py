@@ -0,0 +1,144 @@
+"""
+FINS Report Filter
+==================
+This module decides per poll cycle which tag values are worth reporting
+downstream (deadbands and minimum/maximum reporting intervals).
+"""
+import math
+import time
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from OMRON_FINS_PROTOCOL.exception import FinsDataError
+
+__version__ = "0.1.0"
+
+
+class FinsReportFilter:
+    """
+    Exception-based reporting for a tag list, evaluated for all tags at once.
+
+    Each tag is configured in its address_mappings entry:
+        deadband: Report only changes larger than this absolute amount
+        deadband_percent: Report only changes larger than this percentage
+            of the last reported value
+        min_interval: Seconds between two reports at least ("at most
+            every 100 ms"); a change held back is reported once it elapses
+        max_interval: Seconds between two reports at most ("at least every
+            60 s"); the current value is reported again when it elapses
+
+    All keys are optional. Without any a tag is reported whenever its value
+    differs from the last reported one. Booleans are compared as 0/1.
+
+    Usage:
+        report_filter = FinsReportFilter(address_mappings)
+        for index, value in report_filter.update({0: 21.5, 3: True}).items():
+            opcua_manager.write(address_mappings[index]['opcua_reg_add'], value)
+    """
+
+    def __init__(self, mappings: List[Union[dict, str]]):
+        """
+        Initialize the filter.
+
+        Args:
+            mappings: Tag entries in plan order; plain address strings get no filtering
+
+        Raises:
+            FinsDataError: If a deadband or interval is negative or min_interval > max_interval
+        """
+        count = len(mappings)
+        self.deadband = np.zeros(count)
+        self.deadband_percent = np.zeros(count)
+        self.min_interval = np.zeros(count)
+        self.max_interval = np.full(count, math.inf)
+        for index, mapping in enumerate(mappings):
+            if isinstance(mapping, str):
+                continue
+            for name in ('deadband', 'deadband_percent', 'min_interval', 'max_interval'):
+                setting = mapping.get(name)
+                if setting is None:
+                    continue
+                if setting < 0:
+                    raise FinsDataError(f"{name} of {mapping.get('plc_reg_add')} must not be negative, got {setting}",
+                                        error_code="INVALID_VALUE")
+                getattr(self, name)[index] = setting
+        invalid = np.flatnonzero(self.min_interval > self.max_interval)
+        if invalid.size:
+            raise FinsDataError(f"min_interval exceeds max_interval for {mappings[invalid[0]].get('plc_reg_add')}",
+                                error_code="INVALID_VALUE")
+
+        # Latest value of every tag, as given and as float for the comparisons
+        self.values: List[Any] = [None] * count
+        self._current = np.full(count, math.nan)
+        self._has_value = np.zeros(count, dtype=bool)
+        # Last reported value and its time (monotonic); NaN/-inf before the first report
+        self._reported = np.full(count, math.nan)
+        self._reported_at = np.full(count, -math.inf)
+
+    def reset(self) -> None:
+        """Forget the reported values, so the next update reports every known tag."""
+        self._reported[:] = math.nan
+        self._reported_at[:] = -math.inf
+
+    def unreport(self, indices) -> None:
+        """
+        Forget the last report of some tags, e.g. after their write failed.
+
+        The next update reports them again with their latest value, whether
+        or not it changed and regardless of min_interval.
+
+        Args:
+            indices: Plan tag indices
+        """
+        indices = np.fromiter(indices, dtype=np.intp)
+        self._reported[indices] = math.nan
+        self._reported_at[indices] = -math.inf
+
+    def update(self, values: Dict[int, Any], now: Optional[float] = None) -> Dict[int, Any]:
+        """
+        Store new tag values and pick the ones to report this cycle.
+
+        Tags missing from values keep their latest value, so this works with
+        the changed tags of a FinsChangeDetector; call it every cycle even
+        without new values so held back changes and max_interval reports
+        come out on time.
+
+        Args:
+            values: New value per plan tag index
+            now: time.monotonic() of the cycle, default now
+
+        Returns:
+            Value to report per tag index, in index order
+        """
+        if now is None:
+            now = time.monotonic()
+        if values:
+            indices = np.fromiter(values.keys(), dtype=np.intp, count=len(values))
+            self._current[indices] = [float(value) for value in values.values()]
+            self._has_value[indices] = True
+            for index, value in values.items():
+                self.values[index] = value
+
+        current, reported = self._current, self._reported
+        threshold = np.maximum(self.deadband, np.abs(reported) * self.deadband_percent / 100)
+        with np.errstate(invalid='ignore'):
+            difference = np.abs(current - reported)
+        # Never reported (NaN) counts as changed; a zero threshold reports any change
+        changed = np.isnan(reported) | ((difference > threshold) |
+                                        ((threshold == 0) & (current != reported)))
+        elapsed = now - self._reported_at
+        due = self._has_value & ((changed & (elapsed >= self.min_interval)) | (elapsed >= self.max_interval))
+
+        report = np.flatnonzero(due)
+        reported[report] = current[report]
+        self._reported_at[report] = now
+        return {index: self.values[index] for index in report.tolist()}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __repr__(self) -> str:
+        filtered = int(np.count_nonzero((self.deadband > 0) | (self.deadband_percent > 0) |
+                                        (self.min_interval > 0) | np.isfinite(self.max_interval)))
+        return f"FinsReportFilter({len(self.values)} tags, {filtered} filtered)"
@@ -0,0 +1,47 @@
+"""
+FINS Result Containers
+======================
+This module defines the result dict used by the fast read path.
+"""
+from typing import Callable, Dict
+
+__version__ = "0.1.0"
+
+
+class FinsLazyResult(dict):
+    """
+    Result dict whose diagnostic keys are built on first access.
+
+    It carries the usual status, message, data and data_format keys.
+    Keys registered as lazy (normally 'meta' and 'debug') are built by
+    their factory the first time they are looked up with result[key],
+    result.get(key) or key in result, so polling loops that never look
+    at them never pay for the formatting.
+    """
+
+    def __init__(self, *args, lazy: Dict[str, Callable[[], object]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lazy = dict(lazy or {})
+
+    def __missing__(self, key):
+        if key not in self._lazy:
+            raise KeyError(key)
+        value = self[key] = self._lazy.pop(key)()
+        return value
+
+    def __contains__(self, key) -> bool:
+        return dict.__contains__(self, key) or key in self._lazy
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def materialize(self) -> "FinsLazyResult":
+        """
+        Build every lazy key now, e.g. before serializing the result.
+
+        Returns:
+            self, with all keys present
+        """
+        for key in list(self._lazy):
+            self[key]
+        return self
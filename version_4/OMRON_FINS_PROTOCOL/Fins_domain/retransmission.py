@@ -0,0 +1,112 @@
+"""
+FINS Retransmission Timer
+=========================
+This module estimates per-PLC round-trip times and derives the
+retransmission timeout (RTO) used by the UDP transports.
+"""
+import time
+
+from OMRON_FINS_PROTOCOL.exception import FinsConnectionError
+
+__version__ = "0.1.0"
+
+
+class FinsRetransmissionTimer:
+    """
+    Adaptive retransmission timeout for one PLC, after RFC 6298.
+
+    Every measured round-trip time updates the smoothed RTT (SRTT) and RTT
+    variation (RTTVAR); the timeout is SRTT + 4 * RTTVAR, clamped to
+    [min_rto, max_rto]. Each retransmission of a command doubles the
+    timeout of that command only, so one lost packet does not slow down
+    the commands after it.
+
+    Commands that fail after all retries count as failures. After
+    dead_after failures in a row the PLC is considered dead for
+    dead_holdoff seconds, so callers fail immediately instead of waiting
+    for timeouts. The first command after the holdoff probes the PLC again.
+    """
+
+    def __init__(self, initial_rto: float = 1.0, min_rto: float = 0.02, max_rto: float = 5.0,
+                 dead_after: int = 3, dead_holdoff: float = 5.0):
+        """
+        Initialize the timer.
+
+        Args:
+            initial_rto: Timeout used until the first RTT sample, in seconds
+            min_rto: Lower bound of the timeout, in seconds
+            max_rto: Upper bound of the timeout, in seconds
+            dead_after: Failed commands in a row after which the PLC is dead
+            dead_holdoff: Seconds to fail fast once the PLC is dead
+        """
+        if not (0 < min_rto <= max_rto):
+            raise FinsConnectionError(f"Expected 0 < min_rto <= max_rto, got {min_rto} and {max_rto}")
+        self.min_rto = min_rto
+        self.max_rto = max_rto
+        self.initial_rto = min(max(initial_rto, min_rto), max_rto)
+        self.dead_after = dead_after
+        self.dead_holdoff = dead_holdoff
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all measurements, e.g. after reconnecting."""
+        self.srtt = None
+        self.rttvar = None
+        self.rto = self.initial_rto
+        self.failures = 0
+        self.dead_until = 0.0
+
+    def sample(self, rtt: float) -> None:
+        """
+        Update the estimate with a measured round-trip time.
+
+        Only pass RTTs of responses that unambiguously belong to one
+        transmission (Karn's algorithm); every retransmission carries a
+        fresh SID, so a response's SID identifies the transmission.
+
+        Args:
+            rtt: Round-trip time in seconds
+        """
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.rto = min(max(self.srtt + 4 * self.rttvar, self.min_rto), self.max_rto)
+
+    def backoff(self, rto: float) -> float:
+        """
+        Timeout of the next retransmission of a command.
+
+        Args:
+            rto: Timeout of the transmission that expired, in seconds
+
+        Returns:
+            Doubled timeout, at most max_rto
+        """
+        return min(rto * 2, self.max_rto)
+
+    def command_succeeded(self) -> None:
+        """Record a command that got its response."""
+        self.failures = 0
+        self.dead_until = 0.0
+
+    def command_failed(self) -> None:
+        """Record a command that timed out after all retries."""
+        self.failures += 1
+        if self.failures >= self.dead_after:
+            self.dead_until = time.monotonic() + self.dead_holdoff
+
+    def dead_for(self) -> float:
+        """
+        Remaining fail-fast time.
+
+        Returns:
+            Seconds until the PLC is probed again, 0.0 if it is not dead
+        """
+        return max(self.dead_until - time.monotonic(), 0.0)
+
+    def __repr__(self) -> str:
+        srtt = "n/a" if self.srtt is None else f"{self.srtt * 1000:.1f}ms"
+        return f"FinsRetransmissionTimer(srtt={srtt}, rto={self.rto * 1000:.1f}ms, failures={self.failures})"
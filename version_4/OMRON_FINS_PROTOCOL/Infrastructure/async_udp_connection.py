@@ -0,0 +1,426 @@
+"""
+FINS Async UDP Connection Implementation
+========================================
+This module provides an asyncio implementation of the FINS UDP connection.
+"""
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from OMRON_FINS_PROTOCOL.Fins_domain.change_detection import FinsChangeDetector
+from OMRON_FINS_PROTOCOL.Fins_domain.read_plan import FinsReadPlan
+from OMRON_FINS_PROTOCOL.Infrastructure.udp_connection import FinsUdpConnection
+
+__version__ = "0.1.0"
+
+
+class FinsDatagramProtocol(asyncio.DatagramProtocol):
+    """
+    Datagram protocol that hands FINS responses to the waiting requests.
+
+    Pending requests are (future, command frame) pairs keyed by service ID
+    (SID). A response is only accepted if its SID is pending and it passes
+    the header checks of FinsConnection._response_mismatch for that
+    command; other datagrams (late or duplicate answers) are dropped and
+    counted in connection.discarded.
+    """
+
+    def __init__(self, connection: "AsyncFinsUdpConnection"):
+        self.connection = connection
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self.pending: Dict[int, Tuple[asyncio.Future, bytes]] = {}
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        discarded = self.connection.discarded
+        if len(data) < 14:
+            discarded['short'] += 1
+            return
+        request = self.pending.get(data[9])
+        if request is None or request[0].done():
+            discarded['unknown_sid'] += 1
+            return
+        reason = self.connection._response_mismatch(data, request[1])
+        if reason:
+            discarded[reason] += 1
+            return
+        del self.pending[data[9]]
+        request[0].set_result(data)
+
+    def error_received(self, exc: Exception) -> None:
+        self._fail_pending(ConnectionError(f"UDP communication error: {exc}"))
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self._fail_pending(ConnectionError("UDP socket closed"))
+        self.transport = None
+
+    def _fail_pending(self, error: Exception) -> None:
+        """Fail every request still waiting for a response."""
+        for future, _ in self.pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self.pending.clear()
+
+
+class AsyncFinsUdpConnection(FinsUdpConnection):
+    """
+    asyncio implementation of FINS protocol connection over UDP.
+
+    Frames are built and responses decoded exactly like FinsUdpConnection,
+    so every awaitable method returns the same result dict. Any number of
+    commands may be awaited concurrently; at most pipeline_depth of them
+    are on the wire at once.
+
+    Usage:
+        async with AsyncFinsUdpConnection('192.168.2.2') as fins:
+            status, data = await asyncio.gather(fins.cpu_unit_status_read(),
+                                                fins.read('D100'))
+    """
+
+    def __init__(self, host: str, port: int = 9600, timeout: int = 5,
+                 dest_network: int = 0, dest_node: int = 0, dest_unit: int = 0,
+                 src_network: int = 0, src_node: int = 1, src_unit: int = 0,
+                 destfinsadr: str = "0.0.0", srcfinsadr: str = "0.1.0",debug = False,
+                 pipeline_depth: int = 8, retries: int = 2, min_rto: float = 0.02,
+                 dead_after: int = 3, dead_holdoff: float = 5.0):
+        """
+        Initialize asyncio UDP connection.
+
+        Args:
+            See FinsUdpConnection.
+        """
+        super().__init__(
+            host=host,
+            port=port,
+            timeout=timeout,
+            dest_network=dest_network,
+            dest_node=dest_node,
+            dest_unit=dest_unit,
+            src_network=src_network,
+            src_node=src_node,
+            src_unit=src_unit,
+            destfinsadr=destfinsadr,
+            srcfinsadr=srcfinsadr,
+            debug=debug,
+            pipeline_depth=pipeline_depth,
+            retries=retries,
+            min_rto=min_rto,
+            dead_after=dead_after,
+            dead_holdoff=dead_holdoff
+        )
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self.protocol: Optional[FinsDatagramProtocol] = None
+        self._window: Optional[asyncio.Semaphore] = None
+
+    async def connect(self) -> None:
+        """
+        Create the UDP datagram endpoint.
+
+        Raises:
+            ConnectionError: If endpoint creation fails
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            self.transport, self.protocol = await loop.create_datagram_endpoint(
+                lambda: FinsDatagramProtocol(self), remote_addr=self.addr)
+            self._window = asyncio.Semaphore(self.pipeline_depth)
+            self.retransmission.reset()
+            self.connected = True
+        except OSError as e:
+            self.connected = False
+            raise ConnectionError(f"Failed to create UDP endpoint: {e}")
+
+    async def disconnect(self) -> None:
+        """Close the UDP datagram endpoint."""
+        if self.transport:
+            self.transport.close()
+        self.transport = None
+        self.protocol = None
+        self.connected = False
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.disconnect()
+
+    def __enter__(self):
+        raise TypeError("AsyncFinsUdpConnection must be used with 'async with'")
+
+    async def execute_fins_command_frame(self, fins_command_frame: bytes) -> bytes:
+        """
+        Execute a FINS command frame over UDP.
+
+        The frame gets a free service ID and the call waits on a future
+        keyed by it until the matching response arrives. Without response
+        after the adaptive retransmission timeout the frame is sent again
+        with a fresh SID, like FinsUdpConnection._execute_pipelined.
+
+        Args:
+            fins_command_frame: Complete FINS command frame
+
+        Returns:
+            Response frame bytes
+
+        raises:
+            ConnectionError: If communication fails
+        """
+        if not self.connected or not self.transport:
+            raise ConnectionError("UDP endpoint not initialized")
+
+        timer = self.retransmission
+        dead_for = timer.dead_for()
+        if dead_for:
+            raise ConnectionError(f"PLC not responding, next attempt in {dead_for:.1f}s")
+
+        async with self._window:
+            pending = self.protocol.pending
+            command_frame = bytearray(fins_command_frame)
+            rto = timer.rto
+            for retransmission in range(self.retries + 1):
+                sid = self._next_service_id(pending)
+                command_frame[9] = sid
+                frame = bytes(command_frame)
+                future = asyncio.get_running_loop().create_future()
+                pending[sid] = (future, frame)
+                try:
+                    sent = time.monotonic()
+                    self.transport.sendto(frame)
+                    response_data = await asyncio.wait_for(future, rto)
+                    timer.sample(time.monotonic() - sent)
+                    timer.command_succeeded()
+                    return response_data
+                except asyncio.TimeoutError:
+                    rto = timer.backoff(rto)
+                finally:
+                    if sid in pending and pending[sid][0] is future:
+                        del pending[sid]
+            timer.command_failed()
+            raise ConnectionError("UDP communication timeout")
+
+    async def execute_fins_command_frames(self, fins_command_frames: List[bytes]) -> List[bytes]:
+        """
+        Execute several FINS command frames concurrently.
+
+        Args:
+            fins_command_frames: Complete FINS command frames
+
+        Returns:
+            Response frame bytes, in the same order as the command frames
+        """
+        return list(await asyncio.gather(
+            *(self.execute_fins_command_frame(command_frame) for command_frame in fins_command_frames)))
+
+    async def read(self, memory_area_code, _type: str = 'INT16', fast: bool = False) -> dict:
+        """
+        Read data from PLC memory area using FINS command codes.
+
+        Args:
+            memory_area_code: Memory area identifier
+            _type: Data type used to convert the read words
+            fast: Return a lean FinsLazyResult, see FinsUdpConnection.read
+
+        Returns:
+            Response data, same format as FinsUdpConnection.read
+        """
+        address, _type, readsize = self._prepare_read(memory_area_code, _type)
+        chunks = self._read_command_frames(address, readsize)
+        response_frames = await self.execute_fins_command_frames(
+            [command_frame for _, command_frame in chunks])
+
+        return self._read_result(address, _type, readsize, chunks, response_frames, fast)
+
+    async def read_pipelined(self, memory_area_codes: List[str], _type: Union[str, List[str]] = 'INT16',
+                             fast: bool = False) -> List[dict]:
+        """
+        Read several addresses concurrently.
+
+        Args:
+            memory_area_codes: List of addresses (e.g. ['D100', 'W3.01'])
+            _type: One data type for all addresses or one per address
+            fast: Return lean results, see FinsUdpConnection.read
+
+        Returns:
+            List of result dicts in the same order as memory_area_codes
+
+        Raises:
+            FinsDataError: If the number of types does not match the number of addresses
+        """
+        types = self._expand_types(memory_area_codes, _type)
+        return list(await asyncio.gather(
+            *(self.read(memory_area_code, data_type, fast)
+              for memory_area_code, data_type in zip(memory_area_codes, types))))
+
+    async def read_many(self, memory_area_codes: List[str], types: Union[str, List[str]] = 'INT16') -> dict:
+        """
+        Read scattered addresses with MULTIPLE_MEMORY_AREA_READ, see FinsUdpConnection.read_many.
+
+        Args:
+            memory_area_codes: List of addresses (e.g. ['D100', 'W3.01', 'C0001', '2.01'])
+            types: One data type for all addresses or one per address
+
+        Returns:
+            Result dict whose data maps each address to its converted values
+        """
+        tags, command_frames = self._read_many_command_frames(memory_area_codes, types)
+        response_frames = await self.execute_fins_command_frames(command_frames)
+        return self._read_many_result(tags, command_frames, response_frames)
+
+    async def read_plan(self, plan: FinsReadPlan, detector: Optional[FinsChangeDetector] = None) -> dict:
+        """
+        Execute a compiled read plan, see FinsUdpConnection.read_plan.
+
+        Args:
+            plan: Plan from FinsReadPlanner.compile
+            detector: Optional FinsChangeDetector of the plan
+
+        Returns:
+            Result dict whose data lists the converted values per plan tag,
+            or maps changed tag indices to their values with a detector
+        """
+        response_frames = await self.execute_fins_command_frames(self._read_plan_command_frames(plan))
+        return self._read_plan_result(plan, response_frames, detector)
+
+    async def snapshot(self, area: str, start: int, count: int, path: Optional[str] = None) -> dict:
+        """
+        Dump a whole word range into a NumPy array, see FinsUdpConnection.snapshot.
+
+        Args:
+            area: Area prefix ('D', 'E0_', ...)
+            start: First word
+            count: Number of words
+            path: Optional .npy file to write the snapshot to
+
+        Returns:
+            Result dict whose data is the '>u2' array of all words
+        """
+        address, command_frames = self._snapshot_command_frames(area, start, count)
+        words = self._snapshot_buffer(count, path)
+        response_frames = await self.execute_fins_command_frames(command_frames)
+        end_codes = [self._store_snapshot_chunk(words, index, response_data)
+                     for index, response_data in enumerate(response_frames)]
+        return self._snapshot_result(address, words, end_codes, path)
+
+    async def write(self, memory_area_code, values, _type: str = 'INT16') -> dict:
+        """
+        Write values to PLC memory, see FinsUdpConnection.write.
+
+        Args:
+            memory_area_code: Start address or FinsAddress
+            values: Scalar or sequence of values
+            _type: Data type used to encode the values
+
+        Returns:
+            Result dict; data is None
+        """
+        address, _type, segment = self._write_segment(memory_area_code, values, _type)
+        command_frames, _ = self._write_command_frames([segment])
+        response_frames = await self.execute_fins_command_frames(command_frames)
+        return self._write_result(address.address, _type, command_frames, response_frames)
+
+    async def write_many(self, values: Dict, types: Union[str, List[str]] = 'INT16') -> dict:
+        """
+        Write scattered tags, see FinsUdpConnection.write_many.
+
+        Args:
+            values: Values per address
+            types: One data type for all addresses or one per address
+
+        Returns:
+            Result dict whose data maps each address to True if it was written
+        """
+        tags, command_frames, ranges = self._write_many_command_frames(values, types)
+        response_frames = await self.execute_fins_command_frames(command_frames)
+        return self._write_many_result(tags, ranges, command_frames, response_frames)
+
+    async def fill(self, memory_area_code, count: int, value: int = 0) -> dict:
+        """
+        Set count words to one value, see FinsUdpConnection.fill.
+
+        Args:
+            memory_area_code: Start word address or FinsAddress
+            count: Number of words
+            value: Word value
+
+        Returns:
+            Result dict; data is None
+        """
+        address, command_frames = self._fill_command_frames(memory_area_code, count, value)
+        response_frames = await self.execute_fins_command_frames(command_frames)
+        return self._write_result(address.address, "FILL", command_frames, response_frames)
+
+    async def transfer(self, source, destination, count: int) -> dict:
+        """
+        Copy count words inside the PLC, see FinsUdpConnection.transfer.
+
+        Args:
+            source: First source word or FinsAddress
+            destination: First destination word or FinsAddress
+            count: Number of words
+
+        Returns:
+            Result dict; data is None
+        """
+        address, command_frames, ordered = self._transfer_command_frames(source, destination, count)
+        if ordered:
+            response_frames = [await self.execute_fins_command_frame(command_frame)
+                               for command_frame in command_frames]
+        else:
+            response_frames = await self.execute_fins_command_frames(command_frames)
+        return self._write_result(address.address, "TRANSFER", command_frames, response_frames)
+
+    async def _command_result(self, command_code: bytes, data_format: str,
+                              result_function: Callable[[dict, bytes], dict]) -> dict:
+        """
+        Execute a parameterless command and build its result dict.
+
+        Args:
+            command_code: FINS command code
+            data_format: Value of the data_format key
+            result_function: Decoder shared with FinsUdpConnection
+
+        Returns:
+            Result dict
+        """
+        final_result = {
+            "status": "",
+            "message": "",
+            "data": None,
+            "data_format": data_format,
+            "meta": {},
+            "debug": {}
+            }
+        command_frame = self.fins_command_frame(command_code=command_code)
+        final_result["debug"]["command_frame"] = str(command_frame)
+        try:
+            response_data = await self.execute_fins_command_frame(command_frame)
+            return result_function(final_result, response_data)
+
+        except ConnectionError as e:
+            final_result["status"] = "error"
+            final_result["message"] = f"Connection Error: {str(e)}"
+            return final_result
+        except Exception as e:
+            final_result["status"] = "error"
+            final_result["message"] = f"An unexpected error occurred: {str(e)}"
+            return final_result
+
+    async def cpu_unit_details_read(self) -> dict:
+        """Read CPU unit details, see FinsUdpConnection.cpu_unit_details_read."""
+        return await self._command_result(self.command_codes.CPU_UNIT_DATA_READ, "N/A",
+                                          self._cpu_unit_details_result)
+
+    async def cpu_unit_status_read(self) -> dict:
+        """Read CPU unit status, see FinsUdpConnection.cpu_unit_status_read."""
+        return await self._command_result(self.command_codes.CPU_UNIT_STATUS_READ, "N/A",
+                                          self._cpu_unit_status_result)
+
+    async def clock_read(self) -> dict:
+        """Read PLC clock, see FinsUdpConnection.clock_read."""
+        return await self._command_result(self.command_codes.CLOCK_READ, "DATETIME",
+                                          self._clock_result)
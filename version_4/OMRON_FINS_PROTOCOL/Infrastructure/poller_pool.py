@@ -0,0 +1,377 @@
+"""
+FINS UDP Poller Pool
+====================
+This module serves many PLCs from one (or a few) UDP sockets.
+"""
+import math
+import selectors
+import socket
+import time
+from typing import Callable, Dict, List, Optional, Union
+
+from OMRON_FINS_PROTOCOL.Fins_domain.read_plan import FinsReadPlan
+from OMRON_FINS_PROTOCOL.Infrastructure.udp_connection import FinsUdpConnection, RECEIVE_BUFFER_SIZE
+from OMRON_FINS_PROTOCOL.exception import FinsConnectionError
+
+__version__ = "0.1.0"
+
+# Kernel receive buffer requested per pool socket, so a burst of responses
+# from many PLCs is not dropped before the pool drains it
+SOCKET_RECEIVE_BUFFER = 1 << 20
+
+# Longest wait before sending again after the send buffer of a socket was full
+SEND_RETRY_DELAY = 0.001
+
+
+class _PollJob:
+    """Command frames of one PLC executed by FinsPollerPool._execute."""
+
+    __slots__ = ('connection', 'frames', 'handle_response', 'keep_service_id',
+                 'next_index', 'pending', 'error')
+
+    def __init__(self, connection: "FinsPooledConnection", frames: List[bytes],
+                 handle_response: Callable[[int, memoryview], None], keep_service_id: bool = False):
+        self.connection = connection
+        self.frames = frames
+        self.handle_response = handle_response
+        self.keep_service_id = keep_service_id
+        self.next_index = 0
+        self.pending = {}  # SID -> [index, command frame, send time, retransmissions, timeout]
+        self.error: Optional[ConnectionError] = None
+
+    @property
+    def done(self) -> bool:
+        return self.next_index == len(self.frames) and not self.pending
+
+
+class FinsPooledConnection(FinsUdpConnection):
+    """
+    FINS UDP connection that sends and receives through a FinsPollerPool.
+
+    It offers the full FinsUdpConnection API (read, read_many, read_plan,
+    ...); only the transport is shared. Create it with
+    FinsPollerPool.connection rather than directly.
+    """
+
+    def __init__(self, pool: "FinsPollerPool", host: str, port: int = 9600, **kwargs):
+        """
+        Initialize pooled connection.
+
+        Args:
+            pool: Pool owning the socket
+            host: PLC IP address or hostname
+            port: UDP port number (default 9600 for FINS)
+            **kwargs: Further FinsUdpConnection arguments
+        """
+        super().__init__(host, port, **kwargs)
+        self.pool = pool
+        # Source address of the responses, used to route them back here
+        self.route = (socket.gethostbyname(host), port)
+
+    def connect(self) -> None:
+        """
+        Attach to the socket of the pool.
+
+        Raises:
+            ConnectionError: If the pool is not open
+        """
+        self.socket = self.pool._socket_for(self)
+        self.retransmission.reset()
+        self.connected = True
+
+    def disconnect(self) -> None:
+        """Detach from the pool; the shared socket stays open."""
+        self.socket = None
+        self.connected = False
+
+    def _execute_pipelined(self, fins_command_frames: List[bytes],
+                           handle_response: Callable[[int, memoryview], None],
+                           keep_service_id: bool = False) -> None:
+        """
+        Execute command frames through the pool, see FinsUdpConnection._execute_pipelined.
+
+        raises:
+            ConnectionError: If communication fails
+        """
+        if not self.connected or not self.socket:
+            raise ConnectionError("UDP socket not initialized")
+        job = _PollJob(self, fins_command_frames, handle_response, keep_service_id)
+        self.pool._execute([job])
+        if job.error:
+            raise job.error
+
+
+class FinsPollerPool:
+    """
+    Poll hundreds of PLCs from one process without a socket or thread per PLC.
+
+    All PLCs share a few non-blocking UDP sockets watched by a selector
+    (epoll on Linux). Responses are routed back by source address and
+    service ID (SID) to the request state of their PLC, so every PLC keeps
+    its own pipeline window and retransmission timer while all of them are
+    served concurrently.
+
+    Usage:
+        with FinsPollerPool() as pool:
+            plcs = [pool.connection(host) for host in hosts]
+            plan = FinsReadPlanner().compile(tags)
+            results = pool.read_plans({plc: plan for plc in plcs})
+    """
+
+    def __init__(self, sockets: int = 1, bind_host: str = ''):
+        """
+        Initialize the pool.
+
+        Args:
+            sockets: Number of UDP sockets; PLCs are spread over them round-robin
+            bind_host: Local address the sockets bind to
+        """
+        if sockets < 1:
+            raise FinsConnectionError(f"A pool needs at least one socket, got {sockets}")
+        self.socket_count = sockets
+        self.bind_host = bind_host
+        self.connections: List[FinsPooledConnection] = []
+        self.selector: Optional[selectors.BaseSelector] = None
+        self._sockets: List[socket.socket] = []
+        self._routes: Dict[tuple, FinsPooledConnection] = {}
+        # Datagrams from addresses without a job in progress; the other
+        # discards are counted per PLC in FinsPooledConnection.discarded
+        self.discarded_unknown_source = 0
+        # Responses of all PLCs are received into one preallocated buffer
+        self._receive_buffer = bytearray(RECEIVE_BUFFER_SIZE)
+        self._receive_view = memoryview(self._receive_buffer)
+
+    def open(self) -> None:
+        """
+        Create the sockets and attach every connection of the pool.
+
+        Raises:
+            ConnectionError: If socket creation fails
+        """
+        if self.selector:
+            return
+        self.selector = selectors.DefaultSelector()
+        try:
+            for _ in range(self.socket_count):
+                pool_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                self._sockets.append(pool_socket)
+                pool_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RECEIVE_BUFFER)
+                pool_socket.bind((self.bind_host, 0))
+                pool_socket.setblocking(False)
+                self.selector.register(pool_socket, selectors.EVENT_READ)
+        except socket.error as e:
+            self.close()
+            raise ConnectionError(f"Failed to create UDP socket: {e}")
+        for connection in self.connections:
+            connection.connect()
+
+    def close(self) -> None:
+        """Detach all connections and close the sockets."""
+        for connection in self.connections:
+            connection.disconnect()
+        if self.selector:
+            self.selector.close()
+            self.selector = None
+        for pool_socket in self._sockets:
+            try:
+                pool_socket.close()
+            except socket.error:
+                pass
+        self._sockets = []
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def connection(self, host: str, port: int = 9600, **kwargs) -> FinsPooledConnection:
+        """
+        Add a PLC to the pool.
+
+        Args:
+            host: PLC IP address or hostname
+            port: UDP port number (default 9600 for FINS)
+            **kwargs: Further FinsUdpConnection arguments (timeout, retries, ...)
+
+        Returns:
+            FinsPooledConnection, already connected if the pool is open
+
+        Raises:
+            FinsConnectionError: If the PLC address is already in the pool
+        """
+        connection = FinsPooledConnection(self, host, port, **kwargs)
+        if connection.route in self._routes:
+            raise FinsConnectionError(f"PLC {connection.route[0]}:{connection.route[1]} is already in the pool")
+        self._routes[connection.route] = connection
+        self.connections.append(connection)
+        if self.selector:
+            connection.connect()
+        return connection
+
+    def _socket_for(self, connection: FinsPooledConnection) -> socket.socket:
+        """
+        Pick the socket of a connection.
+
+        Raises:
+            ConnectionError: If the pool is not open
+        """
+        if not self._sockets:
+            raise ConnectionError("Poller pool not open")
+        return self._sockets[self.connections.index(connection) % len(self._sockets)]
+
+    def execute(self, frames: Dict[FinsPooledConnection, List[bytes]]
+                ) -> Dict[FinsPooledConnection, Union[List[bytes], ConnectionError]]:
+        """
+        Execute command frames on many PLCs concurrently.
+
+        Args:
+            frames: Command frames per connection
+
+        Returns:
+            Response frame bytes per connection in command order, or the
+            ConnectionError of a PLC that failed
+        """
+        responses = {}
+        jobs = []
+        for connection, command_frames in frames.items():
+            response_frames = responses[connection] = [None] * len(command_frames)
+
+            def store(index: int, response_data: memoryview, response_frames=response_frames) -> None:
+                response_frames[index] = bytes(response_data)
+            jobs.append(_PollJob(connection, command_frames, store))
+        self._execute(jobs)
+        for job in jobs:
+            if job.error:
+                responses[job.connection] = job.error
+        return responses
+
+    def read_plans(self, plans: Dict[FinsPooledConnection, FinsReadPlan]) -> Dict[FinsPooledConnection, dict]:
+        """
+        Execute a read plan on many PLCs concurrently, see FinsUdpConnection.read_plan.
+
+        Args:
+            plans: Read plan per connection; PLCs may share one plan
+
+        Returns:
+            Result dict per connection; a PLC that did not respond gets a
+            result with status 'error' and data None
+        """
+        responses = self.execute({connection: connection._read_plan_command_frames(plan)
+                                  for connection, plan in plans.items()})
+        results = {}
+        for connection, plan in plans.items():
+            response_frames = responses[connection]
+            if isinstance(response_frames, ConnectionError):
+                results[connection] = {
+                    "status": "error",
+                    "message": f"Connection Error: {str(response_frames)}",
+                    "data": None,
+                    "data_format": "PLAN",
+                    "meta": {"blocks": len(plan.blocks)},
+                    "debug": {}
+                    }
+            else:
+                results[connection] = connection._read_plan_result(plan, response_frames)
+        return results
+
+    def _execute(self, jobs: List[_PollJob]) -> None:
+        """
+        Run jobs until every one of them is answered or failed.
+
+        Each job keeps its own pipeline window and retransmission state
+        (see FinsUdpConnection._execute_pipelined); failures, including a
+        PLC address the socket cannot send to, are stored in job.error
+        instead of stopping the other PLCs. A full send buffer only delays
+        the sends to the next pass.
+
+        raises:
+            ConnectionError: If the pool is not open or receiving fails
+        """
+        if not self.selector:
+            raise ConnectionError("Poller pool not open")
+
+        active: Dict[tuple, _PollJob] = {}
+        for job in jobs:
+            connection = job.connection
+            dead_for = connection.retransmission.dead_for()
+            if not connection.connected:
+                job.error = ConnectionError("UDP socket not initialized")
+            elif dead_for:
+                job.error = ConnectionError(f"PLC not responding, next attempt in {dead_for:.1f}s")
+            elif connection.route in active:
+                raise FinsConnectionError(f"PLC {connection.route[0]}:{connection.route[1]} has two jobs")
+            elif job.frames:
+                active[connection.route] = job
+
+        try:
+            while active:
+                # Fill the windows
+                send_blocked = False
+                for route, job in list(active.items()):
+                    connection = job.connection
+                    try:
+                        while job.next_index < len(job.frames) and len(job.pending) < connection.pipeline_depth:
+                            connection._send_pending(job.pending, job.next_index,
+                                                     job.frames[job.next_index], job.keep_service_id)
+                            job.next_index += 1
+                    except BlockingIOError:
+                        send_blocked = True
+                    except OSError as e:
+                        self._fail_job(job, e)
+                        del active[route]
+                if not active:
+                    break
+
+                timeout = min((job.connection._next_expiry(job.pending) for job in active.values() if job.pending),
+                              default=math.inf) - time.monotonic()
+                if send_blocked:
+                    timeout = min(timeout, SEND_RETRY_DELAY)
+                for key, _ in self.selector.select(max(timeout, 0)):
+                    self._drain(key.fileobj, active)
+
+                now = time.monotonic()
+                for route, job in list(active.items()):
+                    connection = job.connection
+                    if job.done:
+                        connection.retransmission.command_succeeded()
+                        del active[route]
+                    elif job.pending and connection._next_expiry(job.pending) <= now:
+                        try:
+                            connection._retransmit_expired(job.pending)
+                        except OSError as e:
+                            self._fail_job(job, e)
+                            del active[route]
+
+        except socket.error as e:
+            raise ConnectionError(f"UDP communication error: {e}")
+
+    @staticmethod
+    def _fail_job(job: _PollJob, error: OSError) -> None:
+        """Store the error of a job and forget its pending commands."""
+        job.error = error if isinstance(error, ConnectionError) else ConnectionError(f"UDP communication error: {error}")
+        job.pending.clear()
+
+    def _drain(self, pool_socket: socket.socket, active: Dict[tuple, _PollJob]) -> None:
+        """
+        Receive every queued datagram of a socket and route it to its job.
+
+        Args:
+            pool_socket: Readable socket
+            active: Jobs in progress by PLC address
+        """
+        while True:
+            try:
+                nbytes, source = pool_socket.recvfrom_into(self._receive_buffer)
+            except (BlockingIOError, InterruptedError):
+                return
+            except (ConnectionRefusedError, ConnectionResetError):
+                # ICMP port unreachable of one PLC (reported on Windows);
+                # its commands time out like any other lost datagram
+                continue
+            job = active.get(source)
+            if job is None:
+                self.discarded_unknown_source += 1
+                continue
+            job.connection._complete_pending(job.pending, self._receive_view[:nbytes], job.handle_response)
@@ -0,0 +1,325 @@
+"""
+FINS Shadow Image
+=================
+This module keeps the polled memory of a PLC in shared memory, so any
+number of processes can read the tag values without talking to the PLC.
+"""
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from OMRON_FINS_PROTOCOL.Fins_domain.read_plan import FinsReadPlan
+from OMRON_FINS_PROTOCOL.exception import FinsConnectionError, FinsDataError
+
+__version__ = "0.1.0"
+
+# Segment header: magic, layout version, number of blocks
+IMAGE_HEADER = struct.Struct('<4sHxxI')
+IMAGE_MAGIC = b'FSHI'
+IMAGE_VERSION = 1
+
+# One entry per plan block, right after the header. seq is the seqlock
+# counter (odd while the block is being written), timestamp the time.time()
+# of the last successful update (0.0 before the first one)
+BLOCK_TABLE_DTYPE = np.dtype([
+    ('seq', '<u8'),
+    ('timestamp', '<f8'),
+    ('memory_type_code', 'u1'),
+    ('is_bit', 'u1'),
+    ('start', '<u4'),
+    ('count', '<u4'),
+    ('offset', '<u4'),
+    ], align=True)
+
+# Attempts of a consistent block read before giving up on a busy writer
+READ_RETRIES = 1000
+
+
+def _block_size(block) -> int:
+    """Bytes of block data: 2 per word, 1 per bit as returned by MEMORY_AREA_READ."""
+    return block.count if block.is_bit else block.count * 2
+
+
+class FinsShadowImage:
+    """
+    Shadow image of the areas a read plan polls, in a shared memory segment.
+
+    The poller process creates the image and refreshes it with poll()
+    every cycle; the response text of every plan block is copied from the
+    receive buffer straight into the segment. Reader processes (the OPC UA
+    bridge, dashboards, scripts) attach by name with the same plan and read
+    tag values without any PLC traffic.
+
+    Every block carries a sequence counter and the timestamp of its last
+    successful update. The writer makes the counter odd while it copies a
+    block (a seqlock), so read() retries until it gets a consistent copy;
+    view() returns the zero-copy word array for readers that can live with
+    a block changing under them. A failed block keeps its old data and
+    timestamp, so readers see its age grow.
+
+    Usage:
+        # poller
+        with FinsShadowImage('plc1', plan, create=True) as image:
+            while True:
+                image.poll(fins)
+                time.sleep(0.1)
+
+        # any reader process
+        with FinsShadowImage('plc1', plan) as image:
+            values = image.values()
+    """
+
+    def __init__(self, name: str, plan: FinsReadPlan, create: bool = False):
+        """
+        Create or attach to a shadow image.
+
+        Args:
+            name: Shared memory segment name, one per PLC
+            plan: Read plan the image holds; readers must compile the same plan
+            create: Create the segment (poller) instead of attaching to it (reader)
+
+        Raises:
+            FinsConnectionError: If the segment cannot be created or opened
+            FinsDataError: If an existing segment was built from another plan
+        """
+        self.name = name
+        self.plan = plan
+        self.owner = create
+        self._block_sizes = [_block_size(block) for block in plan.blocks]
+        table_end = IMAGE_HEADER.size + BLOCK_TABLE_DTYPE.itemsize * len(plan.blocks)
+        offsets = []
+        position = (table_end + 7) & ~7
+        for size in self._block_sizes:
+            offsets.append(position)
+            position = (position + size + 7) & ~7
+
+        try:
+            if create:
+                self._memory = shared_memory.SharedMemory(name, create=True, size=max(position, 1))
+            else:
+                self._memory = shared_memory.SharedMemory(name)
+                # Readers must not unlink the segment when they exit
+                resource_tracker.unregister(self._memory._name, 'shared_memory')
+        except OSError as e:
+            raise FinsConnectionError(f"Cannot open shadow image '{name}': {e}")
+
+        self.table = np.ndarray(len(plan.blocks), BLOCK_TABLE_DTYPE, self._memory.buf, IMAGE_HEADER.size)
+        self._seq = self.table['seq']
+        self._timestamp = self.table['timestamp']
+        if create:
+            IMAGE_HEADER.pack_into(self._memory.buf, 0, IMAGE_MAGIC, IMAGE_VERSION, len(plan.blocks))
+            for index, block in enumerate(plan.blocks):
+                self.table[index] = (0, 0.0, block.memory_type_code, block.is_bit,
+                                     block.start, block.count, offsets[index])
+        else:
+            try:
+                self._check_layout(offsets, position)
+            except FinsDataError:
+                self.table = self._seq = self._timestamp = None
+                self._memory.close()
+                raise
+
+        self._data = [self._memory.buf[offset:offset + size] for offset, size in zip(offsets, self._block_sizes)]
+        self._views = [np.frombuffer(data, dtype=np.uint8 if block.is_bit else '>u2')
+                       for data, block in zip(self._data, plan.blocks)]
+        for view in self._views:
+            view.flags.writeable = create
+
+    def _check_layout(self, offsets: List[int], size: int) -> None:
+        """
+        Check that an attached segment holds the blocks of self.plan.
+
+        Raises:
+            FinsDataError: If the segment was built from another plan
+        """
+        if self._memory.size < size:
+            raise FinsDataError(f"Shadow image '{self.name}' is smaller than its plan needs")
+        magic, version, blocks = IMAGE_HEADER.unpack_from(self._memory.buf, 0)
+        if magic != IMAGE_MAGIC or version != IMAGE_VERSION or blocks != len(self.plan.blocks):
+            raise FinsDataError(f"Shadow image '{self.name}' does not match the read plan")
+        for index, block in enumerate(self.plan.blocks):
+            entry = self.table[index]
+            if (entry['memory_type_code'], bool(entry['is_bit']), entry['start'], entry['count'],
+                    entry['offset']) != (block.memory_type_code, block.is_bit, block.start,
+                                         block.count, offsets[index]):
+                raise FinsDataError(f"Shadow image '{self.name}' does not match the read plan at {block}")
+
+    def close(self) -> None:
+        """Detach from the segment; the creating poller also removes it."""
+        if self._memory is None:
+            return
+        # Views into the segment must be gone before it can be closed
+        self.table = self._seq = self._timestamp = None
+        self._views = []
+        for data in self._data:
+            data.release()
+        self._data = []
+        self._memory.close()
+        if self.owner:
+            # A reader in the same process tree shares the resource tracker
+            # and its unregister dropped ours; unlink expects it registered
+            resource_tracker.register(self._memory._name, 'shared_memory')
+            try:
+                self._memory.unlink()
+            except FileNotFoundError:
+                pass
+        self._memory = None
+
+    def __del__(self):
+        if getattr(self, '_memory', None) is not None and self.table is not None:
+            self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # --- writer side ---
+
+    def store_block(self, index: int, text, timestamp: Optional[float] = None) -> None:
+        """
+        Copy the response text of one block into the image under the seqlock.
+
+        Args:
+            index: Block index in the plan
+            text: MEMORY_AREA_READ response text (bytes or memoryview)
+            timestamp: Update time, default time.time()
+        """
+        size = min(len(text), self._block_sizes[index])
+        self._seq[index] += 1
+        self._data[index][:size] = text[:size]
+        self._timestamp[index] = time.time() if timestamp is None else timestamp
+        self._seq[index] += 1
+
+    def update(self, response_frames: List[Optional[bytes]]) -> List[int]:
+        """
+        Store the block responses of one plan execution, e.g. from FinsPollerPool.execute.
+
+        Args:
+            response_frames: Response frame per block, None for a block without response
+
+        Returns:
+            Indices of the blocks that were not updated
+        """
+        timestamp = time.time()
+        failed = []
+        for index, response_data in enumerate(response_frames):
+            if response_data is None or response_data[12:14] != b'\x00\x00':
+                failed.append(index)
+            else:
+                self.store_block(index, memoryview(response_data)[14:], timestamp)
+        return failed
+
+    def poll(self, connection) -> dict:
+        """
+        Execute the plan on a connection and store every block as it arrives.
+
+        Responses are copied from the receive buffer of the connection into
+        the image, without intermediate bytes objects or decoding.
+
+        Args:
+            connection: Connected FinsUdpConnection (or FinsPooledConnection)
+
+        Returns:
+            Result dict; data is None, meta lists the failed blocks
+
+        raises:
+            ConnectionError: If communication fails
+        """
+        final_result = {
+            "status": "success",
+            "message": "",
+            "data": None,
+            "data_format": "SHADOW",
+            "meta": {"blocks": len(self.plan.blocks), "failed_blocks": []},
+            "debug": {}
+            }
+        timestamp = time.time()
+
+        def store(index: int, response_data: memoryview) -> None:
+            is_success, msg = connection._check_response(bytes(response_data[12:14]))
+            if is_success:
+                self.store_block(index, response_data[14:], timestamp)
+            else:
+                final_result["status"] = "error"
+                final_result["message"] = msg
+                final_result["meta"]["failed_blocks"].append(index)
+
+        connection._execute_pipelined(connection._read_plan_command_frames(self.plan), store)
+        final_result["meta"]["failed_blocks"].sort()
+        return final_result
+
+    # --- reader side ---
+
+    def sequence(self, index: int) -> int:
+        """Sequence counter of a block; it grows by 2 per update."""
+        return int(self._seq[index])
+
+    def timestamp(self, index: int) -> float:
+        """time.time() of the last update of a block, 0.0 if it was never updated."""
+        return float(self._timestamp[index])
+
+    def age(self, index: int) -> float:
+        """Seconds since the last update of a block, inf if it was never updated."""
+        timestamp = self.timestamp(index)
+        return time.time() - timestamp if timestamp else float('inf')
+
+    def view(self, index: int) -> np.ndarray:
+        """
+        Zero-copy array of a block: '>u2' words, or one uint8 per bit for bit blocks.
+
+        The array changes in place with every update; use read() for a
+        consistent copy.
+        """
+        return self._views[index]
+
+    def read(self, index: int) -> Tuple[bytes, int, float]:
+        """
+        Consistent copy of one block.
+
+        Returns:
+            Tuple of (block data, sequence counter, timestamp)
+
+        Raises:
+            FinsConnectionError: If the writer kept the block busy for READ_RETRIES attempts
+        """
+        seq_array, data = self._seq, self._data[index]
+        for _ in range(READ_RETRIES):
+            seq = int(seq_array[index])
+            if seq & 1:
+                time.sleep(0)
+                continue
+            copy = bytes(data)
+            timestamp = float(self._timestamp[index])
+            if int(seq_array[index]) == seq:
+                return copy, seq, timestamp
+        raise FinsConnectionError(f"Block {index} of shadow image '{self.name}' stayed busy")
+
+    def values(self, max_age: Optional[float] = None) -> List[Optional[list]]:
+        """
+        Decode every tag of the plan from consistent block copies, see FinsReadPlan.decode.
+
+        Args:
+            max_age: Treat blocks older than this many seconds (or never
+                updated) as failed
+
+        Returns:
+            Converted values per plan tag; None for stale or never updated blocks
+        """
+        now = time.time()
+        block_data = []
+        for index in range(len(self.plan.blocks)):
+            data, _, timestamp = self.read(index)
+            if not timestamp or (max_age is not None and now - timestamp > max_age):
+                block_data.append(None)
+            else:
+                block_data.append(data)
+        return self.plan.decode(block_data)
+
+    def __repr__(self) -> str:
+        role = "owner" if self.owner else "reader"
+        return f"FinsShadowImage({self.name!r}, {len(self.plan.blocks)} blocks, {role})"
@@ -0,0 +1,280 @@
+"""
+FINS Shard Supervisor
+=====================
+This module spreads a large PLC fleet over a pool of worker processes.
+"""
+import math
+import multiprocessing
+import struct
+import time
+from multiprocessing.connection import wait
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from OMRON_FINS_PROTOCOL.Fins_domain.read_plan import FinsReadPlanner
+from OMRON_FINS_PROTOCOL.exception import FinsConnectionError, FinsDataError
+
+__version__ = "0.1.0"
+
+# Batch header: cycle timestamp, shard index, number of PLC records
+BATCH_HEADER = struct.Struct('<dII')
+# PLC record header: global PLC index, status, number of tag values
+RECORD_HEADER = struct.Struct('<IBI')
+
+# Record status codes
+STATUS_SUCCESS = 0
+STATUS_ERROR = 1             # the PLC answered, but some blocks failed
+STATUS_CONNECTION_ERROR = 2  # no answer, every value is NaN
+
+# Tag values travel as float64, exact only up to 2**53; these types can exceed it
+INEXACT_DATA_TYPES = ('INT64', 'UINT64')
+
+
+def encode_batch(timestamp: float, shard: int, records: List[Tuple[int, int, np.ndarray]]) -> bytes:
+    """
+    Pack the results of one poll cycle into a binary batch.
+
+    Args:
+        timestamp: time.time() of the cycle
+        shard: Index of the shard
+        records: (PLC index, status, float64 tag values) per PLC
+
+    Returns:
+        Batch bytes
+    """
+    parts = [BATCH_HEADER.pack(timestamp, shard, len(records))]
+    for plc_index, status, values in records:
+        parts.append(RECORD_HEADER.pack(plc_index, status, len(values)))
+        parts.append(values.astype('<f8', copy=False).tobytes())
+    return b''.join(parts)
+
+
+def decode_batch(batch: bytes) -> Tuple[float, int, List[Tuple[int, int, np.ndarray]]]:
+    """
+    Unpack a batch built by encode_batch.
+
+    The value arrays are read-only views into the batch, nothing is copied.
+
+    Args:
+        batch: Batch bytes
+
+    Returns:
+        Tuple of (timestamp, shard index, (PLC index, status, values) per PLC)
+    """
+    timestamp, shard, count = BATCH_HEADER.unpack_from(batch, 0)
+    position = BATCH_HEADER.size
+    records = []
+    for _ in range(count):
+        plc_index, status, tags = RECORD_HEADER.unpack_from(batch, position)
+        position += RECORD_HEADER.size
+        records.append((plc_index, status, np.frombuffer(batch, '<f8', tags, position)))
+        position += tags * 8
+    return timestamp, shard, records
+
+
+def _plan_values(result: dict, tag_count: int) -> Tuple[int, np.ndarray]:
+    """
+    Flatten a read_plan result to one float64 per tag, NaN where it failed.
+
+    Args:
+        result: Result dict of read_plan
+        tag_count: Number of tags in the plan
+
+    Returns:
+        Tuple of (record status, values)
+    """
+    values = np.full(tag_count, math.nan)
+    if result["data"] is None:
+        return STATUS_CONNECTION_ERROR, values
+    for index, value in enumerate(result["data"]):
+        if value:
+            values[index] = value[0]
+    return (STATUS_SUCCESS if result["status"] == "success" else STATUS_ERROR), values
+
+
+def _shard_worker(shard: int, plcs: List[Tuple[int, dict]], tags: List[Union[dict, str]],
+                  interval: float, writer, stop_flag) -> None:
+    """
+    Worker process: poll the PLCs of one shard and send binary batches.
+
+    Args:
+        shard: Index of the shard
+        plcs: (global PLC index, connection arguments) per PLC
+        tags: Tag list compiled into the poll plan
+        interval: Poll interval in seconds
+        writer: Sending end of the batch pipe
+        stop_flag: Shared byte set to 1 by the supervisor to stop the worker
+    """
+    # Imported here so the worker only pays for the pool when it starts
+    from OMRON_FINS_PROTOCOL.Infrastructure.poller_pool import FinsPollerPool
+
+    plan = FinsReadPlanner().compile(tags)
+    with FinsPollerPool() as pool:
+        connections = [(plc_index, pool.connection(**plc)) for plc_index, plc in plcs]
+        plans = {connection: plan for _, connection in connections}
+        next_cycle = time.monotonic()
+        while not stop_flag.value:
+            timestamp = time.time()
+            results = pool.read_plans(plans)
+            records = [(plc_index,) + _plan_values(results[connection], len(plan))
+                       for plc_index, connection in connections]
+            try:
+                writer.send_bytes(encode_batch(timestamp, shard, records))
+            except (BrokenPipeError, EOFError):
+                return
+            next_cycle += interval
+            delay = next_cycle - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_cycle = time.monotonic()
+
+
+class FinsShardSupervisor:
+    """
+    Poll a large PLC fleet with a pool of worker processes.
+
+    The PLC list is split into shards, one per worker. Every worker polls
+    its shard with its own FinsPollerPool and the same compiled read plan,
+    converts the tags to float64 and sends one binary batch per cycle over
+    a pipe (see encode_batch), so the parent never unpickles result dicts.
+    Float64 holds integers exactly only up to 2**53, so INT64 and UINT64
+    tags are rejected; poll them with FinsUdpConnection.read_plan instead.
+    A crashed worker is restarted on the next poll() without touching the
+    other shards.
+
+    Usage:
+        with FinsShardSupervisor(plcs, address_mappings, workers=8) as supervisor:
+            while True:
+                for timestamp, shard, records in supervisor.poll():
+                    for plc_index, status, values in records:
+                        ...
+    """
+
+    def __init__(self, plcs: List[Union[dict, str]], tags: List[Union[dict, str]],
+                 workers: Optional[int] = None, interval: float = 0.1):
+        """
+        Initialize the supervisor.
+
+        Args:
+            plcs: Hosts, or dicts of FinsPollerPool.connection arguments
+                ('host', 'port', 'timeout', ...); a PLC's index in this list
+                identifies it in the batches
+            tags: Tags polled on every PLC, see FinsReadPlanner.compile
+            workers: Number of worker processes, default one per CPU
+            interval: Poll interval in seconds
+
+        Raises:
+            FinsConnectionError: If plcs is empty
+            FinsDataError: If a tag is invalid or of a type in INEXACT_DATA_TYPES
+        """
+        if not plcs:
+            raise FinsConnectionError("No PLCs to poll")
+        self.plcs = [{'host': plc} if isinstance(plc, str) else dict(plc) for plc in plcs]
+        self.tags = list(tags)
+        # Compile once here so a bad tag list fails in the parent, not in every worker
+        plan = FinsReadPlanner().compile(self.tags)
+        for tag in plan.tags:
+            if tag.data_type in INEXACT_DATA_TYPES:
+                raise FinsDataError(f"{tag.data_type} tag {tag.address} does not fit the float64 batches",
+                                    error_code="INVALID_TYPE")
+        self.tag_count = len(plan)
+        self.workers = min(workers or multiprocessing.cpu_count(), len(self.plcs))
+        self.interval = interval
+        self.restarts = 0
+        self._context = multiprocessing.get_context()
+        # Lock-free stop flag: a killed worker cannot leave it locked
+        self._stop_flag = None
+        # shard index -> (process, receiving end of its pipe)
+        self._shards: Dict[int, tuple] = {}
+
+    def shard_plcs(self, shard: int) -> List[Tuple[int, dict]]:
+        """
+        PLCs of one shard.
+
+        Args:
+            shard: Index of the shard
+
+        Returns:
+            (global PLC index, connection arguments) per PLC
+        """
+        return [(index, self.plcs[index]) for index in range(shard, len(self.plcs), self.workers)]
+
+    def start(self) -> None:
+        """Start one worker process per shard."""
+        if self._shards:
+            return
+        self._stop_flag = self._context.RawValue('b', 0)
+        for shard in range(self.workers):
+            self._start_shard(shard)
+
+    def _start_shard(self, shard: int) -> None:
+        """Start (or restart) the worker of one shard."""
+        reader, writer = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_shard_worker,
+            args=(shard, self.shard_plcs(shard), self.tags, self.interval, writer, self._stop_flag),
+            name=f"fins-shard-{shard}",
+            daemon=True)
+        process.start()
+        # The parent keeps only the receiving end, so EOF shows a dead worker
+        writer.close()
+        self._shards[shard] = (process, reader)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop all workers.
+
+        Args:
+            timeout: Seconds to wait for each worker before terminating it
+        """
+        if self._stop_flag is not None:
+            self._stop_flag.value = 1
+        # Closing the pipes also releases workers blocked on a full pipe
+        for process, reader in self._shards.values():
+            reader.close()
+        for process, reader in self._shards.values():
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._shards = {}
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def poll(self, timeout: Optional[float] = None) -> List[Tuple[float, int, List[Tuple[int, int, np.ndarray]]]]:
+        """
+        Collect the batches that arrived, restarting crashed workers.
+
+        Args:
+            timeout: Seconds to wait for the first batch, None waits forever
+
+        Returns:
+            Decoded batches, see decode_batch
+        """
+        readers = {reader: shard for shard, (_, reader) in self._shards.items()}
+        batches = []
+        for reader in wait(list(readers), timeout):
+            try:
+                while reader.poll():
+                    batches.append(decode_batch(reader.recv_bytes()))
+            except (EOFError, OSError):
+                pass
+        self._restart_crashed()
+        return batches
+
+    def _restart_crashed(self) -> None:
+        """Restart the workers that exited without being stopped."""
+        if self._stop_flag is None or self._stop_flag.value:
+            return
+        for shard, (process, reader) in list(self._shards.items()):
+            if process.exitcode is not None:
+                reader.close()
+                self.restarts += 1
+                self._start_shard(shard)
@@ -92,6 +92,7 @@ class FinsTcpConnection(FinsConnection):
                 # Parse response to get assigned node addresses
                 self.srce_node_add = response[19]  # Client node address
                 self.dest_node_add = response[23]  # Server node address
+                self.build_frame_template()
             else:
                 raise ConnectionError("Invalid handshake response format")
                 
@@ -5,19 +5,46 @@ This module provides UDP implementation of the FINS protocol connection.
 """
 from datetime import datetime
 import socket
-from typing import Optional,Tuple,Union,Any
+import time
+from typing import Optional,Tuple,Union,Any,List,Callable,Dict
+
+import numpy as np
 
 # Fix the import path - adjust based on your actual project structure
 from OMRON_FINS_PROTOCOL.Fins_domain.connection import FinsConnection
 from OMRON_FINS_PROTOCOL.Fins_domain.command_codes import FinsCommandCode
 from OMRON_FINS_PROTOCOL.Fins_domain.frames import FinsResponseFrame
 from OMRON_FINS_PROTOCOL.Fins_domain.fins_error import FinsResponseError
-from OMRON_FINS_PROTOCOL.Fins_domain.mem_address_parser import FinsAddressParser
+from OMRON_FINS_PROTOCOL.Fins_domain.change_detection import FinsChangeDetector
+from OMRON_FINS_PROTOCOL.Fins_domain.mem_address_parser import FinsAddressParser, FinsAddress, compile_address
+from OMRON_FINS_PROTOCOL.Fins_domain.read_plan import FinsReadPlan
+from OMRON_FINS_PROTOCOL.Fins_domain.retransmission import FinsRetransmissionTimer
+from OMRON_FINS_PROTOCOL.Fins_domain.results import FinsLazyResult
 from OMRON_FINS_PROTOCOL.components import *
 from OMRON_FINS_PROTOCOL.exception import *
 
 __version__ = "0.1.0"
 
+# Elements per MULTIPLE_MEMORY_AREA_READ command; each element is 4 bytes in
+# the command and up to 3 bytes in the response, so 128 elements stay well
+# inside the 2000 byte FINS text limit in both directions
+MULTIPLE_READ_MAX_ITEMS = 128
+
+# Words (or bits for bit areas) per MEMORY_AREA_WRITE command, like the 990-word read chunks
+WRITE_MAX_ITEMS = 990
+
+# Words per MEMORY_AREA_READ command of a snapshot, the same 990-word chunks as read
+SNAPSHOT_CHUNK_WORDS = 990
+
+# Words per MEMORY_AREA_FILL and MEMORY_AREA_TRANSFER command; both carry
+# the count in a 2-byte field and the PLC does the work, so one command
+# covers a whole DM bank
+FILL_MAX_ITEMS = 0xFFFF
+TRANSFER_MAX_ITEMS = 0xFFFF
+
+# Size of the preallocated receive buffer; a FINS/UDP frame is at most 2012 bytes
+RECEIVE_BUFFER_SIZE = 4096
+
 
 class FinsUdpConnection(FinsConnection):
     """
@@ -29,14 +56,17 @@ class FinsUdpConnection(FinsConnection):
     def __init__(self, host: str, port: int = 9600, timeout: int = 5,
                  dest_network: int = 0, dest_node: int = 0, dest_unit: int = 0,
                  src_network: int = 0, src_node: int = 1, src_unit: int = 0,
-                 destfinsadr: str = "0.0.0", srcfinsadr: str = "0.1.0",debug = False):
+                 destfinsadr: str = "0.0.0", srcfinsadr: str = "0.1.0",debug = False,
+                 pipeline_depth: int = 8, retries: int = 2, min_rto: float = 0.02,
+                 dead_after: int = 3, dead_holdoff: float = 5.0):
         """
         Initialize UDP connection.
         
         Args:
             host: PLC IP address or hostname
             port: UDP port number (default 9600 for FINS)
-            timeout: Response timeout in seconds
+            timeout: Longest time to wait for one response, in seconds; the
+                adaptive retransmission timeout never exceeds it
             dest_network: Destination network address
             dest_node: Destination node address  
             dest_unit: Destination unit address
@@ -45,6 +75,14 @@ class FinsUdpConnection(FinsConnection):
             src_unit: Source unit address
             destfinsadr: Alternative destination address format
             srcfinsadr: Alternative source address format
+            debug: Print frames and parsed fields while communicating
+            pipeline_depth: Maximum number of commands kept in flight by
+                execute_fins_command_frames (1-254)
+            retries: Retransmissions of a command before giving up
+            min_rto: Lower bound of the retransmission timeout, in seconds
+            dead_after: Commands failing in a row after which the PLC is
+                treated as dead and commands fail immediately
+            dead_holdoff: Seconds to fail fast before probing a dead PLC again
         """
         # Call parent constructor with proper parameters
         super().__init__(
@@ -63,12 +101,26 @@ class FinsUdpConnection(FinsConnection):
         self.timeout = timeout
         self.socket: Optional[socket.socket] = None
         self.connected = False
+        # Preallocated receive buffer, responses are parsed through memoryviews of it
+        self._receive_buffer = bytearray(RECEIVE_BUFFER_SIZE)
+        self._receive_view = memoryview(self._receive_buffer)
         # Get Fins Command Code 
         self.command_codes = FinsCommandCode()
         # Initialize address parser
         self.address_parser = FinsAddressParser()
         # debugging mode 
         self.debug = debug
+        # pipelined mode
+        if not (1 <= pipeline_depth <= 254):
+            raise FinsConnectionError(f"Pipeline depth must be between 1-254, got {pipeline_depth}")
+        self.pipeline_depth = pipeline_depth
+        # adaptive retransmission
+        if retries < 0:
+            raise FinsConnectionError(f"Retries must not be negative, got {retries}")
+        self.retries = retries
+        self.retransmission = FinsRetransmissionTimer(initial_rto=min(1.0, timeout), min_rto=min(min_rto, timeout),
+                                                      max_rto=timeout, dead_after=dead_after,
+                                                      dead_holdoff=dead_holdoff)
     
     def connect(self) -> None:
         """
@@ -80,6 +132,7 @@ class FinsUdpConnection(FinsConnection):
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self.socket.settimeout(self.timeout)
+            self.retransmission.reset()
             self.connected = True
             
         except socket.error as e:
@@ -113,22 +166,238 @@ class FinsUdpConnection(FinsConnection):
         raises:
             ConnectionError: If communication fails
         """
-        if not self.connected or not self.socket:
-            raise ConnectionError("UDP socket not initialized")
+        return bytes(self._execute_into(fins_command_frame))
+    
+    def _execute_into(self, fins_command_frame: bytes) -> memoryview:
+        """
+        Execute a FINS command frame, receiving into the preallocated buffer.
         
-        try:
-            self.socket.sendto(fins_command_frame, self.addr)
+        The first transmission keeps a caller-supplied non-zero SID; SID 0
+        frames and all retransmissions get fresh ones, see _execute_pipelined.
+        
+        Args:
+            fins_command_frame: Complete FINS command frame
+            
+        Returns:
+            memoryview of the response frame; only valid until the next receive
             
-            # Receive response
-            response_data = self.socket.recv(4096)
+        raises:
+            ConnectionError: If communication fails
+        """
+        response_frames = []
+        self._execute_pipelined([fins_command_frame], lambda index, response_data: response_frames.append(response_data),
+                                keep_service_id=True)
+        return response_frames[0]
+    
+    def execute_fins_command_frames(self, fins_command_frames: List[bytes]) -> List[bytes]:
+        """
+        Execute several FINS command frames pipelined over UDP.
+        
+        Up to pipeline_depth commands are kept outstanding. Each one gets its
+        own service ID (SID) written into the header, and every response is
+        matched back to its command by that SID, so responses may arrive in
+        any order. Datagrams carrying an unknown SID (late answers to earlier
+        commands) are dropped.
+        
+        Args:
+            fins_command_frames: Complete FINS command frames
             
-            return response_data
+        Returns:
+            Response frame bytes, in the same order as the command frames
+            
+        raises:
+            ConnectionError: If communication fails
+        """
+        response_frames: List[Optional[bytes]] = [None] * len(fins_command_frames)
+        
+        def store(index: int, response_data: memoryview) -> None:
+            response_frames[index] = bytes(response_data)
+        
+        self._execute_pipelined(fins_command_frames, store)
+        return response_frames
+    
+    def _execute_pipelined(self, fins_command_frames: List[bytes],
+                           handle_response: Callable[[int, memoryview], None],
+                           keep_service_id: bool = False) -> None:
+        """
+        Pipelined execution engine behind execute_fins_command_frames.
+        
+        Responses are received into the preallocated buffer and handed to
+        handle_response(index, response) as a memoryview that is only valid
+        during the call, so callers can copy the data straight to where it
+        belongs.
+        
+        A command without response after the adaptive retransmission
+        timeout (see FinsRetransmissionTimer) is sent again with a fresh
+        SID, up to self.retries times. Round-trip times are sampled from the
+        transmission the response's SID belongs to, so they stay valid
+        across retransmissions. While the PLC is considered dead every call
+        fails immediately.
+        
+        Args:
+            fins_command_frames: Complete FINS command frames
+            handle_response: Called once per command with its index and response
+            keep_service_id: Send the first transmission with the non-zero
+                SID already in the frame instead of a fresh one
             
-        except socket.timeout:
-            raise ConnectionError("UDP communication timeout")
+        raises:
+            ConnectionError: If communication fails
+        """
+        if not self.connected or not self.socket:
+            raise ConnectionError("UDP socket not initialized")
+        
+        timer = self.retransmission
+        dead_for = timer.dead_for()
+        if dead_for:
+            raise ConnectionError(f"PLC not responding, next attempt in {dead_for:.1f}s")
+        
+        pending = {}  # SID -> [index, command frame, send time, retransmissions, timeout]
+        next_index = 0
+        try:
+            self._drain_stale()
+            while next_index < len(fins_command_frames) or pending:
+                # Fill the window
+                while next_index < len(fins_command_frames) and len(pending) < self.pipeline_depth:
+                    self._send_pending(pending, next_index, fins_command_frames[next_index], keep_service_id)
+                    next_index += 1
+                
+                remaining = self._next_expiry(pending) - time.monotonic()
+                if remaining <= 0:
+                    self._retransmit_expired(pending)
+                    continue
+                self.socket.settimeout(remaining)
+                try:
+                    nbytes = self.socket.recv_into(self._receive_buffer)
+                except socket.timeout:
+                    self._retransmit_expired(pending)
+                    continue
+                self._complete_pending(pending, self._receive_view[:nbytes], handle_response)
+            timer.command_succeeded()
+        
+        except ConnectionError:
+            raise
         except socket.error as e:
             raise ConnectionError(f"UDP communication error: {e}")
+    
+    def _send_pending(self, pending: dict, index: int, fins_command_frame: bytes,
+                      keep_service_id: bool = False) -> None:
+        """
+        Send a command frame and register it as pending.
+        
+        Args:
+            pending: SID -> [index, command frame, send time, retransmissions, timeout]
+            index: Index of the command frame, passed back to handle_response
+            fins_command_frame: Complete FINS command frame
+            keep_service_id: Keep a non-zero SID already in the frame
+        """
+        command_frame = bytearray(fins_command_frame)
+        # SID 0 is the default of every single-frame command; reusing it would
+        # let a late reply to a timed-out command answer the next one
+        if not keep_service_id or command_frame[9] == 0 or command_frame[9] in pending:
+            command_frame[9] = self._next_service_id(pending)
+        self.socket.sendto(command_frame, self.addr)
+        pending[command_frame[9]] = [index, command_frame, time.monotonic(), 0, self.retransmission.rto]
+    
+    def _next_expiry(self, pending: dict) -> float:
+        """
+        Earliest time.monotonic() at which a pending command times out.
+        
+        Args:
+            pending: SID -> [index, command frame, send time, retransmissions, timeout]
+            
+        Returns:
+            Expiry time in seconds
+        """
+        return min(entry[2] + entry[4] for entry in pending.values())
+    
+    def _complete_pending(self, pending: dict, response_data: memoryview,
+                          handle_response: Callable[[int, memoryview], None]) -> bool:
+        """
+        Match a received response to its pending command and hand it over.
         
+        The response must carry the SID of a pending command and pass
+        _response_mismatch for that command; anything else is counted in
+        self.discarded and dropped, so a late answer is never taken for
+        the answer of another command.
+        
+        Args:
+            pending: SID -> [index, command frame, send time, retransmissions, timeout]
+            response_data: Received frame
+            handle_response: Called with the command index and the response
+            
+        Returns:
+            True if the response belonged to a pending command
+        """
+        if len(response_data) < 14:
+            self.discarded['short'] += 1
+            return False
+        entry = pending.get(response_data[9])
+        if entry is None:
+            self.discarded['unknown_sid'] += 1
+            return False
+        reason = self._response_mismatch(response_data, entry[1])
+        if reason:
+            self.discarded[reason] += 1
+            return False
+        del pending[response_data[9]]
+        self.retransmission.sample(time.monotonic() - entry[2])
+        handle_response(entry[0], response_data)
+        return True
+    
+    def _drain_stale(self) -> None:
+        """
+        Drop datagrams already queued on the socket without blocking.
+        
+        They can only be answers to earlier commands that timed out; each is
+        counted as 'stale' in self.discarded.
+        """
+        self.socket.settimeout(0.0)
+        while True:
+            try:
+                self.socket.recv_into(self._receive_buffer)
+            except OSError:
+                return
+            self.discarded['stale'] += 1
+    
+    def _retransmit_expired(self, pending: dict) -> None:
+        """
+        Resend every pending command whose retransmission timeout expired.
+        
+        Each resent command gets a fresh SID, so a late response to the
+        previous transmission is dropped as unknown, and twice the timeout
+        of its previous transmission.
+        
+        Args:
+            pending: SID -> [index, command frame, send time, retransmissions, timeout]
+            
+        raises:
+            ConnectionError: If a command used up its retries
+        """
+        timer = self.retransmission
+        now = time.monotonic()
+        expired = [sid for sid, entry in pending.items() if now - entry[2] >= entry[4]]
+        for sid in expired:
+            if pending[sid][3] >= self.retries:
+                timer.command_failed()
+                raise ConnectionError("UDP communication timeout")
+        for sid in expired:
+            entry = pending[sid]
+            service_id = self._next_service_id(pending)
+            entry[1][9] = service_id
+            try:
+                self.socket.sendto(entry[1], self.addr)
+            except BlockingIOError:
+                # Full send buffer of a non-blocking socket: still expired, resent on the next pass
+                entry[1][9] = sid
+                continue
+            del pending[sid]
+            entry[2] = time.monotonic()
+            entry[3] += 1
+            entry[4] = timer.backoff(entry[4])
+            if self.debug == True:
+                print(f"  Retransmitted command {entry[0]} with SID {service_id}, RTO {entry[4]:.3f}s")
+            pending[service_id] = entry
+    
     def _parse_response(self, response_data: bytes) -> FinsResponseFrame:
         """
         Parse response data using FinsResponseFrame.
@@ -159,115 +428,592 @@ class FinsUdpConnection(FinsConnection):
                 return False, str(response_data_end_code) + ' Unknown error code'
         
     # def read(self, memory_area_code, readsize: int = 4, _type: str = 'INT16' ,service_id: int = 0 ) -> Tuple[Union[bytes, bool],bool,str]:
-    def read(self, memory_area_code, _type: str = 'INT16' ,service_id: int = 0 ) -> dict:
+    def read(self, memory_area_code: Union[str, FinsAddress], _type: str = 'INT16' ,service_id: int = 0, fast: bool = False) -> dict:
         """
         Read data from PLC memory area using FINS command codes.
         
+        Reads larger than one 990-word chunk are sent pipelined, see
+        execute_fins_command_frames.
+        
         Args:
-            memory_area_code: Memory area identifier
-            address: Starting address
-            count: Number of items to read
+            memory_area_code: Memory area identifier, or a FinsAddress from
+                compile_address to skip address parsing
+            _type: Data type used to convert the read words
+            service_id: Service ID for single chunk reads
+            fast: Return a FinsLazyResult that only holds status, message,
+                data and data_format; meta and debug are built on first access
             
         Returns:
             Response data
         """
+        address, _type, readsize = self._prepare_read(memory_area_code, _type)
+        chunks = self._read_command_frames(address, readsize, service_id)
         
-        data_type_mapping = {
-            'INT16' : [1, toInt16],
-            'UINT16' : [1, toUInt16],
-            'INT32' : [2, toInt32],
-            'UINT32' : [2, toUInt32],
-            'INT64' : [4, toInt64],
-            'UINT64' : [4, toUInt64],
-            'FLOAT' : [2, toFloat],
-            'DOUBLE' : [4, toDouble],
-            'bcd_to_decimal' : [1,bcd_to_decimal]
-        }
+        # Every chunk is copied from the receive buffer straight into its
+        # place in one output buffer sized from the word count
+        data = bytearray(readsize * 2)
+        chunk_heads: List[Optional[Tuple[bytes, int]]] = [None] * len(chunks)
+        if len(chunks) == 1:
+            chunk_heads[0] = self._store_read_chunk(data, 0, self._execute_into(chunks[0][1]))
+        else:
+            def store(index: int, response_data: memoryview) -> None:
+                chunk_heads[index] = self._store_read_chunk(data, index, response_data)
+            self._execute_pipelined([command_frame for _, command_frame in chunks], store)
+        
+        return self._read_chunks_result(address, _type, chunks, chunk_heads, data, fast)
+    
+    def read_pipelined(self, memory_area_codes: List[Union[str, FinsAddress]], _type: Union[str, List[str]] = 'INT16',
+                       fast: bool = False) -> List[dict]:
+        """
+        Read several addresses with all their commands in flight at once.
+        
+        Every address is still its own MEMORY_AREA_READ command, but the
+        commands are sent through execute_fins_command_frames so the poll
+        costs roughly one round trip instead of one per address.
+        
+        Args:
+            memory_area_codes: List of addresses (e.g. ['D100', 'W3.01'])
+            _type: One data type for all addresses or one per address
+            fast: Return lean results, see read()
+            
+        Returns:
+            List of result dicts in the same order as memory_area_codes
+        """
+        types = self._expand_types(memory_area_codes, _type)
+        
+        prepared = []
+        command_frames = []
+        for memory_area_code, data_type in zip(memory_area_codes, types):
+            address, data_type, readsize = self._prepare_read(memory_area_code, data_type)
+            chunks = self._read_command_frames(address, readsize)
+            prepared.append((address, data_type, readsize, chunks))
+            command_frames.extend(command_frame for _, command_frame in chunks)
         
-        # data_type_mapping = {
-        #     'I16' : [1, toInt16],
-        #     'U16' : [1, toUInt16],
-        #     'I32' : [2, toInt32],
-        #     'UI32' : [2, toUInt32],
-        #     'I64' : [4, toInt64],
-        #     'UI64' : [4, toUInt64],
-        #     'F' : [2, toFloat],
-        #     'D' : [4, toDouble],
-        #     'BCD2D' : [1,bcd_to_decimal]
-        # }
+        response_frames = self.execute_fins_command_frames(command_frames)
         
+        results = []
+        position = 0
+        for address, data_type, readsize, chunks in prepared:
+            results.append(self._read_result(address, data_type, readsize, chunks,
+                                             response_frames[position:position + len(chunks)], fast))
+            position += len(chunks)
+        return results
+    
+    def _prepare_read(self, memory_area_code: Union[str, FinsAddress], _type: str) -> Tuple[FinsAddress, str, int]:
+        """
+        Compile the address and normalize the data type of a read.
+        
+        Args:
+            memory_area_code: Memory area identifier or FinsAddress
+            _type: Data type name
+            
+        Returns:
+            Tuple of (compiled address, data type, read size in words)
+        """
+        _type = self._normalize_type(_type)
+        address = self._compile(memory_area_code)
+
+        if address.is_bit:
+            readsize = 1
+        else:
+            readsize = DATA_TYPE_MAPPING[_type][0]
+        return address, _type, readsize
+    
+    def _compile(self, memory_area_code: Union[str, FinsAddress]) -> FinsAddress:
+        """
+        Return the compiled form of an address.
+        
+        Args:
+            memory_area_code: Address string or FinsAddress
+            
+        Returns:
+            FinsAddress
+        """
+        if isinstance(memory_area_code, FinsAddress):
+            return memory_area_code
+        return compile_address(memory_area_code)
+    
+    def _normalize_type(self, _type: str) -> str:
+        """
+        Validate a data type name and return it in upper case.
+        
+        Args:
+            _type: Data type name, None means 'INT16'
+            
+        Returns:
+            Normalized data type name
+            
+        Raises:
+            FinsDataError: If the data type is not supported
+        """
         # Normalize type_
         if _type is not None:
             _type = _type.upper()
-            if _type not in data_type_mapping:
+            if _type not in DATA_TYPE_MAPPING:
                 raise FinsDataError(
-                        f"Invalid data type: '{_type}'. Allowed types are: {', '.join(data_type_mapping.keys())}",
+                        f"Invalid data type: '{_type}'. Allowed types are: {', '.join(DATA_TYPE_MAPPING.keys())}",
                         error_code="INVALID_TYPE"
                         )
         else:
             _type = 'INT16'
-
-        if '.' in memory_area_code:
-            memory_area_code = 'Z' + memory_area_code
-            readsize = 1
+        return _type
+    
+    def _expand_types(self, memory_area_codes: List[str], _type: Union[str, List[str]]) -> List[str]:
+        """
+        Turn a single data type or a list of data types into one type per address.
+        
+        Args:
+            memory_area_codes: List of addresses
+            _type: One data type for all addresses or one per address
+            
+        Returns:
+            List of data types, one per address
+        """
+        if isinstance(_type, str) or _type is None:
+            return [_type] * len(memory_area_codes)
+        types = list(_type)
+        if len(types) != len(memory_area_codes):
+            raise FinsDataError(
+                    f"Got {len(types)} types for {len(memory_area_codes)} addresses",
+                    error_code="INVALID_TYPE"
+                    )
+        return types
+    
+    def read_many(self, memory_area_codes: List[Union[str, FinsAddress]], types: Union[str, List[str]] = 'INT16') -> dict:
+        """
+        Read scattered word and bit addresses with MULTIPLE_MEMORY_AREA_READ (0x0104).
+        
+        All addresses are packed into as few commands as the frame size
+        allows; multi-word types (INT32, FLOAT, ...) take one element per
+        word. The commands are sent pipelined and the response elements are
+        split back into typed values per address. Bit addresses return
+        0 or 1 like read().
+        
+        Args:
+            memory_area_codes: List of addresses (e.g. ['D100', 'W3.01', 'C0001', '2.01'])
+            types: One data type for all addresses or one per address
+            
+        Returns:
+            Result dict whose data maps each address to its converted values
+        """
+        tags, command_frames = self._read_many_command_frames(memory_area_codes, types)
+        response_frames = self.execute_fins_command_frames(command_frames)
+        return self._read_many_result(tags, command_frames, response_frames)
+    
+    def _read_many_command_frames(self, memory_area_codes: List[Union[str, FinsAddress]],
+                                  types: Union[str, List[str]]) -> Tuple[List[Tuple[str, str, int]], List[bytes]]:
+        """
+        Pack addresses into MULTIPLE_MEMORY_AREA_READ command frames.
+        
+        Args:
+            memory_area_codes: List of addresses
+            types: One data type for all addresses or one per address
+            
+        Returns:
+            Tuple of ((address, data type, element count) per address, command frames)
+        """
+        tags = []
+        elements = bytearray()
+        for memory_area_code, data_type in zip(memory_area_codes, self._expand_types(memory_area_codes, types)):
+            data_type = self._normalize_type(data_type)
+            address = self._compile(memory_area_code)
+            count = 1 if address.is_bit else DATA_TYPE_MAPPING[data_type][0]
+            for word in range(count):
+                elements += address.offset(word).address_field
+            tags.append((address.address, data_type, count))
+        
+        step = MULTIPLE_READ_MAX_ITEMS * 4
+        command_frames = self.fins_command_frames(
+            self.command_codes.MULTIPLE_MEMORY_AREA_READ,
+            [bytes(elements[start:start + step]) for start in range(0, len(elements), step)])
+        return tags, command_frames
+    
+    def _read_many_result(self, tags: List[Tuple[str, str, int]], command_frames: List[bytes],
+                          response_frames: List[bytes]) -> dict:
+        """
+        Split MULTIPLE_MEMORY_AREA_READ responses back into typed values per address.
+        
+        Args:
+            tags: (address, data type, element count) per address
+            command_frames: Command frames from _read_many_command_frames
+            response_frames: Response frame bytes, one per command frame
+            
+        Returns:
+            Result dict whose data maps each address to its converted values;
+            addresses of a failed command map to None
+        """
+        final_result = {
+            "status": "success",
+            "message": "",
+            "data": {},
+            "data_format": "MULTIPLE",
+            "meta": {"commands": len(command_frames)},
+            "debug": {"command_frames": [str(command_frame) for command_frame in command_frames]}
+            }
+        
+        # Flat list of element values (2 bytes each), None for failed commands
+        values = []
+        for command_frame, response_data in zip(command_frames, response_frames):
+            elements = (len(command_frame) - 12) // 4
+            response_frame = self._parse_response(response_data)
+            is_success, msg = self._check_response(response_frame.end_code)
+            final_result["message"] = msg
+            if not is_success:
+                final_result["status"] = "error"
+                values.extend([None] * elements)
+                continue
+            text = response_frame.text
+            position = 0
+            for _ in range(elements):
+                # Word areas have bit 7 of the area code set and return 2 bytes,
+                # bit areas and flags return 1 byte
+                if text[position] & 0x80:
+                    values.append(text[position + 1:position + 3])
+                    position += 3
+                else:
+                    values.append(b'\x00' + text[position + 1:position + 2])
+                    position += 2
+        
+        position = 0
+        for memory_area_code, data_type, count in tags:
+            words = values[position:position + count]
+            position += count
+            if None in words:
+                final_result["data"][memory_area_code] = None
+            else:
+                final_result["data"][memory_area_code] = DATA_TYPE_MAPPING[data_type][1](b''.join(words))
+        return final_result
+    
+    def read_plan(self, plan: FinsReadPlan, detector: Optional[FinsChangeDetector] = None) -> dict:
+        """
+        Execute a compiled read plan.
+        
+        Every block of the plan is one MEMORY_AREA_READ command; the
+        commands are sent pipelined and the tags are decoded with the
+        offsets computed when the plan was compiled.
+        
+        Args:
+            plan: Plan from FinsReadPlanner.compile
+            detector: FinsChangeDetector of the plan; only the tags whose
+                words changed since its last cycle are decoded
+            
+        Returns:
+            Result dict whose data lists the converted values per plan tag;
+            tags in a failed block are None. With a detector, data maps
+            the plan tag index of every changed tag to its values
+            (data_format 'PLAN_CHANGES')
+        """
+        command_frames = self._read_plan_command_frames(plan)
+        response_frames = self.execute_fins_command_frames(command_frames)
+        return self._read_plan_result(plan, response_frames, detector)
+    
+    def _read_plan_command_frames(self, plan: FinsReadPlan) -> List[bytes]:
+        """
+        Build one MEMORY_AREA_READ command frame per plan block.
+        
+        Args:
+            plan: Compiled read plan
+            
+        Returns:
+            Command frames in block order
+        """
+        return self.fins_command_frames(self.command_codes.MEMORY_AREA_READ, plan.command_texts())
+    
+    def _read_plan_result(self, plan: FinsReadPlan, response_frames: List[bytes],
+                          detector: Optional[FinsChangeDetector] = None) -> dict:
+        """
+        Check the block responses of a read plan and decode its tags.
+        
+        Args:
+            plan: Compiled read plan
+            response_frames: Response frame bytes, one per block
+            detector: Optional change detector, see read_plan
+            
+        Returns:
+            Result dict whose data lists the converted values per plan tag,
+            or maps changed tag indices to their values with a detector
+        """
+        final_result = {
+            "status": "success",
+            "message": "",
+            "data": None,
+            "data_format": "PLAN",
+            "meta": {"blocks": len(plan.blocks)},
+            "debug": {}
+            }
+        block_data = []
+        for response_data in response_frames:
+            response_frame = self._parse_response(response_data)
+            is_success, msg = self._check_response(response_frame.end_code)
+            final_result["message"] = msg
+            if is_success:
+                block_data.append(response_frame.text)
+            else:
+                final_result["status"] = "error"
+                block_data.append(None)
+        if detector is None:
+            final_result["data"] = plan.decode(block_data)
         else:
-            readsize = data_type_mapping[_type][0]
-        conversion_function = data_type_mapping[_type][1]     
-        readnum = readsize // 990
-        remainder = readsize % 990
-        return_read_dict = dict()
+            changed = detector.update(block_data)
+            final_result["data"] = dict(zip(changed, plan.decode(block_data, changed)))
+            final_result["data_format"] = "PLAN_CHANGES"
+            final_result["meta"]["changed"] = len(changed)
+        return final_result
+    
+    def snapshot(self, area: str, start: int, count: int, path: Optional[str] = None) -> dict:
+        """
+        Dump a whole word range, e.g. a full DM or EM bank, into a NumPy array.
+        
+        The range is read as pipelined 990-word MEMORY_AREA_READ chunks and
+        every response is copied from the receive buffer straight into its
+        place in one preallocated big-endian uint16 array; nothing is
+        converted through Python lists. With path the array is a memory
+        mapped .npy file (np.load(path, mmap_mode='r') opens it again), so
+        large captures go to disk without being held in memory.
+        
+        Args:
+            area: Area prefix as in addresses ('D', 'W', 'H', 'A', 'E0_', ... ;
+                '' for CIO)
+            start: First word
+            count: Number of words
+            path: Optional .npy file to write the snapshot to
+            
+        Returns:
+            Result dict whose data is the '>u2' array of all words; words of
+            failed chunks stay zero and are listed in meta
+        """
+        address, command_frames = self._snapshot_command_frames(area, start, count)
+        words = self._snapshot_buffer(count, path)
+        end_codes: List[Optional[bytes]] = [None] * len(command_frames)
+        
+        def store(index: int, response_data: memoryview) -> None:
+            end_codes[index] = self._store_snapshot_chunk(words, index, response_data)
+        
+        self._execute_pipelined(command_frames, store)
+        return self._snapshot_result(address, words, end_codes, path)
+    
+    def _snapshot_command_frames(self, area: str, start: int, count: int) -> Tuple[FinsAddress, List[bytes]]:
+        """
+        Build the MEMORY_AREA_READ command frames of a snapshot.
+        
+        Args:
+            area: Area prefix
+            start: First word
+            count: Number of words
+            
+        Returns:
+            Tuple of (compiled start address, command frames)
+        """
+        address = self._compile_word_range(f"{area}{start}", count)
+        texts = []
+        for offset in range(0, count, SNAPSHOT_CHUNK_WORDS):
+            size = min(SNAPSHOT_CHUNK_WORDS, count - offset)
+            texts.append(address.offset(offset).address_field + size.to_bytes(2, 'big'))
+        return address, self.fins_command_frames(self.command_codes.MEMORY_AREA_READ, texts)
+    
+    def _snapshot_buffer(self, count: int, path: Optional[str] = None) -> np.ndarray:
+        """
+        Allocate the zeroed word array of a snapshot, in memory or as a .npy memory map.
+        
+        Args:
+            count: Number of words
+            path: Optional .npy file
+            
+        Returns:
+            '>u2' array of count words
+        """
+        if path is None:
+            return np.zeros(count, dtype='>u2')
+        return np.lib.format.open_memmap(path, mode='w+', dtype='>u2', shape=(count,))
+    
+    def _store_snapshot_chunk(self, words: np.ndarray, index: int, response_data: memoryview) -> bytes:
+        """
+        Copy the text of one snapshot response into its place in the word array.
+        
+        Args:
+            words: Word array of the snapshot
+            index: Chunk number
+            response_data: Response frame (bytes or memoryview)
+            
+        Returns:
+            End code of the response
+        """
+        end_code = bytes(response_data[12:14])
+        if end_code == b'\x00\x00':
+            chunk = words[index * SNAPSHOT_CHUNK_WORDS:(index + 1) * SNAPSHOT_CHUNK_WORDS]
+            nwords = min((len(response_data) - 14) // 2, len(chunk))
+            chunk[:nwords] = np.frombuffer(response_data, dtype='>u2', count=nwords, offset=14)
+        return end_code
+    
+    def _snapshot_result(self, address: FinsAddress, words: np.ndarray, end_codes: List[bytes],
+                         path: Optional[str] = None) -> dict:
+        """
+        Build the result dict of a snapshot.
+        
+        Args:
+            address: Compiled start address
+            words: Word array of the snapshot
+            end_codes: End code per chunk
+            path: .npy file of the snapshot, if any
+            
+        Returns:
+            Result dict whose data is the word array
+        """
         final_result = {
-            "status": "",
-            "message": "", 
-            "data": None, 
-            "data_format": _type, 
-            "meta": {}, 
+            "status": "success",
+            "message": "",
+            "data": words,
+            "data_format": "UINT16",
+            "meta": {
+                "original_address": address.address,
+                "memory_area": address.memory_area,
+                "word_address": address.word_address,
+                "words": len(words),
+                "read_chunks": len(end_codes),
+                "failed_chunks": [],
+                "path": path,
+            },
             "debug": {}
             }
-        data = bytes() # Initialize accumulator for all read data
+        for index, end_code in enumerate(end_codes):
+            is_success, msg = self._check_response(end_code)
+            if not is_success:
+                final_result["status"] = "error"
+                final_result["message"] = msg
+                final_result["meta"]["failed_chunks"].append(address.word_address + index * SNAPSHOT_CHUNK_WORDS)
+            elif final_result["status"] == "success":
+                final_result["message"] = msg
+        if isinstance(words, np.memmap):
+            words.flush()
+        return final_result
+    
+    def _read_command_frames(self, address: FinsAddress, readsize: int,
+                             service_id: int = 0) -> List[Tuple[FinsAddress, bytes]]:
+        """
+        Build the MEMORY_AREA_READ command frames for one read, one per 990-word chunk.
+        
+        Args:
+            address: Compiled address
+            readsize: Number of words to read
+            service_id: Service ID written into the frames
+            
+        Returns:
+            List of (chunk address, command frame) tuples
+        """
+        readnum = readsize // 990
+        remainder = readsize % 990
+        sid = service_id.to_bytes(1,'big')
+        chunks = []
         for cnt in range(readnum + 1):
-            info = self.address_parser.parse(memory_area_code,cnt * 990)
-            return_read_dict["info"] = info
+            chunk_address = address.offset(cnt * 990)
             if self.debug == True:
                 print("----------DEBUG MODE -------------")
-                print(f"  Address Given: {memory_area_code}")
-                print(f"  Type: {info['address_type']}")
-                print(f"  Memory Area: {info['memory_area']}")
-                print(f"  Word Address: {info['word_address']}")
-                print(f"  Bit Number: {info['bit_number']}")
-                print(f"  Memory Type Code: {info['memory_type_code']}")
-                print(f"  Offset Bytes: {info['offset_bytes']}")
-                print(f"  Fins_Format: {info['fins_format']}") 
+                print(f"  Address Given: {chunk_address.address}")
+                print(f"  Type: {chunk_address.address_type}")
+                print(f"  Memory Area: {chunk_address.memory_area}")
+                print(f"  Word Address: {chunk_address.word_address}")
+                print(f"  Bit Number: {chunk_address.bit_number}")
+                print(f"  Memory Type Code: {chunk_address.memory_type_code}")
+                print(f"  Offset Bytes: {chunk_address.offset_bytes}")
+                print(f"  Fins_Format: {chunk_address.address_field}") 
             
             if cnt == readnum:
-                rsize = list(int(remainder).to_bytes(2,'big'))
+                rsize = remainder
             else:
-                rsize = list(int(990).to_bytes(2,'big'))
+                rsize = 990
             
-            sid = service_id.to_bytes(1,'big')
-            
-            # creating the command_frame 
-            finsary = bytearray(8)
-            finsary[0:2] = self.command_codes.MEMORY_AREA_READ
-            finsary[2] = info['memory_type_code']
-            finsary[3:5] = info['offset_bytes']
-            if info['address_type'] == 'bit':
-                finsary[5] = info['bit_number']
-            else:
-                finsary[5] = 0x00
-            finsary[6] = rsize[0]
-            finsary[7] = rsize[1]
+            # creating the command_frame: command code, 4-byte address field, item count
+            finsary = self.command_codes.MEMORY_AREA_READ + chunk_address.address_field + rsize.to_bytes(2,'big')
             
             # Build FINS command frame using the command code
             command_frame = self.fins_command_frame(command_code=finsary,service_id=sid)
-            final_result["debug"]["command_frame"] = str(command_frame)   
             if self.debug == True:
                 # Send command frame
                 print("  Sent FinsCommand complete frame : ", command_frame)
                 print("  FinsCommand Destination address(IP,port): " , self.addr)
-                
-            # Execute the FINS command frame
-            response_data = self.execute_fins_command_frame(command_frame)
+            chunks.append((chunk_address, command_frame))
+        return chunks
+    
+    def _read_result(self, address: FinsAddress, _type: str, readsize: int,
+                     chunks: List[Tuple[FinsAddress, bytes]], response_frames: List[bytes],
+                     fast: bool = False) -> dict:
+        """
+        Check and convert the responses of one read into the result dict.
+        
+        Args:
+            address: Compiled address
+            _type: Data type name
+            readsize: Number of words read
+            chunks: (chunk address, command frame) tuples from _read_command_frames
+            response_frames: Response frame bytes, one per chunk
+            fast: Build a lean FinsLazyResult
+            
+        Returns:
+            Result dict with status, message, data, meta and debug keys
+        """
+        data = bytearray(readsize * 2)
+        chunk_heads = [self._store_read_chunk(data, cnt, response_data)
+                       for cnt, response_data in enumerate(response_frames)]
+        return self._read_chunks_result(address, _type, chunks, chunk_heads, data, fast)
+    
+    def _store_read_chunk(self, data: bytearray, cnt: int, response_data: memoryview) -> Tuple[bytes, int]:
+        """
+        Copy the text of one MEMORY_AREA_READ response into the read buffer.
+        
+        Args:
+            data: Output buffer of the whole read
+            cnt: Chunk number
+            response_data: Response frame (bytes or memoryview)
+            
+        Returns:
+            Tuple of (first 14 response bytes: header, command code and end code,
+            number of data bytes stored)
+        """
+        response_frame = self._parse_response(response_data)
+        if response_frame.end_code != b'\x00\x00':
+            return bytes(response_data[0:14]), 0
+        text = response_frame.text
+        start = cnt * 990 * 2
+        if len(text) % 2 != 0:
+            # Bit reads return one byte, right-align it in its word
+            start += 1
+        nbytes = min(len(text), len(data) - start)
+        memoryview(data)[start:start + nbytes] = text[:nbytes]
+        return bytes(response_data[0:14]), nbytes
+    
+    def _read_chunks_result(self, address: FinsAddress, _type: str, chunks: List[Tuple[FinsAddress, bytes]],
+                            chunk_heads: List[Tuple[bytes, int]], data: bytearray, fast: bool = False) -> dict:
+        """
+        Build the result dict of a read whose chunks were stored in data.
+        
+        Args:
+            address: Compiled address
+            _type: Data type name
+            chunks: (chunk address, command frame) tuples from _read_command_frames
+            chunk_heads: Values returned by _store_read_chunk, one per chunk
+            data: Output buffer holding the data of all chunks
+            fast: Build a lean FinsLazyResult
+            
+        Returns:
+            Result dict with status, message, data, meta and debug keys
+        """
+        if fast and not self.debug:
+            return self._read_fast_result(address, _type, chunks, chunk_heads, data)
+        conversion_function = DATA_TYPE_MAPPING[_type][1]
+        final_result = {
+            "status": "",
+            "message": "", 
+            "data": None, 
+            "data_format": _type, 
+            "meta": {}, 
+            "debug": {}
+            }
+        data_view = memoryview(data)
+        end = 0
+        for cnt, ((chunk_address, command_frame), (response_head, nbytes)) in enumerate(zip(chunks, chunk_heads)):
+            start = cnt * 990 * 2 + (nbytes % 2)
+            response_data = response_head + data_view[start:start + nbytes]
+            final_result["debug"]["command_frame"] = str(command_frame)   
             final_result["debug"]["raw_response_bytes"] = str(response_data)
             if self.debug == True:
                 print("  Received FinsResponse complete frame:", response_data)
@@ -293,47 +1039,433 @@ class FinsUdpConnection(FinsConnection):
                 print(f" Response msg : {msg}")
             
             if is_success:
-                data += response_frame.text
+                end = start + nbytes
             
             else:
                 # An error occurred during this chunk read
                 print(f"Error Occurred at chunk {cnt*990}: {msg}")
                 # Return the data accumulated so far, along with the error status and message
-                converted_data = conversion_function(data)
+                converted_data = conversion_function(data_view[:end])
                 final_result["status"] = "error"
                 final_result["message"] = msg
                 final_result["data"] = converted_data
-                final_result["meta"]["address_type"] = info["address_type"]
-                final_result["meta"]["original_address"] = memory_area_code
-                final_result["meta"]["memory_area"] = info["memory_area"]
-                final_result["meta"]["word_address"] = info["word_address"]
-                final_result["meta"]["bit_number"] = info["bit_number"]
-                final_result["meta"]["read_chunks"] = cnt + 1
-                final_result["meta"]["offset_bytes"] = info["offset_bytes"] 
+                final_result["meta"] = self._read_meta(chunk_address, cnt + 1)
                 return final_result
         
         # If the loop completes, all chunks were read successfully
-        if len(data) % 2 != 0:
-            data = b'\x00' + data
         # print("Len ->",len(data), "    Data ->", data)
-        converted_data = conversion_function(data)
+        converted_data = conversion_function(data_view[:end])
         final_result["status"] = "success" if is_success else "error"
         final_result["message"] = msg
         final_result["data"] = converted_data
-        final_result["meta"]["address_type"] = info["address_type"]
-        if 'Z' in memory_area_code:
-            final_result["meta"]["original_address"] = memory_area_code[1:]
-        else:
-            final_result["meta"]["original_address"] = memory_area_code
-        final_result["meta"]["memory_area"] = info["memory_area"]
-        final_result["meta"]["word_address"] = info["word_address"]
-        final_result["meta"]["bit_number"] = info["bit_number"]
-        final_result["meta"]["read_chunks"] = cnt + 1
-        final_result["meta"]["offset_bytes"] = info["offset_bytes"] 
+        final_result["meta"] = self._read_meta(chunk_address, cnt + 1)
 
         return final_result
     
+    def _read_fast_result(self, address: FinsAddress, _type: str, chunks: List[Tuple[FinsAddress, bytes]],
+                          chunk_heads: List[Tuple[bytes, int]], data: bytearray) -> FinsLazyResult:
+        """
+        Build the lean result of a read: typed values plus status.
+        
+        meta and debug are only built if the caller looks them up.
+        
+        Args:
+            address: Compiled address
+            _type: Data type name
+            chunks: (chunk address, command frame) tuples from _read_command_frames
+            chunk_heads: Values returned by _store_read_chunk, one per chunk
+            data: Output buffer holding the data of all chunks
+            
+        Returns:
+            FinsLazyResult with status, message, data and data_format keys
+        """
+        end = 0
+        for cnt, (response_head, nbytes) in enumerate(chunk_heads):
+            is_success, msg = self._check_response(response_head[12:14])
+            if not is_success:
+                break
+            end = cnt * 990 * 2 + (nbytes % 2) + nbytes
+        
+        chunk_address, command_frame = chunks[cnt]
+        response_head, nbytes = chunk_heads[cnt]
+        return FinsLazyResult(
+            status="success" if is_success else "error",
+            message=msg,
+            data=DATA_TYPE_MAPPING[_type][1](memoryview(data)[:end]),
+            data_format=_type,
+            lazy={
+                "meta": lambda: self._read_meta(chunk_address, cnt + 1),
+                "debug": lambda: self._read_debug(command_frame, response_head,
+                                                  data[cnt * 990 * 2 + (nbytes % 2):][:nbytes]),
+            })
+    
+    def _read_meta(self, chunk_address: FinsAddress, read_chunks: int) -> dict:
+        """
+        Build the meta block of a read result.
+        
+        Args:
+            chunk_address: Address of the last chunk read
+            read_chunks: Number of chunks read
+            
+        Returns:
+            Meta dict
+        """
+        return {
+            "address_type": chunk_address.address_type,
+            "original_address": chunk_address.address,
+            "memory_area": chunk_address.memory_area,
+            "word_address": chunk_address.word_address,
+            "bit_number": chunk_address.bit_number,
+            "read_chunks": read_chunks,
+            "offset_bytes": chunk_address.offset_bytes,
+        }
     
+    def _read_debug(self, command_frame: bytes, response_head: bytes, text: bytes) -> dict:
+        """
+        Build the debug block of a read result from its last chunk.
+        
+        Args:
+            command_frame: Command frame of the chunk
+            response_head: Header, command code and end code of the response
+            text: Response data of the chunk
+            
+        Returns:
+            Debug dict
+        """
+        return {
+            "command_frame": str(command_frame),
+            "raw_response_bytes": str(response_head + text),
+            "response_frame_header": str(response_head[0:10]),
+            "response_frame_command_code": str(response_head[10:12]),
+            "response_frame": str(response_head[12:14]),
+        }
+    
+    
+    
+    def write(self, memory_area_code: Union[str, FinsAddress], values: Any, _type: str = 'INT16') -> dict:
+        """
+        Write values to PLC memory with MEMORY_AREA_WRITE.
+        
+        Values are encoded in one vectorized pass (see DATA_TYPE_ENCODERS),
+        split into 990-word commands and sent pipelined, so recipe
+        downloads of thousands of words take a few round trips.
+        
+        Args:
+            memory_area_code: Start address (e.g. 'D100'), or a FinsAddress;
+                for a bit address (e.g. 'W3.01') values are written to
+                consecutive bits as booleans
+            values: Scalar or sequence (list, ndarray, ...) of values
+            _type: Data type used to encode the values
+            
+        Returns:
+            Result dict; data is None
+        """
+        address, _type, segment = self._write_segment(memory_area_code, values, _type)
+        command_frames, _ = self._write_command_frames([segment])
+        response_frames = self.execute_fins_command_frames(command_frames)
+        return self._write_result(address.address, _type, command_frames, response_frames)
+    
+    def _write_segment(self, memory_area_code: Union[str, FinsAddress], values: Any,
+                       _type: str) -> Tuple[FinsAddress, str, tuple]:
+        """
+        Encode the values of one write.
+        
+        Args:
+            memory_area_code: Start address or FinsAddress
+            values: Scalar or sequence of values
+            _type: Data type name
+            
+        Returns:
+            Tuple of (compiled address, data type, segment), where segment is
+            (memory area code, start, is bit, payload) with start in words,
+            or in bits (word * 16 + bit) for bit areas
+        """
+        _type = self._normalize_type(_type)
+        address = self._compile(memory_area_code)
+        if np.size(values) == 0:
+            raise FinsDataError(f"No values to write to {address.address}", error_code="INVALID_VALUE")
+        if address.is_bit:
+            payload = np.asarray(values, dtype=bool).reshape(-1).astype(np.uint8).tobytes()
+            start = address.word_address * 16 + address.bit_number
+        else:
+            if _type not in DATA_TYPE_ENCODERS:
+                raise FinsDataError(
+                        f"Data type '{_type}' can not be written. Allowed types are: {', '.join(DATA_TYPE_ENCODERS.keys())}",
+                        error_code="INVALID_TYPE"
+                        )
+            try:
+                payload = DATA_TYPE_ENCODERS[_type](values)
+            except (OverflowError, ValueError, TypeError) as e:
+                raise FinsDataError(f"Can not encode values for {address.address} as {_type}: {e}",
+                                    error_code="INVALID_VALUE")
+            start = address.word_address
+        return address, _type, (address.memory_type_code, start, address.is_bit, payload)
+    
+    def _write_command_frames(self, segments: List[tuple]) -> Tuple[List[bytes], List[Tuple[int, int, int]]]:
+        """
+        Build the MEMORY_AREA_WRITE command frames of some segments, at most 990 items each.
+        
+        Args:
+            segments: (memory area code, start, is bit, payload) tuples from _write_segment
+            
+        Returns:
+            Tuple of (command frames, (segment index, start, end) covered by each frame)
+        """
+        texts = []
+        ranges = []
+        for segment_index, (memory_type_code, start, is_bit, payload) in enumerate(segments):
+            unit = 1 if is_bit else 2
+            count = len(payload) // unit
+            for offset in range(0, count, WRITE_MAX_ITEMS):
+                size = min(WRITE_MAX_ITEMS, count - offset)
+                if is_bit:
+                    word, bit = divmod(start + offset, 16)
+                else:
+                    word, bit = start + offset, 0
+                texts.append(bytes([memory_type_code]) + word.to_bytes(2, 'big') + bytes([bit]) +
+                             size.to_bytes(2, 'big') + payload[offset * unit:(offset + size) * unit])
+                ranges.append((segment_index, start + offset, start + offset + size))
+        return self.fins_command_frames(self.command_codes.MEMORY_AREA_WRITE, texts), ranges
+    
+    def _write_result(self, memory_area_code: str, _type: str, command_frames: List[bytes],
+                      response_frames: List[bytes]) -> dict:
+        """
+        Check the responses of a write.
+        
+        Args:
+            memory_area_code: Address as given
+            _type: Data type name
+            command_frames: Command frames from _write_command_frames
+            response_frames: Response frame bytes, one per command frame
+            
+        Returns:
+            Result dict
+        """
+        final_result = {
+            "status": "success",
+            "message": "",
+            "data": None,
+            "data_format": _type,
+            "meta": {"original_address": memory_area_code, "write_chunks": len(command_frames)},
+            "debug": {}
+            }
+        for response_data in response_frames:
+            response_frame = self._parse_response(response_data)
+            is_success, msg = self._check_response(response_frame.end_code)
+            final_result["message"] = msg
+            if not is_success:
+                final_result["status"] = "error"
+                final_result["debug"]["response_frame"] = str(response_data)
+                break
+        return final_result
+    
+    def write_many(self, values: Dict[Union[str, FinsAddress], Any], types: Union[str, List[str]] = 'INT16') -> dict:
+        """
+        Write scattered tags in as few MEMORY_AREA_WRITE commands as possible.
+        
+        FINS has no multiple write command, so tags that are exactly
+        adjacent in the same area are merged into one write and all
+        commands are sent pipelined.
+        
+        Args:
+            values: Values per address (e.g. {'D100': 5, 'D101': 6, 'W3.01': True})
+            types: One data type for all addresses or one per address
+            
+        Returns:
+            Result dict whose data maps each address to True if it was written
+        """
+        tags, command_frames, ranges = self._write_many_command_frames(values, types)
+        response_frames = self.execute_fins_command_frames(command_frames)
+        return self._write_many_result(tags, ranges, command_frames, response_frames)
+    
+    def _write_many_command_frames(self, values: Dict[Union[str, FinsAddress], Any],
+                                   types: Union[str, List[str]]) -> tuple:
+        """
+        Encode scattered tags, merge adjacent ones and build the command frames.
+        
+        Args:
+            values: Values per address
+            types: One data type for all addresses or one per address
+            
+        Returns:
+            Tuple of ((address, merged segment index, start, end) per tag,
+            command frames, ranges from _write_command_frames)
+        """
+        encoded = []
+        for (memory_area_code, value), data_type in zip(values.items(), self._expand_types(list(values), types)):
+            address, _, segment = self._write_segment(memory_area_code, value, data_type)
+            encoded.append((len(encoded), address.address, segment))
+        
+        # Merge segments of the same area that touch, in address order
+        segments = []
+        tags = []
+        for index, address, (memory_type_code, start, is_bit, payload) in sorted(
+                encoded, key=lambda item: (item[2][0], item[2][1])):
+            end = start + len(payload) // (1 if is_bit else 2)
+            if segments and segments[-1][0] == memory_type_code:
+                last_code, last_start, last_bit, last_payload = segments[-1]
+                last_end = last_start + len(last_payload) // (1 if last_bit else 2)
+                if start < last_end:
+                    raise FinsDataError(f"Write of {address} overlaps another tag", error_code="INVALID_VALUE")
+                if start == last_end:
+                    segments[-1] = (last_code, last_start, last_bit, last_payload + payload)
+                    tags.append((index, address, len(segments) - 1, start, end))
+                    continue
+            segments.append((memory_type_code, start, is_bit, payload))
+            tags.append((index, address, len(segments) - 1, start, end))
+        
+        command_frames, ranges = self._write_command_frames(segments)
+        # Report the tags in the order they were given
+        return [tag[1:] for tag in sorted(tags)], command_frames, ranges
+    
+    def _write_many_result(self, tags: List[tuple], ranges: List[Tuple[int, int, int]],
+                           command_frames: List[bytes], response_frames: List[bytes]) -> dict:
+        """
+        Check the responses of write_many and report every tag.
+        
+        Args:
+            tags: (address, segment index, start, end) per tag
+            ranges: (segment index, start, end) per command frame
+            command_frames: Command frames from _write_command_frames
+            response_frames: Response frame bytes, one per command frame
+            
+        Returns:
+            Result dict whose data maps each address to True if it was written
+        """
+        final_result = {
+            "status": "success",
+            "message": "",
+            "data": {},
+            "data_format": "MULTIPLE",
+            "meta": {"commands": len(command_frames)},
+            "debug": {}
+            }
+        failed = []
+        for command_range, response_data in zip(ranges, response_frames):
+            response_frame = self._parse_response(response_data)
+            is_success, msg = self._check_response(response_frame.end_code)
+            final_result["message"] = msg
+            if not is_success:
+                final_result["status"] = "error"
+                failed.append(command_range)
+        for address, segment_index, start, end in tags:
+            final_result["data"][address] = not any(
+                failed_segment == segment_index and failed_start < end and start < failed_end
+                for failed_segment, failed_start, failed_end in failed)
+        return final_result
+    
+    def fill(self, memory_area_code: Union[str, FinsAddress], count: int, value: int = 0) -> dict:
+        """
+        Set count words starting at an address to one value with MEMORY_AREA_FILL.
+        
+        The PLC writes the words itself, so clearing a whole DM/EM block
+        is one command per 65535 words instead of streaming every word.
+        
+        Args:
+            memory_area_code: Start word address (e.g. 'D0') or FinsAddress
+            count: Number of words
+            value: Word value, -32768..65535 (negative values as INT16)
+            
+        Returns:
+            Result dict; data is None
+        """
+        address, command_frames = self._fill_command_frames(memory_area_code, count, value)
+        response_frames = self.execute_fins_command_frames(command_frames)
+        return self._write_result(address.address, "FILL", command_frames, response_frames)
+    
+    def _fill_command_frames(self, memory_area_code: Union[str, FinsAddress], count: int,
+                             value: int) -> Tuple[FinsAddress, List[bytes]]:
+        """
+        Build the MEMORY_AREA_FILL command frames of a fill.
+        
+        Args:
+            memory_area_code: Start word address or FinsAddress
+            count: Number of words
+            value: Word value
+            
+        Returns:
+            Tuple of (compiled address, command frames)
+        """
+        address = self._compile_word_range(memory_area_code, count)
+        if not (-0x8000 <= value <= 0xFFFF):
+            raise FinsDataError(f"Fill value must be between -32768-65535, got {value}", error_code="INVALID_VALUE")
+        word_value = (value & 0xFFFF).to_bytes(2, 'big')
+        texts = []
+        for offset in range(0, count, FILL_MAX_ITEMS):
+            size = min(FILL_MAX_ITEMS, count - offset)
+            texts.append(address.offset(offset).address_field + size.to_bytes(2, 'big') + word_value)
+        return address, self.fins_command_frames(self.command_codes.MEMORY_AREA_FILL, texts)
+    
+    def transfer(self, source: Union[str, FinsAddress], destination: Union[str, FinsAddress],
+                 count: int) -> dict:
+        """
+        Copy count words inside the PLC with MEMORY_AREA_TRANSFER.
+        
+        Args:
+            source: First source word (e.g. 'D0') or FinsAddress
+            destination: First destination word (e.g. 'E0_0') or FinsAddress
+            count: Number of words
+            
+        Returns:
+            Result dict; data is None
+        """
+        address, command_frames, ordered = self._transfer_command_frames(source, destination, count)
+        if ordered:
+            # Overlapping chunks must run one after another in this order
+            response_frames = [self.execute_fins_command_frame(command_frame) for command_frame in command_frames]
+        else:
+            response_frames = self.execute_fins_command_frames(command_frames)
+        return self._write_result(address.address, "TRANSFER", command_frames, response_frames)
+    
+    def _transfer_command_frames(self, source: Union[str, FinsAddress], destination: Union[str, FinsAddress],
+                                 count: int) -> Tuple[FinsAddress, List[bytes], bool]:
+        """
+        Build the MEMORY_AREA_TRANSFER command frames of a transfer.
+        
+        Chunks of an overlapping transfer are ordered so no chunk reads
+        words an earlier chunk already overwrote (last chunk first when
+        copying upwards).
+        
+        Args:
+            source: First source word or FinsAddress
+            destination: First destination word or FinsAddress
+            count: Number of words
+            
+        Returns:
+            Tuple of (compiled source, command frames, whether they must run in order)
+        """
+        source_address = self._compile_word_range(source, count)
+        destination_address = self._compile_word_range(destination, count)
+        offsets = list(range(0, count, TRANSFER_MAX_ITEMS))
+        ordered = (len(offsets) > 1 and
+                   source_address.memory_type_code == destination_address.memory_type_code and
+                   abs(source_address.word_address - destination_address.word_address) < count)
+        if ordered and destination_address.word_address > source_address.word_address:
+            offsets.reverse()
+        texts = []
+        for offset in offsets:
+            size = min(TRANSFER_MAX_ITEMS, count - offset)
+            texts.append(source_address.offset(offset).address_field +
+                         destination_address.offset(offset).address_field + size.to_bytes(2, 'big'))
+        return source_address, self.fins_command_frames(self.command_codes.MEMORY_AREA_TRANSFER, texts), ordered
+    
+    def _compile_word_range(self, memory_area_code: Union[str, FinsAddress], count: int) -> FinsAddress:
+        """
+        Compile the start of a word range used by fill and transfer.
+        
+        Args:
+            memory_area_code: Start word address or FinsAddress
+            count: Number of words
+            
+        Returns:
+            FinsAddress
+        """
+        address = self._compile(memory_area_code)
+        if address.is_bit:
+            raise FinsAddressError(f"Expected a word address, got bit address {address.address}")
+        if count < 1 or address.word_address + count > 0x10000:
+            raise FinsDataError(f"Invalid word count {count} for {address.address}", error_code="INVALID_VALUE")
+        return address
     
     def __enter__(self):
         """Context manager entry."""
@@ -370,45 +1502,7 @@ class FinsUdpConnection(FinsConnection):
         final_result["debug"]["command_frame"] = str(command_frame)
         try:
             rcv = self.execute_fins_command_frame(command_frame)
-            final_result["debug"]["raw_response_bytes"] = str(rcv)
-            response_data = rcv[10:]
-            # print("from response cpu unit data read", rcv)
-            data = response_data[4:]  # Skip 4 bytes (command + end code)
-
-            unit_name = data[0:20].decode().strip()
-            boot_version = data[20:25].decode().strip()
-            model_number = data[28:32].decode().strip()
-            os_version = data[32:37].decode().strip()   
-            if response_data[2:4] == b'\x00\x00':
-                final_result["status"] = "success"
-                final_result["message"] = "CPU Unit Details Read Successfully"
-                final_result["data"] = {
-                    "unit_name": unit_name,
-                    "boot_version": boot_version,
-                    "model_number": model_number,
-                    "os_version": os_version
-                }
-            else:
-                error_code = response_data[2:4]
-                # get the appropriate message from _check_response
-                is_success, msg = self._check_response(error_code)
-                final_result["status"] = "error"
-                final_result["message"] = f"Error reading CPU Unit Details. Error msg {msg}"
-                final_result["data"] = {"error_code": str(error_code)}
-            
-            if self.debug == True:
-                print("\n ------------CPU Unit Data Read Response------------")
-                print("  Whole Response Data:", response_data)
-                final_result["debug"]["raw_response_bytes"] = response_data.hex()
-                print("  Data after header and command:", data)
-                print("  Command code:", response_data[10:12])
-                print("  FINS response status:", response_data[12:14])
-                print("  Unit Name:", unit_name)
-                print("  Boot Version:", boot_version)
-                print("  OS Version:", os_version)
-                print(" ------------End of CPU Unit Data Read Response------------\n")
-            
-            return final_result
+            return self._cpu_unit_details_result(final_result, rcv)
 
         except ConnectionError as e:
             final_result["status"] = "error"
@@ -418,7 +1512,58 @@ class FinsUdpConnection(FinsConnection):
             final_result["status"] = "error"
             final_result["message"] = f"An unexpected error occurred: {str(e)}"
             return final_result
+
+    def _cpu_unit_details_result(self, final_result: dict, rcv: bytes) -> dict:
+        """
+        Fill the CPU unit details result from a CPU_UNIT_DATA_READ response.
         
+        Args:
+            final_result: Result dict prepared by the caller
+            rcv: Raw response frame bytes
+            
+        Returns:
+            The completed result dict
+        """
+        final_result["debug"]["raw_response_bytes"] = str(rcv)
+        response_data = rcv[10:]
+        # print("from response cpu unit data read", rcv)
+        data = response_data[4:]  # Skip 4 bytes (command + end code)
+
+        unit_name = data[0:20].decode().strip()
+        boot_version = data[20:25].decode().strip()
+        model_number = data[28:32].decode().strip()
+        os_version = data[32:37].decode().strip()   
+        if response_data[2:4] == b'\x00\x00':
+            final_result["status"] = "success"
+            final_result["message"] = "CPU Unit Details Read Successfully"
+            final_result["data"] = {
+                "unit_name": unit_name,
+                "boot_version": boot_version,
+                "model_number": model_number,
+                "os_version": os_version
+            }
+        else:
+            error_code = response_data[2:4]
+            # get the appropriate message from _check_response
+            is_success, msg = self._check_response(error_code)
+            final_result["status"] = "error"
+            final_result["message"] = f"Error reading CPU Unit Details. Error msg {msg}"
+            final_result["data"] = {"error_code": str(error_code)}
+        
+        if self.debug == True:
+            print("\n ------------CPU Unit Data Read Response------------")
+            print("  Whole Response Data:", response_data)
+            final_result["debug"]["raw_response_bytes"] = response_data.hex()
+            print("  Data after header and command:", data)
+            print("  Command code:", response_data[10:12])
+            print("  FINS response status:", response_data[12:14])
+            print("  Unit Name:", unit_name)
+            print("  Boot Version:", boot_version)
+            print("  OS Version:", os_version)
+            print(" ------------End of CPU Unit Data Read Response------------\n")
+        
+        return final_result
+    
     def cpu_unit_status_read(self) -> dict:
         """
         Read CPU unit status.
@@ -447,18 +1592,6 @@ class FinsUdpConnection(FinsConnection):
         the second byte is the error priority decimal number [00 - 99]
         
         """
-        #Mode_dict 
-        mode_code_dict = {  b'\x00': 'PROGRAM',
-                            b'\x02': 'MONITOR',
-                            b'\x04': 'RUN',
-                        }   
-        # Status_dict
-        status_code_dict = { b'\x00': 'Stop',
-                            b'\x01': 'Run',
-                            b'\x80': 'CPU on standby',
-                            b'\x05': 'No data available'
-                    }
-        
         final_result = {
                         "status": "",
                         "message": "", 
@@ -476,44 +1609,7 @@ class FinsUdpConnection(FinsConnection):
         # final_result = {"status": "","message": "", "data": None, "data_format": "N/A", "meta": {}, "debug": {}}
         try:
             response_data = self.execute_fins_command_frame(command_frame)
-            final_result["debug"]["raw_response_bytes"] = str(response_data)
-            final_result["debug"]["response_frame_header"] = str(response_data[0:10])
-            final_result["debug"]["response_frame_command_code"] = str(response_data[10:12])
-            final_result["debug"]["response_frame_code"] = str(response_data[12:14])
-            # print("from response cpu unit status read", response_data)
-            data = response_data[12:]  # Skip 12 bytes (header + command + end code)
-            
-            if self.debug == True:
-                print("\n ------------CPU Unit Status Read Response------------")
-                final_result["debug"]["raw_response_bytes"] = response_data.hex()
-                print("  Whole Response Data:", response_data)
-                print("  Data after header and command:", response_data[10:])
-                print("  Command code:",response_data[10:12])
-                print("  Response status:", response_data[12:14])
-                print("  Next two bytes are the parameters:")
-                print("  1st byte Status (response):", response_data[14:15])
-                print("  Mode (response):", response_data[15:16])
-                print("  fatal error data:", response_data[16:18])
-                print("  Non fatal error data:", response_data[18:20])
-                print("  Non fatal error data priority:", response_data[19:20])
-                print(" ------------End of CPU Unit Status Read Response------------\n")
-
-            if response_data[12:14] == b'\x00\x00':
-                final_result["status"] = "success"
-                final_result["message"] = "CPU Unit Status Read Successfully"
-                # print("Raw status byte:", response_data[14:15])
-                # print("Raw mode byte:", response_data[15:16])
-                final_result["data"] = {
-                    "Status": status_code_dict.get(response_data[14:15], 'Unknown Status'),
-                    "Mode": mode_code_dict.get(response_data[15:16], 'Unknown Mode')
-                    }
-            else:
-                error_code = response_data[12:14].hex()
-                final_result["status"] = "error"
-                final_result["message"] = f"Error reading CPU Unit Status. Error code: {error_code}"
-                final_result["data"] = {"error_code": error_code}
-                
-            return final_result
+            return self._cpu_unit_status_result(final_result, response_data)
             
         except ConnectionError as e:
             final_result["status"] = "error"
@@ -523,7 +1619,69 @@ class FinsUdpConnection(FinsConnection):
             final_result["status"] = "error"
             final_result["message"] = f"An unexpected error occurred: {str(e)}"
             return final_result
+
+    def _cpu_unit_status_result(self, final_result: dict, response_data: bytes) -> dict:
+        """
+        Fill the CPU unit status result from a CPU_UNIT_STATUS_READ response.
         
+        Args:
+            final_result: Result dict prepared by the caller
+            response_data: Raw response frame bytes
+            
+        Returns:
+            The completed result dict
+        """
+        #Mode_dict 
+        mode_code_dict = {  b'\x00': 'PROGRAM',
+                            b'\x02': 'MONITOR',
+                            b'\x04': 'RUN',
+                        }   
+        # Status_dict
+        status_code_dict = { b'\x00': 'Stop',
+                            b'\x01': 'Run',
+                            b'\x80': 'CPU on standby',
+                            b'\x05': 'No data available'
+                    }
+        
+        final_result["debug"]["raw_response_bytes"] = str(response_data)
+        final_result["debug"]["response_frame_header"] = str(response_data[0:10])
+        final_result["debug"]["response_frame_command_code"] = str(response_data[10:12])
+        final_result["debug"]["response_frame_code"] = str(response_data[12:14])
+        # print("from response cpu unit status read", response_data)
+        data = response_data[12:]  # Skip 12 bytes (header + command + end code)
+        
+        if self.debug == True:
+            print("\n ------------CPU Unit Status Read Response------------")
+            final_result["debug"]["raw_response_bytes"] = response_data.hex()
+            print("  Whole Response Data:", response_data)
+            print("  Data after header and command:", response_data[10:])
+            print("  Command code:",response_data[10:12])
+            print("  Response status:", response_data[12:14])
+            print("  Next two bytes are the parameters:")
+            print("  1st byte Status (response):", response_data[14:15])
+            print("  Mode (response):", response_data[15:16])
+            print("  fatal error data:", response_data[16:18])
+            print("  Non fatal error data:", response_data[18:20])
+            print("  Non fatal error data priority:", response_data[19:20])
+            print(" ------------End of CPU Unit Status Read Response------------\n")
+
+        if response_data[12:14] == b'\x00\x00':
+            final_result["status"] = "success"
+            final_result["message"] = "CPU Unit Status Read Successfully"
+            # print("Raw status byte:", response_data[14:15])
+            # print("Raw mode byte:", response_data[15:16])
+            final_result["data"] = {
+                "Status": status_code_dict.get(response_data[14:15], 'Unknown Status'),
+                "Mode": mode_code_dict.get(response_data[15:16], 'Unknown Mode')
+                }
+        else:
+            error_code = response_data[12:14].hex()
+            final_result["status"] = "error"
+            final_result["message"] = f"Error reading CPU Unit Status. Error code: {error_code}"
+            final_result["data"] = {"error_code": error_code}
+            
+        return final_result
+    
     def clock_read(self) -> dict:
         
         """
@@ -550,24 +1708,7 @@ class FinsUdpConnection(FinsConnection):
         final_result["debug"]["command_frame"] = str(command_frame)
         try:
             rcv = self.execute_fins_command_frame(command_frame)
-            final_result["debug"]["raw_response_bytes"] = str(rcv)
-            finsres = rcv[10:]
-
-            if finsres[2:4] == b'\x00\x00':
-                dt_array = finsres[4:10]
-                dt_str = dt_array.hex()
-                plc_date_time = datetime.strptime(dt_str, '%y%m%d%H%M%S')
-                final_result["status"] = "success"
-                final_result["message"] = "Clock Read Successfully"
-                final_result["data"] = plc_date_time.isoformat()  # Use ISO format for datetime "just for consistency adds a 'T' between date and time"
-                # final_result["data"] = plc_date_time
-            else:
-                error_message = FinsResponseError(finsres[2:4]).message
-                final_result["status"] = "error"
-                final_result["message"] = f"Error reading clock: {error_message}"
-                final_result["data"] = None
-            
-            return final_result
+            return self._clock_result(final_result, rcv)
 
         except ConnectionError as e:
             final_result["status"] = "error"
@@ -577,4 +1718,34 @@ class FinsUdpConnection(FinsConnection):
         except Exception as e:
             final_result["status"] = "error"
             final_result["message"] = f"Exception Error: {str(e)}"
-            return final_result
\ No newline at end of file
+            return final_result
+
+    def _clock_result(self, final_result: dict, rcv: bytes) -> dict:
+        """
+        Fill the clock result from a CLOCK_READ response.
+        
+        Args:
+            final_result: Result dict prepared by the caller
+            rcv: Raw response frame bytes
+            
+        Returns:
+            The completed result dict
+        """
+        final_result["debug"]["raw_response_bytes"] = str(rcv)
+        finsres = rcv[10:]
+
+        if finsres[2:4] == b'\x00\x00':
+            dt_array = finsres[4:10]
+            dt_str = dt_array.hex()
+            plc_date_time = datetime.strptime(dt_str, '%y%m%d%H%M%S')
+            final_result["status"] = "success"
+            final_result["message"] = "Clock Read Successfully"
+            final_result["data"] = plc_date_time.isoformat()  # Use ISO format for datetime "just for consistency adds a 'T' between date and time"
+            # final_result["data"] = plc_date_time
+        else:
+            error_message = FinsResponseError(finsres[2:4]).message
+            final_result["status"] = "error"
+            final_result["message"] = f"Error reading clock: {error_message}"
+            final_result["data"] = None
+        
+        return final_result
@@ -13,6 +13,16 @@ from .conversion import (
     toString,
     bcd_to_decimal,
     bcd_to_decimal2,
+    fromInt16,
+    fromUInt16,
+    fromInt32,
+    fromUInt32,
+    fromInt64,
+    fromUInt64,
+    fromFloat,
+    fromDouble,
+    DATA_TYPE_MAPPING,
+    DATA_TYPE_ENCODERS,
 )
 
 __all__ = [
@@ -30,4 +40,14 @@ __all__ = [
     "toString",
     "bcd_to_decimal",
     "bcd_to_decimal2",
+    "fromInt16",
+    "fromUInt16",
+    "fromInt32",
+    "fromUInt32",
+    "fromInt64",
+    "fromUInt64",
+    "fromFloat",
+    "fromDouble",
+    "DATA_TYPE_MAPPING",
+    "DATA_TYPE_ENCODERS",
 ]
\ No newline at end of file
@@ -1,4 +1,4 @@
-import struct
+import numpy as np
 
 def toBin(  data):
         outdata = format(int.from_bytes(data, 'big'), 'b')
@@ -12,92 +12,122 @@ def WordToBin(  data):
 
     return outdata
 
-def toInt16(  data):
-    outdata = []
-    arydata = bytearray(data)
-    for idx in range(0, len(arydata), 2):
-        tmpdata = arydata[idx:idx+2]
-        outdata += (struct.unpack('>h',tmpdata))
+def _decode_words(data, dtype, words, as_array):
+    """
+    Decode FINS words into values in one vectorized pass.
+
+    The PLC sends every word big-endian with the lowest word first, so
+    multi-word values have their word order reversed (CDAB for 32-bit)
+    before the big-endian dtype view is taken.
+
+    Args:
+        data: Raw bytes (bytes, bytearray or memoryview)
+        dtype: Big-endian NumPy dtype of one value (e.g. '>i4')
+        words: Words per value
+        as_array: Return a native-endian ndarray instead of a list
+
+    Returns:
+        List of values, or ndarray if as_array is True
+    """
+    raw = np.frombuffer(data, dtype='>u2')
+    if words > 1:
+        raw = np.ascontiguousarray(raw.reshape(-1, words)[:, ::-1])
+    values = raw.view(dtype).reshape(-1)
+    if as_array:
+        return values.astype(values.dtype.newbyteorder('='))
+    return values.tolist()
+
+def toInt16(  data, as_array=False):
+    return _decode_words(data, '>i2', 1, as_array)
+
+def toUInt16(  data, as_array=False):
+    return _decode_words(data, '>u2', 1, as_array)
+
+def toInt32_old(  data, as_array=False):
+    # No word swap, the words are taken in the order they arrive
+    return _decode_words(data, '>i4', 1, as_array)
+
+def toInt32(  data, as_array=False):
+    return _decode_words(data, '>i4', 2, as_array)
+
+def toUInt32(  data, as_array=False):
+    return _decode_words(data, '>u4', 2, as_array)
+
+def toInt64(  data, as_array=False):
+    return _decode_words(data, '>i8', 4, as_array)
     
-    return outdata
-
-def toUInt16(  data):
-    outdata = []
-    arydata = bytearray(data)
-    for idx in range(0, len(arydata), 2):
-        tmpdata = arydata[idx:idx+2]
-        outdata += (struct.unpack('>H',tmpdata))
-    
-    return outdata
-
-def toInt32_old(  data):
-    outdata = []
-    arydata = bytearray(data)
-    for idx in range(0, len(arydata), 4):
-        tmpdata = arydata[idx:idx+4]
-        outdata += (struct.unpack('>i',tmpdata))
-    
-    return outdata
-
-def toInt32(  data):
-    outdata = []
-    arydata = bytearray(data)
-    for idx in range(0, len(arydata), 4):
-        tmpdata = arydata[idx:idx+4]
-        tmpdata[0:2], tmpdata[2:4] = tmpdata[2:4], tmpdata[0:2]
-        outdata += (struct.unpack('>i',tmpdata))
-
-    return outdata
-
-def toUInt32(  data):
-    outdata = []
-    arydata = bytearray(data)
-    for idx in range(0, len(arydata), 4):
-        tmpdata = arydata[idx:idx+4]
-        tmpdata[0:2], tmpdata[2:4] = tmpdata[2:4], tmpdata[0:2]
-        outdata += (struct.unpack('>I',tmpdata))
-    
-    return outdata
-
-def toInt64(  data):
-    outdata = []
-    arydata = bytearray(data)
-    for idx in range(0, len(arydata), 8):
-        tmpdata = arydata[idx:idx+8]
-        tmpdata[0:2],tmpdata[2:4],tmpdata[4:6],tmpdata[6:8] = tmpdata[6:8],tmpdata[4:6],tmpdata[2:4],tmpdata[0:2]
-        outdata += (struct.unpack('>q',tmpdata))
-
-    return outdata
-    
-def toUInt64(  data):
-    outdata = []
-    arydata = bytearray(data)
-    for idx in range(0, len(arydata), 8):
-        tmpdata = arydata[idx:idx+8]
-        tmpdata[0:2],tmpdata[2:4],tmpdata[4:6],tmpdata[6:8] = tmpdata[6:8],tmpdata[4:6],tmpdata[2:4],tmpdata[0:2]
-        outdata += (struct.unpack('>Q',tmpdata))
-    
-    return outdata
-
-def toFloat(  data):
-    outdata = []
-    arydata = bytearray(data)
-    for idx in range(0, len(arydata), 4):
-        tmpdata = arydata[idx:idx+4]
-        tmpdata[0:2], tmpdata[2:4] = tmpdata[2:4], tmpdata[0:2]
-        outdata += (struct.unpack('>f', tmpdata))
-
-    return outdata
-
-def toDouble(  data):
-    outdata = []
-    arydata = bytearray(data)
-    for idx in range(0, len(arydata), 8):
-        tmpdata = arydata[idx:idx+8]
-        tmpdata[0:2],tmpdata[2:4],tmpdata[4:6],tmpdata[6:8] = tmpdata[6:8],tmpdata[4:6],tmpdata[2:4],tmpdata[0:2]
-        outdata += (struct.unpack('>d', tmpdata))
-
-    return outdata
+def toUInt64(  data, as_array=False):
+    return _decode_words(data, '>u8', 4, as_array)
+
+def toFloat(  data, as_array=False):
+    return _decode_words(data, '>f4', 2, as_array)
+
+def toDouble(  data, as_array=False):
+    return _decode_words(data, '>f8', 4, as_array)
+
+def _encode_words(values, dtype, words):
+    """
+    Encode values into FINS words in one vectorized pass, the inverse of _decode_words.
+
+    Args:
+        values: Scalar or sequence (list, ndarray, ...) of values
+        dtype: Big-endian NumPy dtype of one value (e.g. '>i4')
+        words: Words per value
+
+    Returns:
+        Raw bytes as the PLC expects them, lowest word first
+
+    Raises:
+        OverflowError, ValueError: If a value does not fit the type
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind == 'f':
+        array = np.asarray(values, dtype=np.float64)
+        finite = array[np.isfinite(array)]
+        info = np.finfo(dtype)
+        if finite.size and np.abs(finite).max() > info.max:
+            raise OverflowError(f"Value out of range for {dtype.name} (-{info.max}..{info.max})")
+    else:
+        array = np.asarray(values)
+        if array.dtype.kind not in 'iub':
+            # Python ints past int64 turn the array into float64 or object;
+            # keep them as exact ints so the range check sees the real values
+            given = array.dtype.name
+            array = np.asarray(values, dtype=object)
+            if not all(isinstance(value, (int, np.integer)) for value in array.flat):
+                raise ValueError(f"Expected integer values for {dtype.name}, got {given}")
+        if array.size:
+            info = np.iinfo(dtype)
+            if array.min() < info.min or array.max() > info.max:
+                raise OverflowError(f"Value out of range for {dtype.name} ({info.min}..{info.max})")
+    raw = array.astype(dtype).reshape(-1).view('>u2')
+    if words > 1:
+        raw = raw.reshape(-1, words)[:, ::-1]
+    return raw.tobytes()
+
+def fromInt16(  values):
+    return _encode_words(values, '>i2', 1)
+
+def fromUInt16(  values):
+    return _encode_words(values, '>u2', 1)
+
+def fromInt32(  values):
+    return _encode_words(values, '>i4', 2)
+
+def fromUInt32(  values):
+    return _encode_words(values, '>u4', 2)
+
+def fromInt64(  values):
+    return _encode_words(values, '>i8', 4)
+
+def fromUInt64(  values):
+    return _encode_words(values, '>u8', 4)
+
+def fromFloat(  values):
+    return _encode_words(values, '>f4', 2)
+
+def fromDouble(  values):
+    return _encode_words(values, '>f8', 4)
 
 def toString(  data):
     outdata = data.decode("ascii")
@@ -111,4 +141,30 @@ def bcd_to_decimal(bcd):
     
 def bcd_to_decimal2(bcd_bytes):
     return ((bcd_bytes[0] >> 4) * 1000) + ((bcd_bytes[0] & 0x0F) * 100) + \
-        ((bcd_bytes[1] >> 4) * 10) + (bcd_bytes[1] & 0x0F)
\ No newline at end of file
+        ((bcd_bytes[1] >> 4) * 10) + (bcd_bytes[1] & 0x0F)
+
+
+# Data type name -> [words per value, conversion function]
+DATA_TYPE_MAPPING = {
+    'INT16' : [1, toInt16],
+    'UINT16' : [1, toUInt16],
+    'INT32' : [2, toInt32],
+    'UINT32' : [2, toUInt32],
+    'INT64' : [4, toInt64],
+    'UINT64' : [4, toUInt64],
+    'FLOAT' : [2, toFloat],
+    'DOUBLE' : [4, toDouble],
+    'bcd_to_decimal' : [1,bcd_to_decimal]
+}
+
+# Data type name -> encoding function, the inverse of DATA_TYPE_MAPPING
+DATA_TYPE_ENCODERS = {
+    'INT16' : fromInt16,
+    'UINT16' : fromUInt16,
+    'INT32' : fromInt32,
+    'UINT32' : fromUInt32,
+    'INT64' : fromInt64,
+    'UINT64' : fromUInt64,
+    'FLOAT' : fromFloat,
+    'DOUBLE' : fromDouble,
+}
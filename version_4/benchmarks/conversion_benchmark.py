@@ -0,0 +1,54 @@
+"""
+Conversion Benchmark
+====================
+Compares the vectorized decoders in components/conversion.py with the
+per-element struct loop they replaced, for 1k-10k word block reads.
+
+Run from version_4:
+    python benchmarks/conversion_benchmark.py
+"""
+import os
+import struct
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from OMRON_FINS_PROTOCOL.components import toInt16, toInt32, toFloat, toDouble
+
+
+def struct_loop(data, fmt, words):
+    """Previous implementation: slice, swap words and unpack one value at a time."""
+    outdata = []
+    arydata = bytearray(data)
+    size = words * 2
+    for idx in range(0, len(arydata), size):
+        tmpdata = arydata[idx:idx + size]
+        if words == 2:
+            tmpdata[0:2], tmpdata[2:4] = tmpdata[2:4], tmpdata[0:2]
+        elif words == 4:
+            tmpdata[0:2], tmpdata[2:4], tmpdata[4:6], tmpdata[6:8] = tmpdata[6:8], tmpdata[4:6], tmpdata[2:4], tmpdata[0:2]
+        outdata += struct.unpack(fmt, tmpdata)
+    return outdata
+
+
+def main():
+    decoders = [
+        ('INT16', toInt16, '>h', 1),
+        ('INT32', toInt32, '>i', 2),
+        ('FLOAT', toFloat, '>f', 2),
+        ('DOUBLE', toDouble, '>d', 4),
+    ]
+    print(f"{'type':<8}{'words':>7}{'loop us':>12}{'list us':>12}{'array us':>12}{'speedup':>10}")
+    for word_count in (1000, 5000, 10000):
+        data = os.urandom(word_count * 2)
+        for name, decoder, fmt, words in decoders:
+            number = 50
+            loop = timeit.timeit(lambda: struct_loop(data, fmt, words), number=number) / number * 1e6
+            as_list = timeit.timeit(lambda: decoder(data), number=number) / number * 1e6
+            as_array = timeit.timeit(lambda: decoder(data, as_array=True), number=number) / number * 1e6
+            print(f"{name:<8}{word_count:>7}{loop:>12.1f}{as_list:>12.1f}{as_array:>12.1f}{loop / as_array:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
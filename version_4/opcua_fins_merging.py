@@ -1,4 +1,7 @@
 from OMRON_FINS_PROTOCOL.Infrastructure.udp_connection import FinsUdpConnection
+from OMRON_FINS_PROTOCOL.Fins_domain.read_plan import FinsReadPlanner
+from OMRON_FINS_PROTOCOL.Fins_domain.change_detection import FinsChangeDetector
+from OMRON_FINS_PROTOCOL.Fins_domain.report_filter import FinsReportFilter
 from OMRON_FINS_PROTOCOL.exception import *
 from opcua import Client
 from opcua_json import OpcuaAutoNodeMapper
@@ -6,32 +9,59 @@ import time
 from datetime import datetime
 
 def periodic_sync(fins, opcua_manager, address_mappings, interval_sec):
+    # Compile the read plan once; every cycle then reads a few contiguous blocks
+    plan = FinsReadPlanner().compile(address_mappings)
+    # Only tags whose PLC words changed since the last cycle are decoded and written
+    detector = FinsChangeDetector(plan)
+    # Deadbands and reporting intervals configured in the mappings
+    report_filter = FinsReportFilter(address_mappings)
+    # Resolve the OPC UA nodes and their types in one batched read
+    opcua_manager.preload([mapping['opcua_reg_add'] for mapping in address_mappings])
+    print(f"[{datetime.now()}] Read plan: {plan}")
     try:
         while True:
-            for mapping in address_mappings:
-                plc_address = mapping['plc_reg_add']
-                opcua_tag = mapping['opcua_reg_add']
-                data_type = mapping.get('data_type', 'int16')
-                bool_temp = False 
-                if data_type == 'bool':
-                    data_type = 'int16'
-                    bool_temp = True
-                try:
-                    # Read from PLC
-                    pack_plc_value = fins.read(plc_address, data_type=data_type)
-                    if bool_temp:
-                        plc_value = bool(pack_plc_value['data'][0])
-                        bool_temp = False
-                    else:
-                        plc_value = pack_plc_value['data'][0]
-                    
-                    print(f"[{datetime.now()}] PLC Value ({plc_address}): {plc_value}")
+            try:
+                pack_plc_values = fins.read_plan(plan, detector)
+            except Exception as e:
+                print(f"[{datetime.now()}] ❌ Error reading PLC: {e}")
+                time.sleep(interval_sec)
+                continue
+
+            if pack_plc_values['status'] != 'success':
+                print(f"[{datetime.now()}] ❌ Error reading PLC: {pack_plc_values['message']}")
+
+            plc_values_by_tag = {}
+            for index, plc_values in pack_plc_values['data'].items():
+                if address_mappings[index].get('data_type', 'int16') == 'bool':
+                    plc_values_by_tag[index] = bool(plc_values[0])
+                else:
+                    plc_values_by_tag[index] = plc_values[0]
 
-                    # Write to OPC UA
-                    opcua_manager.write(opcua_tag, plc_value)
-                    print(f"[{datetime.now()}] → Written to OPC UA node: {opcua_tag}")
+            opcua_values = {}
+            opcua_indices = {}
+            for index, plc_value in report_filter.update(plc_values_by_tag).items():
+                mapping = address_mappings[index]
+                print(f"[{datetime.now()}] PLC Value ({mapping['plc_reg_add']}): {plc_value}")
+                opcua_values[mapping['opcua_reg_add']] = plc_value
+                opcua_indices[mapping['opcua_reg_add']] = index
+
+            if opcua_values:
+                # One Write service request for every value of the cycle
+                try:
+                    statuses = opcua_manager.write_many(opcua_values)
                 except Exception as e:
-                    print(f"[{datetime.now()}] ❌ Error processing {plc_address} → {opcua_tag}: {e}")
+                    print(f"[{datetime.now()}] ❌ Error writing to OPC UA: {e}")
+                    # Nothing was written: decode every tag again and resend these next cycle
+                    detector.reset()
+                    report_filter.unreport(opcua_indices.values())
+                else:
+                    for opcua_tag, status in statuses.items():
+                        if status.is_good():
+                            print(f"[{datetime.now()}] → Written to OPC UA node: {opcua_tag}")
+                        else:
+                            print(f"[{datetime.now()}] ❌ Error writing OPC UA node {opcua_tag}: {status.name}")
+                            # Resend next cycle even if the PLC value stays the same
+                            report_filter.unreport([opcua_indices[opcua_tag]])
 
             # Wait for next full cycle
             time.sleep(interval_sec)
@@ -47,6 +77,9 @@ def main():
     address_mappings = [
         {'plc_reg_add': '2.01', 'data_type':'int16','opcua_reg_add': 'CIO201'},
         {'plc_reg_add': 'C0001', 'data_type':'int16','opcua_reg_add': 'C0001'},
+        # Analog value: report changes above 0.5 (or 1 %), at most every 100 ms, at least every 60 s
+        # {'plc_reg_add': 'D100', 'data_type':'float','opcua_reg_add': 'Temp01',
+        #  'deadband': 0.5, 'deadband_percent': 1, 'min_interval': 0.1, 'max_interval': 60},
         # {'plc': '2.03', 'opcua': 'iVar03'},
     ]
 
@@ -1,62 +1,366 @@
 import os
 import json
+import hashlib
+from datetime import datetime
 from opcua import Client, ua
 import numpy as np
+from opcua.common import ua_utils
+
+# Nodes per service call when the server does not publish its OperationLimits
+DEFAULT_MAX_NODES_PER_CALL = 1000
+
+# References per node in one Browse response; 0 lets the server decide and
+# the rest comes back through continuation points
+BROWSE_MAX_REFERENCES_PER_NODE = 0
+
+# Reference fields requested by Browse: all the node map and the subtree
+# fingerprints need, without DisplayName and TypeDefinition
+BROWSE_RESULT_MASK = (ua.BrowseResultMask.ReferenceTypeId | ua.BrowseResultMask.NodeClass
+                      | ua.BrowseResultMask.BrowseName)
+
+# Browse results the server may give when it runs out of continuation
+# points; the nodes are browsed again in smaller batches
+BROWSE_RETRY_STATUS_CODES = (ua.StatusCodes.BadNoContinuationPoints, ua.StatusCodes.BadContinuationPointInvalid)
+
+# Layout version of the node map cache file (nodes.json)
+NODE_CACHE_FORMAT = 2
+
 class OpcuaAutoNodeMapper:
-    def __init__(self, client: Client, json_path="nodes.json",reload=False):
+    def __init__(self, client: Client, json_path="nodes.json",reload=False,
+                 browse_namespaces=None, browse_depth=None):
         self.client = client
         self.json_path = json_path
+        # Optional browse filters: namespace indices to keep, levels below Objects
+        self.browse_namespaces = browse_namespaces
+        self.browse_depth = browse_depth
         self.node_map = {}
+        # name -> resolved Node / its VariantType, filled by preload or on first use
+        self._nodes = {}
+        self._variant_types = {}
+        # DataType NodeId -> VariantType, shared by all nodes of that type
+        self._data_type_variant_types = {}
+        self._operation_limits = {}
+        # Subtree root NodeId -> its reference from Objects, set by _subtree_roots
+        self._root_references = {}
+        # Stamp and subtrees of the node map cache; _verified once the map
+        # is known to match the server (browsed, or a versioned model)
+        self._stamp = None
+        self._subtrees = {}
+        self._verified = False
         self._initialize_node_map(reload)
 
-    
-        
-        if os.path.exists(json_path):
-            self._load_nodes_from_json()
-        else:
-            print("[INFO] JSON not found. Browsing server...")
-            self._browse_and_save_nodes()
-
     def _initialize_node_map(self, reload=False):
         if reload:
             print("[INFO] Reloading node map to JSON")
-            self.node_map = {}
             self._browse_and_save_nodes()
             print("[INFO] Node map reloaded")
-            return
-    
+        elif os.path.exists(self.json_path):
+            self._load_nodes_from_json()
+        else:
+            print("[INFO] JSON not found. Browsing server...")
+            self._browse_and_save_nodes()
+
     def _load_nodes_from_json(self):
+        """
+        Load the node map cache, browsing only if the stamp does not match.
+
+        A cache stamped for another endpoint, NamespaceArray or model
+        version (or an old unstamped nodes.json) is rebuilt completely;
+        otherwise it is used as is, without browsing. When every browsed
+        namespace publishes a model version the stamp pins the address
+        space; for other servers the cache is only checked by refresh(),
+        which preload() runs once for a name missing from the map.
+        """
         with open(self.json_path) as f:
-            self.node_map = json.load(f)
+            cache = json.load(f)
+        self._invalidate_node_cache()
+        stamp = self._server_stamp()
+        if (not isinstance(cache, dict) or cache.get("format") != NODE_CACHE_FORMAT
+                or cache.get("stamp") != stamp):
+            print("[INFO] Node map cache is stale. Browsing server...")
+            self._browse_and_save_nodes(stamp)
+            return
+
+        self._stamp = stamp
+        self._set_node_map(cache["subtrees"])
+        self._verified = self._is_versioned(stamp)
         print(f"[INFO] Loaded {len(self.node_map)} nodes from JSON")
 
-    def _browse_and_save_nodes(self):
-        # print("[INFO] JSON not found. Browsing server...")
-        objects_node = self.client.get_objects_node()
+    def refresh(self):
+        """
+        Check the node map against the server and update what changed.
+
+        Every subtree below Objects is walked again (one batched
+        breadth-first browse, see _browse_subtrees) and compared with the
+        cache by fingerprint, so changes at any depth are found. This costs
+        as much as browsing without a cache.
+
+        Returns:
+            Root NodeId strings of the subtrees that changed, were added or removed
+        """
+        if self._stamp is None:
+            self._stamp = self._server_stamp()
+        subtrees = self._browse_subtrees(self._subtree_roots())
+        changed = [key for key in set(subtrees) | set(self._subtrees)
+                   if subtrees.get(key, {}).get("fingerprint") != self._subtrees.get(key, {}).get("fingerprint")]
+        if changed:
+            print(f"[INFO] {len(changed)} subtrees changed on the server")
+            self._invalidate_node_cache()
+            self._set_node_map(subtrees)
+            self._save_nodes(self._stamp, subtrees)
+        self._verified = True
+        return changed
+
+    def _browse_and_save_nodes(self, stamp=None):
+        self._invalidate_node_cache()
+        subtrees = self._browse_subtrees(self._subtree_roots())
+        self._stamp = stamp or self._server_stamp()
+        self._set_node_map(subtrees)
+        self._save_nodes(self._stamp, subtrees)
+        self._verified = True
+        print(f"[INFO] Saved {len(self.node_map)} nodes to {self.json_path}")
+
+    def _set_node_map(self, subtrees):
+        self._subtrees = subtrees
         self.node_map = {}
-        self._recursive_browse(objects_node)
+        for subtree in subtrees.values():
+            self.node_map.update(subtree["nodes"])
+
+    def _save_nodes(self, stamp, subtrees):
+        cache = {"format": NODE_CACHE_FORMAT, "stamp": stamp, "subtrees": subtrees, "node_map": self.node_map}
         with open(self.json_path, "w") as f:
-            json.dump(self.node_map, f, indent=4)
-        print(f"[INFO] Saved {len(self.node_map)} nodes to {self.json_path}")
+            json.dump(cache, f, indent=4)
+
+    def _server_stamp(self):
+        """
+        Identify the server and its address space model, with two cheap reads.
+
+        Returns:
+            Dict of endpoint, NamespaceArray and NamespaceVersion /
+            NamespacePublicationDate per namespace URI where the server
+            publishes them (Server/Namespaces)
+        """
+        url = self.client.server_url
+        # Without user name and password
+        endpoint = url._replace(netloc=url.netloc.rsplit("@", 1)[-1]).geturl()
+        return {
+            "endpoint": endpoint,
+            "namespaces": self.client.get_namespace_array(),
+            "model_versions": self._model_versions(),
+            "browse_namespaces": None if self.browse_namespaces is None else sorted(self.browse_namespaces),
+            "browse_depth": self.browse_depth,
+        }
 
-    def _recursive_browse(self, node):
+    def _model_versions(self):
         try:
-            for child in node.get_children():
-                try:
-                    browse_name = child.get_browse_name().Name
-                    # node_id_str = str(child.nodeid)
-                    node_id_str = child.nodeid.to_string()
-                    node_class = child.get_node_class()
+            [metadata_objects] = self._browse_references([ua.NodeId(ua.ObjectIds.Server_Namespaces)])
+            properties = [(index, reference.BrowseName.Name, reference.NodeId)
+                          for index, references in enumerate(
+                              self._browse_references([ref.NodeId for ref in metadata_objects]))
+                          for reference in references
+                          if reference.BrowseName.Name in ("NamespaceUri", "NamespaceVersion",
+                                                           "NamespacePublicationDate")]
+            values = self._read_values([node_id for _, _, node_id in properties])
+        except Exception as e:
+            print(f"[WARN] Cannot read namespace metadata: {e}")
+            return {}
+        metadata = {}
+        for (index, name, _), value in zip(properties, values):
+            metadata.setdefault(index, {})[name] = str(value)
+        return {entry.pop("NamespaceUri"): entry for entry in metadata.values() if "NamespaceUri" in entry}
+
+    def _is_versioned(self, stamp):
+        # Every namespace the browse covers publishes a version for its model
+        namespaces = stamp["namespaces"]
+        indices = range(len(namespaces)) if self.browse_namespaces is None else self.browse_namespaces
+        return all(index < len(namespaces) and namespaces[index] in stamp["model_versions"]
+                   for index in indices)
+
+    def _read_values(self, node_ids):
+        values = []
+        for chunk in self._chunks(node_ids, ua.ObjectIds.Server_ServerCapabilities_OperationLimits_MaxNodesPerRead):
+            results = self.client.uaclient.get_attributes(chunk, ua.AttributeIds.Value)
+            values.extend(result.Value.Value if result.StatusCode.is_good() else None for result in results)
+        return values
+
+    def _subtree_roots(self):
+        # Children of Objects: the unit of incremental re-browsing
+        objects = ua.NodeId(ua.ObjectIds.ObjectsFolder)
+        [references] = self._browse_references([objects])
+        roots = []
+        for reference in references:
+            if reference.NodeId not in roots and self._keep(reference.NodeId):
+                roots.append(reference.NodeId)
+        self._root_references = {reference.NodeId: reference for reference in references}
+        return roots
 
-                    if node_class == ua.NodeClass.Variable:
-                        self.node_map[browse_name] = node_id_str
+    def _keep(self, node_id):
+        return self.browse_namespaces is None or node_id.NamespaceIndex in self.browse_namespaces
 
-                    self._recursive_browse(child)
+    @staticmethod
+    def _reference_line(parent, reference):
+        return (f"{parent}>{reference.ReferenceTypeId.to_string()}>{reference.NodeId.to_string()}"
+                f"|{reference.BrowseName.to_string()}|{int(reference.NodeClass)}")
 
-                except Exception as e:
-                    print(f"[WARN] Skipping node: {e}")
+    def _browse_subtrees(self, roots):
+        """
+        Walk the subtrees below Objects in one breadth-first browse.
+
+        Returns:
+            Dict of root NodeId string -> {"fingerprint": sha1 of every
+            reference walked, "nodes": {browse name: NodeId string}}, in root order
+        """
+        depth = None if self.browse_depth is None else self.browse_depth - 1
+        nodes, fingerprints = self._browse_breadth_first(roots, self.browse_namespaces,
+                                                         None if depth is None else max(depth, 0))
+        subtrees = {}
+        for root in roots:
+            key = root.to_string()
+            root_nodes = {}
+            reference = self._root_references.get(root)
+            # A Variable right below Objects is part of its own subtree
+            if (reference is not None and reference.NodeClass == ua.NodeClass.Variable
+                    and (depth is None or depth >= 0)):
+                root_nodes[reference.BrowseName.Name] = key
+            root_nodes.update(nodes[key])
+            subtrees[key] = {"fingerprint": fingerprints[key], "nodes": root_nodes}
+        return subtrees
+
+    def _browse_breadth_first(self, roots, namespaces=None, max_depth=None):
+        """
+        Collect every Variable below each root, one level at a time.
+
+        Each level of all roots together is browsed with as few Browse
+        requests as the server's MaxNodesPerBrowse allows (see
+        _browse_references), so the number of round trips grows with the
+        depth of the address space, not with its size. Browse errors
+        propagate, so an incomplete walk is never taken for the whole
+        address space.
+
+        Args:
+            roots: NodeIds to start from
+            namespaces: Namespace indices to keep and descend into, default all
+            max_depth: Levels below the roots to browse, default unlimited
+
+        Returns:
+            Tuple of dict of root NodeId string -> {browse name: NodeId string}
+            and dict of root NodeId string -> fingerprint of its references
+        """
+        namespaces = None if namespaces is None else set(namespaces)
+        nodes = {root.to_string(): {} for root in roots}
+        lines = {key: [] for key in nodes}
+        visited = set(roots)
+        # (NodeId, key of the root it was reached from)
+        level = [(root, root.to_string()) for root in roots]
+        depth = 0
+        while level and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_level = []
+            results = self._browse_references([node_id for node_id, _ in level])
+            for (parent, key), references in zip(level, results):
+                parent = parent.to_string()
+                for reference in references:
+                    node_id = reference.NodeId
+                    if namespaces is not None and node_id.NamespaceIndex not in namespaces:
+                        continue
+                    lines[key].append(self._reference_line(parent, reference))
+                    if node_id in visited:
+                        continue
+                    visited.add(node_id)
+                    if reference.NodeClass == ua.NodeClass.Variable:
+                        nodes[key][reference.BrowseName.Name] = node_id.to_string()
+                    next_level.append((node_id, key))
+            level = next_level
+        fingerprints = {key: hashlib.sha1("\n".join(sorted(key_lines)).encode("utf-8")).hexdigest()
+                        for key, key_lines in lines.items()}
+        return nodes, fingerprints
+
+    def _browse_references(self, node_ids, limit=None):
+        """
+        Forward hierarchical references of many nodes, continuation points included.
+
+        Nodes the server could not give a continuation point (see
+        BROWSE_RETRY_STATUS_CODES) are browsed again in halved batches;
+        nodes that no longer exist are skipped.
+
+        Args:
+            node_ids: NodeIds to browse
+            limit: Nodes per Browse request, default the server's MaxNodesPerBrowse
+
+        Returns:
+            List of ReferenceDescriptions per node, in node_ids order
+
+        Raises:
+            ua.UaStatusCodeError: If a node cannot be browsed, even on its own
+        """
+        references = [[] for _ in node_ids]
+        if limit is None:
+            limit = self._operation_limit(ua.ObjectIds.Server_ServerCapabilities_OperationLimits_MaxNodesPerBrowse)
+        # (index in node_ids, status) of the nodes to browse again
+        retry = []
+        for start in range(0, len(node_ids), limit):
+            chunk = node_ids[start:start + limit]
+            parameters = ua.BrowseParameters()
+            parameters.RequestedMaxReferencesPerNode = BROWSE_MAX_REFERENCES_PER_NODE
+            for node_id in chunk:
+                description = ua.BrowseDescription()
+                description.NodeId = node_id
+                description.BrowseDirection = ua.BrowseDirection.Forward
+                description.ReferenceTypeId = ua.NodeId(ua.ObjectIds.HierarchicalReferences)
+                description.IncludeSubtypes = True
+                description.NodeClassMask = 0
+                description.ResultMask = BROWSE_RESULT_MASK
+                parameters.NodesToBrowse.append(description)
+
+            results = self.client.uaclient.browse(parameters)
+            owners = list(range(start, start + len(chunk)))
+            continuation_points = []
+            try:
+                while results:
+                    # Collected first, so all of them are released if a status raises
+                    continuation_points = [result.ContinuationPoint for result in results if result.ContinuationPoint]
+                    next_owners = [owner for owner, result in zip(owners, results) if result.ContinuationPoint]
+                    for owner, result in zip(owners, results):
+                        status = result.StatusCode
+                        if status.value in BROWSE_RETRY_STATUS_CODES:
+                            retry.append((owner, status))
+                        elif status.value == ua.StatusCodes.BadNodeIdUnknown:
+                            print(f"[WARN] Skipping node {node_ids[owner].to_string()}: {status}")
+                        else:
+                            status.check()
+                            references[owner].extend(result.References)
+                    if not continuation_points:
+                        break
+                    next_parameters = ua.BrowseNextParameters()
+                    next_parameters.ReleaseContinuationPoints = False
+                    next_parameters.ContinuationPoints = continuation_points
+                    results = self.client.uaclient.browse_next(next_parameters)
+                    owners = next_owners
+            except Exception:
+                self._release_continuation_points(continuation_points)
+                raise
+
+        if retry:
+            if limit == 1:
+                raise ua.UaStatusCodeError(retry[0][1].value)
+            owners = [owner for owner, _ in retry]
+            retried = self._browse_references([node_ids[owner] for owner in owners], max(1, min(limit, len(owners)) // 2))
+            # Replaces what a failed BrowseNext had already returned
+            for owner, owner_references in zip(owners, retried):
+                references[owner] = owner_references
+        return references
+
+    def _release_continuation_points(self, continuation_points):
+        # The server holds them until released; free them when a browse is aborted
+        if not continuation_points:
+            return
+        parameters = ua.BrowseNextParameters()
+        parameters.ReleaseContinuationPoints = True
+        parameters.ContinuationPoints = continuation_points
+        try:
+            self.client.uaclient.browse_next(parameters)
         except Exception as e:
-            print(f"[ERROR] Cannot browse: {e}")
+            print(f"[WARN] Cannot release continuation points: {e}")
 
     def _cast_to_type(self, value, variant_type):
         if variant_type == ua.VariantType.Int16:
@@ -83,14 +387,121 @@ class OpcuaAutoNodeMapper:
             print(f"[WARN] No cast rule for {variant_type.name}, using raw value")
             return value
     
+    def _invalidate_node_cache(self):
+        # Resolved nodes belong to the node map they were resolved from
+        self._nodes = {}
+        self._variant_types = {}
+
+    def _operation_limit(self, object_id):
+        # Server_ServerCapabilities_OperationLimits_* value, read once; 0 or missing means no limit
+        if object_id not in self._operation_limits:
+            try:
+                limit = self.client.get_node(ua.NodeId(object_id)).get_value()
+            except Exception:
+                limit = 0
+            self._operation_limits[object_id] = int(limit or 0) or DEFAULT_MAX_NODES_PER_CALL
+        return self._operation_limits[object_id]
+
+    def _chunks(self, items, object_id):
+        limit = self._operation_limit(object_id)
+        return [items[start:start + limit] for start in range(0, len(items), limit)]
+
+    def _variant_type_of(self, data_type):
+        if data_type not in self._data_type_variant_types:
+            if (data_type.NamespaceIndex == 0 and isinstance(data_type.Identifier, int)
+                    and 1 <= data_type.Identifier <= 25):
+                # Built-in types map straight to their VariantType
+                variant_type = ua.VariantType(data_type.Identifier)
+            else:
+                variant_type = ua_utils.data_type_to_variant_type(self.client.get_node(data_type))
+            self._data_type_variant_types[data_type] = variant_type
+        return self._data_type_variant_types[data_type]
+
+    def preload(self, names=None):
+        """
+        Resolve nodes and their VariantTypes with batched DataType reads.
+
+        A name missing from a node map loaded from an unchecked cache runs
+        refresh() once, so nodes added to the server since are found.
+
+        Args:
+            names: Node names to resolve, default the whole node map
+        """
+        names = [name for name in (self.node_map if names is None else names)
+                 if name not in self._variant_types]
+        if not self._verified and any(name not in self.node_map for name in names):
+            # The cache may predate these nodes; check it once
+            self.refresh()
+        for name in [name for name in names if name not in self.node_map]:
+            print(f"[WARN] Node '{name}' not in node map")
+        names = [name for name in names if name in self.node_map]
+        for chunk in self._chunks(names, ua.ObjectIds.Server_ServerCapabilities_OperationLimits_MaxNodesPerRead):
+            nodes = [self.client.get_node(self.node_map[name]) for name in chunk]
+            results = self.client.uaclient.get_attributes([node.nodeid for node in nodes], ua.AttributeIds.DataType)
+            for name, node, result in zip(chunk, nodes, results):
+                if not result.StatusCode.is_good():
+                    print(f"[WARN] Cannot read data type of '{name}': {result.StatusCode}")
+                    continue
+                self._nodes[name] = node
+                self._variant_types[name] = self._variant_type_of(result.Value.Value)
+
+    def _resolve(self, name):
+        if name not in self._variant_types:
+            self.preload([name])
+        if name not in self._variant_types:
+            raise ua.UaError(f"Cannot resolve data type of '{name}'")
+        return self._nodes[name], self._variant_types[name]
+
     def read(self, name):
-        return self.client.get_node(self.node_map[name]).get_value()
+        node = self._nodes.get(name) or self.client.get_node(self.node_map[name])
+        return node.get_value()
 
-    def write(self, name, value):
-        node = self.client.get_node(self.node_map[name])
+    def read_many(self, names):
+        """
+        Read the Value attribute of many nodes with as few Read service requests as possible.
+
+        Requests are split only by the server's MaxNodesPerRead limit.
+
+        Args:
+            names: Node names
 
-        # Get expected VariantType from the node
-        expected_type = node.get_data_type_as_variant_type()
+        Returns:
+            Dict of node name -> {'value', 'status', 'source_timestamp'},
+            in the order of names; unknown names get BadNodeIdUnknown
+        """
+        results = {}
+        nodes_to_read = []
+        for name in names:
+            node = self._nodes.get(name)
+            if node is not None:
+                node_id = node.nodeid
+            elif name in self.node_map:
+                node_id = ua.NodeId.from_string(self.node_map[name])
+            else:
+                results[name] = {"value": None, "status": ua.StatusCode(ua.StatusCodes.BadNodeIdUnknown),
+                                 "source_timestamp": None}
+                continue
+            read_value = ua.ReadValueId()
+            read_value.NodeId = node_id
+            read_value.AttributeId = ua.AttributeIds.Value
+            nodes_to_read.append((name, read_value))
+            results[name] = None
+
+        for chunk in self._chunks(nodes_to_read, ua.ObjectIds.Server_ServerCapabilities_OperationLimits_MaxNodesPerRead):
+            parameters = ua.ReadParameters()
+            parameters.TimestampsToReturn = ua.TimestampsToReturn.Source
+            parameters.NodesToRead = [read_value for _, read_value in chunk]
+            for (name, _), data_value in zip(chunk, self.client.uaclient.read(parameters)):
+                results[name] = {
+                    "value": data_value.Value.Value if data_value.Value is not None else None,
+                    "status": data_value.StatusCode,
+                    "source_timestamp": data_value.SourceTimestamp,
+                }
+        return results
+
+    def write(self, name, value):
+        # Cached Node and VariantType, resolved once per tag
+        node, expected_type = self._resolve(name)
 
         # Auto-cast Python value based on VariantType
         typed_value = self._cast_to_type(value, expected_type)
@@ -102,5 +513,49 @@ class OpcuaAutoNodeMapper:
         node.set_value(variant)
         print(f"[INFO] Wrote value '{typed_value}' to '{name}' as {expected_type.name}")
     
+    def write_many(self, values):
+        """
+        Write many values with as few Write service requests as possible.
+
+        Values are cast with the cached VariantTypes; requests are split
+        only by the server's MaxNodesPerWrite limit.
+
+        Args:
+            values: Dict of node name -> value
+
+        Returns:
+            Dict of node name -> ua.StatusCode, in the order of values
+        """
+        statuses = {}
+        write_values = []
+        # Stamped like Node.set_value does, one source time for the whole batch
+        source_timestamp = datetime.utcnow()
+        for name, value in values.items():
+            try:
+                node, expected_type = self._resolve(name)
+            except (KeyError, ua.UaError):
+                statuses[name] = ua.StatusCode(ua.StatusCodes.BadNodeIdUnknown)
+                continue
+            try:
+                variant = ua.Variant(self._cast_to_type(value, expected_type), expected_type)
+            except (TypeError, ValueError, OverflowError):
+                statuses[name] = ua.StatusCode(ua.StatusCodes.BadTypeMismatch)
+                continue
+            write_value = ua.WriteValue()
+            write_value.NodeId = node.nodeid
+            write_value.AttributeId = ua.AttributeIds.Value
+            write_value.Value = ua.DataValue(variant)
+            write_value.Value.SourceTimestamp = source_timestamp
+            write_values.append((name, write_value))
+            statuses[name] = None
+
+        for chunk in self._chunks(write_values, ua.ObjectIds.Server_ServerCapabilities_OperationLimits_MaxNodesPerWrite):
+            parameters = ua.WriteParameters()
+            parameters.NodesToWrite = [write_value for _, write_value in chunk]
+            results = self.client.uaclient.write(parameters)
+            for (name, _), status in zip(chunk, results):
+                statuses[name] = status
+        return statuses
+
     def get_node_map(self,name):
         return self.node_map[name]
\ No newline at end of file
@@ -0,0 +1,78 @@
+import socket
+import threading
+
+import pytest
+
+
+class MemoryPlc:
+    """
+    UDP responder with word memory, answering MEMORY_AREA_READ and MEMORY_AREA_WRITE.
+
+    Words are kept per memory area code; bit reads and writes go through
+    the word they belong to. Every received command frame is recorded.
+    """
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.port = self.sock.getsockname()[1]
+        self.words = {}
+        self.frames = []
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def area(self, code: int) -> dict:
+        # Bit areas share the words of their word area (0x30 -> 0xB0, 0x02 -> 0x82)
+        return self.words.setdefault(code | 0x80, {})
+
+    def set_words(self, code: int, word: int, values) -> None:
+        area = self.area(code)
+        for offset, value in enumerate(values):
+            area[word + offset] = value & 0xFFFF
+
+    def get_words(self, code: int, word: int, count: int) -> list:
+        area = self.area(code)
+        return [area.get(word + offset, 0) for offset in range(count)]
+
+    def handle(self, frame: bytes) -> bytes:
+        command, text = frame[10:12], frame[12:]
+        code, word, bit = text[0], int.from_bytes(text[1:3], "big"), text[3]
+        count = int.from_bytes(text[4:6], "big")
+        area = self.area(code)
+        is_bit = not code & 0x80
+        data = b""
+        if command == b"\x01\x01":
+            if is_bit:
+                data = bytes((area.get(word + (bit + i) // 16, 0) >> ((bit + i) % 16)) & 1 for i in range(count))
+            else:
+                data = b"".join(value.to_bytes(2, "big") for value in self.get_words(code, word, count))
+        elif command == b"\x01\x02":
+            payload = text[6:]
+            if is_bit:
+                for i in range(count):
+                    address, mask = word + (bit + i) // 16, 1 << ((bit + i) % 16)
+                    value = area.get(address, 0)
+                    area[address] = (value | mask) if payload[i] else (value & ~mask)
+            else:
+                self.set_words(code, word, [int.from_bytes(payload[2 * i:2 * i + 2], "big") for i in range(count)])
+        header = bytes([0xC0, 0, 2, frame[6], frame[7], frame[8], frame[3], frame[4], frame[5], frame[9]])
+        return header + command + b"\x00\x00" + data
+
+    def run(self) -> None:
+        while True:
+            try:
+                frame, address = self.sock.recvfrom(4096)
+            except OSError:
+                return
+            self.frames.append(frame)
+            self.sock.sendto(self.handle(frame), address)
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+@pytest.fixture
+def memory_plc():
+    plc = MemoryPlc()
+    yield plc
+    plc.close()
@@ -0,0 +1,50 @@
+from OMRON_FINS_PROTOCOL.Fins_domain.change_detection import FinsChangeDetector
+from OMRON_FINS_PROTOCOL.Fins_domain.read_plan import FinsReadPlanner
+
+
+def words(*values) -> bytes:
+    return b"".join(value.to_bytes(2, "big") for value in values)
+
+
+def make_detector():
+    # Block 0: D100 INT16 and D101 INT32; block 1: CIO 2, read for the bit tags 2.00, 2.01, 2.15
+    plan = FinsReadPlanner().compile(['D100', {'plc_reg_add': 'D101', 'data_type': 'INT32'},
+                                      '2.00', '2.01', '2.15'])
+    return FinsChangeDetector(plan)
+
+
+def test_first_cycle_reports_every_tag():
+    detector = make_detector()
+    assert detector.update([words(1, 2, 3), words(0)]) == [0, 1, 2, 3, 4]
+    assert detector.update([words(1, 2, 3), words(0)]) == []
+
+
+def test_changed_words_report_their_tags():
+    detector = make_detector()
+    detector.update([words(1, 2, 3), words(0)])
+    # Second word of the INT32 changed
+    assert detector.update([words(1, 2, 4), words(0)]) == [1]
+    assert detector.update([words(5, 2, 4), words(0)]) == [0]
+
+
+def test_bit_tags_only_change_with_their_own_bit():
+    detector = make_detector()
+    detector.update([words(1, 2, 3), words(0b0000_0000_0000_0001)])
+    # Bit 3 of the parent word flips: no bit tag reads it
+    assert detector.update([words(1, 2, 3), words(0b0000_0000_0000_1001)]) == []
+    assert detector.update([words(1, 2, 3), words(0b0000_0000_0000_1010)]) == [2, 3]
+    assert detector.update([words(1, 2, 3), words(0b1000_0000_0000_1010)]) == [4]
+
+
+def test_failed_block_is_reported_again_after_recovery():
+    detector = make_detector()
+    detector.update([words(1, 2, 3), words(0)])
+    assert detector.update([None, words(1)]) == [2]
+    assert detector.update([words(1, 2, 3), words(1)]) == [0, 1]
+
+
+def test_reset_reports_every_tag():
+    detector = make_detector()
+    detector.update([words(1, 2, 3), words(0)])
+    detector.reset()
+    assert detector.update([words(1, 2, 3), words(0)]) == [0, 1, 2, 3, 4]
@@ -0,0 +1,67 @@
+import math
+
+import numpy as np
+import pytest
+
+from OMRON_FINS_PROTOCOL.components import conversion
+
+
+@pytest.mark.parametrize("name, values", [
+    ("Int16", [-32768, -1, 0, 1, 32767]),
+    ("UInt16", [0, 1, 65535]),
+    ("Int32", [-2**31, -1, 0, 0x12345678, 2**31 - 1]),
+    ("UInt32", [0, 0x12345678, 2**32 - 1]),
+    ("Int64", [-2**63, -1, 0, 2**53 + 1, 2**63 - 1]),
+    ("UInt64", [0, 2**53 + 1, 2**64 - 1]),
+    ("Float", [-1.5, 0.0, 3.25, 1e38]),
+    ("Double", [-1.5, 0.0, 1e300, 2.0**53]),
+])
+def test_round_trip(name, values):
+    encode, decode = getattr(conversion, "from" + name), getattr(conversion, "to" + name)
+    decoded = decode(encode(values))
+    if name == "Float":
+        assert decoded == pytest.approx(values, rel=1e-7)
+    else:
+        assert decoded == values
+    assert decode(encode(values), as_array=True).tolist() == decoded
+
+
+def test_multi_word_values_are_sent_lowest_word_first():
+    assert conversion.fromInt32(0x12345678) == bytes.fromhex("56781234")
+    assert conversion.toInt32(bytes.fromhex("56781234")) == [0x12345678]
+    assert conversion.fromUInt64(0x0102030405060708) == bytes.fromhex("0708050603040102")
+    assert conversion.fromFloat(1.0) == bytes.fromhex("00003F80")
+    assert conversion.toDouble(bytes.fromhex("0000000000003FF0")) == [1.0]
+
+
+def test_uint64_mixed_magnitudes_stay_exact():
+    assert conversion.toUInt64(conversion.fromUInt64([1, 2**64 - 1])) == [1, 2**64 - 1]
+
+
+@pytest.mark.parametrize("encode, values", [
+    (conversion.fromInt16, [32768]),
+    (conversion.fromUInt16, [-1]),
+    (conversion.fromUInt64, [1, 2**64]),
+    (conversion.fromInt64, [-1, 2**63]),
+    (conversion.fromFloat, [1e40]),
+    (conversion.fromFloat, [-1e40]),
+])
+def test_out_of_range_is_rejected(encode, values):
+    with pytest.raises(OverflowError):
+        encode(values)
+
+
+def test_non_integers_are_rejected_for_integer_types():
+    with pytest.raises(ValueError):
+        conversion.fromInt16([1, 2.5])
+    with pytest.raises(ValueError):
+        conversion.fromUInt64(np.array([1.0, 2.0**64 - 1]))
+
+
+def test_integer_arrays_are_encoded_like_lists():
+    assert conversion.fromInt32(np.arange(-2, 3, dtype=np.int64)) == conversion.fromInt32([-2, -1, 0, 1, 2])
+
+
+def test_float_keeps_inf_and_nan():
+    decoded = conversion.toFloat(conversion.fromFloat([math.inf, -math.inf, math.nan]))
+    assert decoded[:2] == [math.inf, -math.inf] and math.isnan(decoded[2])
@@ -0,0 +1,69 @@
+import pytest
+from opcua import ua
+
+import opcua_fins_merging
+from OMRON_FINS_PROTOCOL.Infrastructure.udp_connection import FinsUdpConnection
+
+
+class FlakyOpcuaManager:
+    """Stand-in for OpcuaAutoNodeMapper whose first write_many calls fail as configured."""
+
+    def __init__(self, failures):
+        # Per call: an exception to raise, a set of node names to answer Bad, or None
+        self.failures = list(failures)
+        self.written = []
+
+    def preload(self, names):
+        pass
+
+    def write_many(self, values):
+        failure = self.failures.pop(0) if self.failures else None
+        if isinstance(failure, Exception):
+            raise failure
+        statuses = {}
+        for name, value in values.items():
+            if failure and name in failure:
+                statuses[name] = ua.StatusCode(ua.StatusCodes.BadCommunicationError)
+            else:
+                statuses[name] = ua.StatusCode(ua.StatusCodes.Good)
+                self.written.append((name, value))
+        return statuses
+
+
+@pytest.fixture
+def cycles(monkeypatch):
+    """Run periodic_sync for three cycles by stopping it in its third sleep."""
+    calls = []
+
+    def sleep(_):
+        calls.append(None)
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(opcua_fins_merging.time, "sleep", sleep)
+    return calls
+
+
+MAPPINGS = [
+    {'plc_reg_add': 'D100', 'data_type': 'int16', 'opcua_reg_add': 'Tag1'},
+    {'plc_reg_add': 'D101', 'data_type': 'int16', 'opcua_reg_add': 'Tag2'},
+]
+
+
+def run_sync(memory_plc, manager):
+    memory_plc.set_words(0x82, 100, [5, 7])
+    with FinsUdpConnection("127.0.0.1", port=memory_plc.port, timeout=1) as fins:
+        opcua_fins_merging.periodic_sync(fins, manager, MAPPINGS, 0)
+
+
+def test_failed_write_is_sent_again_next_cycle(memory_plc, cycles):
+    manager = FlakyOpcuaManager([ConnectionError("session lost")])
+    run_sync(memory_plc, manager)
+    # Stable PLC values, still written once the OPC UA server is back
+    assert manager.written == [('Tag1', 5), ('Tag2', 7)]
+
+
+def test_bad_status_tag_is_sent_again_next_cycle(memory_plc, cycles):
+    manager = FlakyOpcuaManager([{'Tag2'}])
+    run_sync(memory_plc, manager)
+    assert manager.written == [('Tag1', 5), ('Tag2', 7)]
@@ -0,0 +1,121 @@
+import logging
+import socket
+
+import pytest
+from opcua import Client, Server, ua
+
+from opcua_json import OpcuaAutoNodeMapper
+
+logging.getLogger("opcua").setLevel(logging.ERROR)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def opcua_server():
+    server = Server()
+    server.set_endpoint(f"opc.tcp://127.0.0.1:{free_port()}/")
+    index = server.register_namespace("urn:test")
+    device = server.get_objects_node().add_object(index, "Device")
+    for i in range(20):
+        device.add_variable(index, f"Var{i}", i)
+    sub = device.add_folder(index, "Sub")
+    for i in range(5):
+        sub.add_variable(index, f"Deep{i}", 0.0)
+    sub.add_folder(index, "L3").add_folder(index, "L4").add_variable(index, "VeryDeep", 1)
+    server.start()
+    server.test_index = index
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def client(opcua_server):
+    client = Client(opcua_server.endpoint.geturl())
+    client.connect()
+    yield client
+    client.disconnect()
+
+
+def limit_continuation_points(client, max_nodes: int, status=ua.StatusCodes.BadNoContinuationPoints) -> list:
+    """Make Browse answer the nodes past max_nodes of a request with status, like a server short of continuation points."""
+    browse = client.uaclient.browse
+    sizes = []
+
+    def limited_browse(parameters):
+        results = browse(parameters)
+        sizes.append(len(results))
+        for result in results[max_nodes:]:
+            result.StatusCode = ua.StatusCode(status)
+            result.References = []
+        return results
+
+    client.uaclient.browse = limited_browse
+    return sizes
+
+
+def test_nodes_without_continuation_point_are_browsed_again(client, tmp_path):
+    expected = OpcuaAutoNodeMapper(client, json_path=str(tmp_path / "full.json")).node_map
+    sizes = limit_continuation_points(client, 4)
+    mapper = OpcuaAutoNodeMapper(client, json_path=str(tmp_path / "nodes.json"))
+    assert mapper.node_map == expected
+    assert "VeryDeep" in mapper.node_map
+    assert min(sizes) <= 4
+
+
+def test_browse_error_is_raised_and_not_cached(client, tmp_path):
+    limit_continuation_points(client, 4, ua.StatusCodes.BadInternalError)
+    path = tmp_path / "nodes.json"
+    with pytest.raises(ua.UaStatusCodeError):
+        OpcuaAutoNodeMapper(client, json_path=str(path))
+    assert not path.exists()
+
+
+def test_unknown_node_is_skipped(client):
+    limit_continuation_points(client, 1, ua.StatusCodes.BadNodeIdUnknown)
+    mapper = OpcuaAutoNodeMapper.__new__(OpcuaAutoNodeMapper)
+    mapper.client = client
+    mapper._operation_limits = {}
+    references = mapper._browse_references([ua.NodeId(ua.ObjectIds.ObjectsFolder), ua.NodeId(ua.ObjectIds.Server)])
+    assert references[0] and references[1] == []
+
+
+def count_browse_requests(client) -> list:
+    browse = client.uaclient.browse
+    calls = []
+
+    def counted_browse(parameters):
+        calls.append(len(parameters.NodesToBrowse))
+        return browse(parameters)
+
+    client.uaclient.browse = counted_browse
+    return calls
+
+
+def test_stamp_matching_cache_is_used_without_walking(client, tmp_path):
+    path = str(tmp_path / "nodes.json")
+    expected = OpcuaAutoNodeMapper(client, json_path=path).node_map
+    calls = count_browse_requests(client)
+    mapper = OpcuaAutoNodeMapper(client, json_path=path)
+    assert mapper.node_map == expected
+    # Only the stamp: Server/Namespaces and its metadata objects
+    assert len(calls) <= 2
+
+
+def test_unknown_name_refreshes_the_cache(opcua_server, client, tmp_path):
+    path = str(tmp_path / "nodes.json")
+    OpcuaAutoNodeMapper(client, json_path=path)
+    index = opcua_server.test_index
+    deep = opcua_server.get_objects_node().get_child([f"{index}:Device", f"{index}:Sub", f"{index}:L3", f"{index}:L4"])
+    deep.add_variable(index, "AddedLater", 1)
+
+    mapper = OpcuaAutoNodeMapper(client, json_path=path)
+    assert "AddedLater" not in mapper.node_map
+    mapper.preload(["AddedLater"])
+    assert "AddedLater" in mapper.node_map
+    assert mapper.refresh() == []
+    assert "AddedLater" in OpcuaAutoNodeMapper(client, json_path=path).node_map
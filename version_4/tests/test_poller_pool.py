@@ -0,0 +1,55 @@
+import pytest
+
+from OMRON_FINS_PROTOCOL.Fins_domain.read_plan import FinsReadPlanner
+from OMRON_FINS_PROTOCOL.Infrastructure.poller_pool import FinsPollerPool
+
+from conftest import MemoryPlc
+
+
+class FullSendBuffer:
+    """Socket stand-in whose first sendto calls fail like a full non-blocking send buffer."""
+
+    def __init__(self, sock, failures: int):
+        self.sock = sock
+        self.failures = failures
+
+    def sendto(self, data, address):
+        if self.failures:
+            self.failures -= 1
+            raise BlockingIOError
+        return self.sock.sendto(data, address)
+
+
+@pytest.fixture
+def plcs():
+    plcs = [MemoryPlc() for _ in range(3)]
+    for number, plc in enumerate(plcs):
+        plc.set_words(0x82, 100, [number, 10 + number])
+    yield plcs
+    for plc in plcs:
+        plc.close()
+
+
+PLAN = FinsReadPlanner().compile(['D100', 'D101'])
+
+
+def test_unsendable_plc_does_not_stop_the_others(plcs):
+    with FinsPollerPool() as pool:
+        healthy = [pool.connection("127.0.0.1", plc.port, timeout=1) for plc in plcs]
+        # Broadcast without SO_BROADCAST: sendto fails with Permission denied
+        unsendable = pool.connection("255.255.255.255", 9600, timeout=1)
+        results = pool.read_plans({connection: PLAN for connection in healthy + [unsendable]})
+    for number, connection in enumerate(healthy):
+        assert results[connection]["status"] == "success"
+        assert results[connection]["data"] == [[number], [10 + number]]
+    assert results[unsendable]["status"] == "error"
+    assert results[unsendable]["data"] is None
+
+
+def test_full_send_buffer_is_retried(plcs):
+    with FinsPollerPool() as pool:
+        connections = [pool.connection("127.0.0.1", plc.port, timeout=1, pipeline_depth=1) for plc in plcs]
+        full_buffer = connections[0].socket = FullSendBuffer(connections[0].socket, 3)
+        results = pool.read_plans({connection: PLAN for connection in connections})
+    assert [result["data"] for result in results.values()] == [[[0], [10]], [[1], [11]], [[2], [12]]]
+    assert full_buffer.failures == 0
@@ -0,0 +1,56 @@
+import pytest
+
+from OMRON_FINS_PROTOCOL.Fins_domain.read_plan import FinsReadPlanner
+from OMRON_FINS_PROTOCOL.exception import FinsDataError
+
+D_WORD, CIO_WORD, W_WORD, D_BIT = 0x82, 0xB0, 0xB1, 0x02
+
+
+def blocks(plan):
+    return [(block.memory_type_code, block.start, block.count, block.is_bit) for block in plan.blocks]
+
+
+def words(*values) -> bytes:
+    return b"".join(value.to_bytes(2, "big") for value in values)
+
+
+def test_tags_within_max_gap_share_a_block():
+    plan = FinsReadPlanner(max_gap=4).compile(
+        ['D100', {'plc_reg_add': 'D104', 'data_type': 'INT32'}, 'D111', 'W3'])
+    # D100..D105 merged (gap of 3 words), D111 is 5 words past the end
+    assert blocks(plan) == [(D_WORD, 100, 6, False), (D_WORD, 111, 1, False), (W_WORD, 3, 1, False)]
+    assert [(tag.block_index, tag.offset, tag.count) for tag in plan.tags] == [(0, 0, 1), (0, 4, 2), (1, 0, 1), (2, 0, 1)]
+
+
+def test_tags_are_decoded_from_their_blocks():
+    plan = FinsReadPlanner().compile(['D100', {'plc_reg_add': 'D102', 'data_type': 'INT32'}, 'D101'])
+    # INT32 is sent lowest word first
+    assert plan.decode([words(7, 9, 0x5678, 0x1234)]) == [[7], [0x12345678], [9]]
+    assert plan.decode([None]) == [None, None, None]
+
+
+def test_blocks_are_split_at_990_words():
+    plan = FinsReadPlanner().compile([f'D{address}' for address in range(0, 2000, 10)])
+    assert blocks(plan) == [(D_WORD, 0, 981, False), (D_WORD, 990, 981, False), (D_WORD, 1980, 11, False)]
+    assert all(block.count <= 990 for block in plan.blocks)
+
+
+def test_max_block_items_is_validated():
+    with pytest.raises(FinsDataError):
+        FinsReadPlanner(max_block_items=991)
+
+
+def test_bit_tags_are_read_through_their_parent_word():
+    plan = FinsReadPlanner().compile(['2.01', '2.15', '3.00', 'D10.04', 'D20'])
+    assert blocks(plan) == [(D_WORD, 10, 11, False), (CIO_WORD, 2, 2, False)]
+    assert [(tag.block_index, tag.offset, tag.bit) for tag in plan.tags] == [
+        (1, 0, 1), (1, 0, 15), (1, 1, 0), (0, 0, 4), (0, 10, None)]
+    d_words = words(1 << 4, *[0] * 9, 42)
+    assert plan.decode([d_words, words(0x8002, 0x0000)]) == [[1], [1], [0], [1], [42]]
+    assert plan.decode([d_words, words(0x0002, 0x0001)], indices=[1, 2, 4]) == [[0], [1], [42]]
+
+
+def test_bit_tags_without_harvesting_are_bit_blocks():
+    plan = FinsReadPlanner(harvest_bits=False).compile(['D10.04', 'D10.06'])
+    assert blocks(plan) == [(D_BIT, 10 * 16 + 4, 3, True)]
+    assert plan.decode([bytes([1, 0, 0])]) == [[1], [0]]
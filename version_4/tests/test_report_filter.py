@@ -0,0 +1,64 @@
+import pytest
+
+from OMRON_FINS_PROTOCOL.Fins_domain.report_filter import FinsReportFilter
+from OMRON_FINS_PROTOCOL.exception import FinsDataError
+
+
+def test_plain_tags_report_every_change():
+    report_filter = FinsReportFilter(['D100', 'D101'])
+    assert report_filter.update({0: 1, 1: True}, now=0) == {0: 1, 1: True}
+    assert report_filter.update({0: 1, 1: True}, now=1) == {}
+    assert report_filter.update({0: 2}, now=2) == {0: 2}
+
+
+def test_deadband():
+    report_filter = FinsReportFilter([{'plc_reg_add': 'D100', 'deadband': 0.5}])
+    assert report_filter.update({0: 10.0}, now=0) == {0: 10.0}
+    assert report_filter.update({0: 10.4}, now=1) == {}
+    # Compared with the last reported value, not the last seen one
+    assert report_filter.update({0: 10.6}, now=2) == {0: 10.6}
+    assert report_filter.update({0: 10.2}, now=3) == {}
+
+
+def test_deadband_percent():
+    report_filter = FinsReportFilter([{'plc_reg_add': 'D100', 'deadband_percent': 10}])
+    report_filter.update({0: 200.0}, now=0)
+    assert report_filter.update({0: 219.0}, now=1) == {}
+    assert report_filter.update({0: 179.0}, now=2) == {0: 179.0}
+
+
+def test_min_interval_holds_back_changes():
+    report_filter = FinsReportFilter([{'plc_reg_add': 'D100', 'min_interval': 1.0}])
+    assert report_filter.update({0: 1}, now=0) == {0: 1}
+    assert report_filter.update({0: 2}, now=0.5) == {}
+    # Held back change comes out once the interval elapsed, without a new value
+    assert report_filter.update({}, now=1.0) == {0: 2}
+
+
+def test_max_interval_reports_unchanged_values():
+    report_filter = FinsReportFilter([{'plc_reg_add': 'D100', 'max_interval': 60}])
+    report_filter.update({0: 1}, now=0)
+    assert report_filter.update({0: 1}, now=59) == {}
+    assert report_filter.update({}, now=60) == {0: 1}
+
+
+def test_unreport_sends_the_value_again():
+    report_filter = FinsReportFilter([{'plc_reg_add': 'D100', 'min_interval': 10}, 'D101'])
+    report_filter.update({0: 1, 1: 2}, now=0)
+    report_filter.unreport([0])
+    assert report_filter.update({}, now=1) == {0: 1}
+
+
+def test_tags_without_value_are_not_reported():
+    report_filter = FinsReportFilter(['D100', {'plc_reg_add': 'D101', 'max_interval': 1}])
+    assert report_filter.update({0: 1}, now=0) == {0: 1}
+    assert report_filter.update({}, now=5) == {}
+
+
+@pytest.mark.parametrize("mapping", [
+    {'plc_reg_add': 'D100', 'deadband': -1},
+    {'plc_reg_add': 'D100', 'min_interval': 2, 'max_interval': 1},
+])
+def test_invalid_settings_are_rejected(mapping):
+    with pytest.raises(FinsDataError):
+        FinsReportFilter([mapping])
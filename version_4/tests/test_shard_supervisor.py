@@ -0,0 +1,28 @@
+import math
+
+import numpy as np
+import pytest
+
+from OMRON_FINS_PROTOCOL.Infrastructure.shard_supervisor import (
+    STATUS_CONNECTION_ERROR, STATUS_SUCCESS, FinsShardSupervisor, decode_batch, encode_batch)
+from OMRON_FINS_PROTOCOL.exception import FinsDataError
+
+
+def test_batch_round_trip():
+    records = [(0, STATUS_SUCCESS, np.array([1.5, 2**53])), (7, STATUS_CONNECTION_ERROR, np.full(2, math.nan))]
+    timestamp, shard, decoded = decode_batch(encode_batch(12.5, 3, records))
+    assert (timestamp, shard) == (12.5, 3)
+    assert [(plc, status) for plc, status, _ in decoded] == [(0, STATUS_SUCCESS), (7, STATUS_CONNECTION_ERROR)]
+    assert decoded[0][2].tolist() == [1.5, 2**53]
+    assert np.isnan(decoded[1][2]).all()
+
+
+@pytest.mark.parametrize("data_type", ['INT64', 'uint64'])
+def test_64_bit_integer_tags_are_rejected(data_type):
+    with pytest.raises(FinsDataError):
+        FinsShardSupervisor(['127.0.0.1'], ['D0', {'plc_reg_add': 'D100', 'data_type': data_type}])
+
+
+def test_exact_types_are_accepted():
+    supervisor = FinsShardSupervisor(['127.0.0.1'], ['D0', {'plc_reg_add': 'D100', 'data_type': 'UINT32'}])
+    assert supervisor.tag_count == 2
@@ -0,0 +1,111 @@
+import socket
+import threading
+
+import pytest
+
+from OMRON_FINS_PROTOCOL.Infrastructure.udp_connection import FinsUdpConnection
+from OMRON_FINS_PROTOCOL.exception import FinsDataError
+
+
+class LatePlc:
+    """
+    UDP responder answering MEMORY_AREA_READ with the word address as value.
+
+    The first command is answered only when the second one comes in, right
+    before the second reply, like a PLC that was busy past the timeout.
+    """
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.port = self.sock.getsockname()[1]
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def reply(self, frame: bytes, address) -> None:
+        word = int.from_bytes(frame[13:15], "big")
+        count = int.from_bytes(frame[16:18], "big")
+        header = bytes([0xC0, 0, 2, frame[6], frame[7], frame[8], frame[3], frame[4], frame[5], frame[9]])
+        text = b"".join((word + i).to_bytes(2, "big") for i in range(count))
+        self.sock.sendto(header + frame[10:12] + b"\x00\x00" + text, address)
+
+    def run(self) -> None:
+        held = None
+        while True:
+            try:
+                frame, address = self.sock.recvfrom(4096)
+            except OSError:
+                return
+            if held is None:
+                held = frame
+                continue
+            if held:
+                self.reply(held, address)
+                held = b""
+            self.reply(frame, address)
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+@pytest.fixture
+def late_plc():
+    plc = LatePlc()
+    yield plc
+    plc.close()
+
+
+def test_late_reply_is_not_taken_for_next_command(late_plc):
+    fins = FinsUdpConnection("127.0.0.1", port=late_plc.port, timeout=0.1, retries=0)
+    fins.connect()
+    try:
+        with pytest.raises(ConnectionError):
+            fins.read("D100")
+        # The late D100 reply arrives first and must not answer D200
+        result = fins.read("D200")
+        assert result["status"] == "success"
+        assert result["data"] == [200]
+        assert fins.discarded["unknown_sid"] + fins.discarded["stale"] > 0
+    finally:
+        fins.disconnect()
+
+
+@pytest.fixture
+def fins(memory_plc):
+    with FinsUdpConnection("127.0.0.1", port=memory_plc.port, timeout=1) as fins:
+        yield fins
+
+
+def write_frames(memory_plc) -> list:
+    return [frame for frame in memory_plc.frames if frame[10:12] == b"\x01\x02"]
+
+
+def test_write_many_merges_adjacent_tags(memory_plc, fins):
+    result = fins.write_many({'D102': 3, 'D100': 1, 'D101': 2, 'D200': 9, 'W3': 7})
+    assert result["status"] == "success"
+    assert result["data"] == {'D102': True, 'D100': True, 'D101': True, 'D200': True, 'W3': True}
+    # D100..D102 in one command, D200 and W3 in their own
+    assert result["meta"]["commands"] == 3
+    assert sorted(int.from_bytes(frame[16:18], "big") for frame in write_frames(memory_plc)) == [1, 1, 3]
+    assert memory_plc.get_words(0x82, 100, 3) == [1, 2, 3]
+    assert memory_plc.get_words(0x82, 200, 1) == [9]
+    assert memory_plc.get_words(0xB1, 3, 1) == [7]
+
+
+def test_write_many_merges_multi_word_types(memory_plc, fins):
+    result = fins.write_many({'D100': 0x12345678, 'D102': 2**64 - 1}, ['UINT32', 'UINT64'])
+    assert result["meta"]["commands"] == 1
+    assert memory_plc.get_words(0x82, 100, 6) == [0x5678, 0x1234, 0xFFFF, 0xFFFF, 0xFFFF, 0xFFFF]
+    assert fins.read('D102', 'UINT64')["data"] == [2**64 - 1]
+
+
+def test_write_many_rejects_overlapping_tags(memory_plc, fins):
+    with pytest.raises(FinsDataError):
+        fins.write_many({'D100': 1, 'D101': 2}, ['INT32', 'INT16'])
+    assert write_frames(memory_plc) == []
+
+
+def test_write_many_rejects_out_of_range_values(memory_plc, fins):
+    with pytest.raises(FinsDataError):
+        fins.write_many({'D100': 1e40}, 'FLOAT')
+    assert write_frames(memory_plc) == []